@@ -0,0 +1,206 @@
+import argparse
+from app.database.db_connection import SessionLocal, get_engine
+from app.database.migrations import sync_schema
+from app.services.archive_service import archive_reviews, retention_cutoff
+from app.services.keywords_service import rebuild_keywords
+from app.services.reanalysis_service import Reanalyzer
+from app.services.rollup_service import rebuild_rollup
+from app.services.search_service import rebuild_search_index
+from app.utils.dates import parse_iso_date
+from app.utils.variables import (
+    ARCHIVE_BATCH_SIZE,
+    REANALYSIS_BATCH_SIZE,
+    REANALYSIS_CONCURRENCY,
+    REANALYSIS_RATE_LIMIT,
+    REVIEWS_RETENTION_MONTHS,
+)
+
+
+def migrate_command(args: argparse.Namespace) -> None:
+    """
+    Creates missing tables, columns and indexes (see `sync_schema`).
+    """
+    sync_schema(get_engine())
+
+    print("Esquema do banco de dados sincronizado.")
+
+
+def rebuild_rollup_command(args: argparse.Namespace) -> None:
+    """
+    Recomputes the `sentiment_daily_rollup` table from the stored analyses.
+    """
+    with SessionLocal() as session:
+        rebuild_rollup(session)
+        session.commit()
+
+    print("Rollup diário de sentimentos reconstruído.")
+
+
+def rebuild_keywords_command(args: argparse.Namespace) -> None:
+    """
+    Repopulates the `review_keywords` table from the stored analyses.
+    """
+    with SessionLocal() as session:
+        rebuild_keywords(session)
+        session.commit()
+
+    print("Palavras-chave das avaliações reconstruídas.")
+
+
+def rebuild_search_command(args: argparse.Namespace) -> None:
+    """
+    Reindexes every review in the full-text search index.
+    """
+    with SessionLocal() as session:
+        rebuild_search_index(session)
+        session.commit()
+
+    print("Índice de busca textual reconstruído.")
+
+
+def archive_reviews_command(args: argparse.Namespace) -> None:
+    """
+    Applies the retention policy, moving old analyzed reviews to the archive.
+    """
+    if args.before:
+        try:
+            cutoff = parse_iso_date(args.before)
+        except ValueError:
+            raise SystemExit("Formato de data inválido. Use YYYY-MM-DD.")
+    else:
+        cutoff = retention_cutoff(args.months)
+
+    with SessionLocal() as session:
+        archived = archive_reviews(session, cutoff, args.batch_size)
+
+    print(f"{archived} avaliações movidas para o arquivo.")
+
+
+def reanalyze_command(args: argparse.Namespace) -> None:
+    """
+    Re-analyzes the selected reviews with the current model and prompt, or
+    resumes an interrupted job.
+    """
+    reanalyzer = Reanalyzer(
+        SessionLocal,
+        concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        rate=args.rate,
+        yield_to_queue=not args.no_yield,
+    )
+
+    if args.resume:
+        job_id = args.resume
+        print(f"Retomando a reanálise {job_id}.")
+    else:
+        filters = {
+            "start_date": args.start_date,
+            "end_date": args.end_date,
+            "missing": args.missing,
+            "outdated": args.outdated,
+            "model": args.model,
+        }
+        try:
+            job_id = reanalyzer.start(filters)
+        except ValueError:
+            raise SystemExit("Formato de data inválido. Use YYYY-MM-DD.")
+        print(f"Reanálise {job_id} iniciada (retome com --resume {job_id}).")
+
+    def report(progress: dict) -> None:
+        print(
+            f"Reanálise {progress['job_id']}: até o ID {progress['last_review_id']} "
+            f"de {progress['max_review_id']}, {progress['processed']} reanalisadas, "
+            f"{progress['failed']} com falha."
+        )
+
+    progress = reanalyzer.run(job_id, on_progress=report)
+
+    print(f"Reanálise {job_id} concluída: {progress['processed']} avaliações.")
+
+
+def main() -> None:
+    """
+    Entry point of the administrative commands: `python -m app.cli <command>`.
+    """
+    parser = argparse.ArgumentParser(description="Comandos administrativos da API.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser(
+        "migrate", help="Sincroniza o esquema do banco de dados."
+    )
+    migrate_parser.set_defaults(handler=migrate_command)
+
+    rebuild_parser = subparsers.add_parser(
+        "rebuild-rollup", help="Reconstrói o rollup diário de sentimentos."
+    )
+    rebuild_parser.set_defaults(handler=rebuild_rollup_command)
+
+    keywords_parser = subparsers.add_parser(
+        "rebuild-keywords", help="Reconstrói a tabela de palavras-chave."
+    )
+    keywords_parser.set_defaults(handler=rebuild_keywords_command)
+
+    search_parser = subparsers.add_parser(
+        "rebuild-search", help="Reconstrói o índice de busca textual."
+    )
+    search_parser.set_defaults(handler=rebuild_search_command)
+
+    archive_parser = subparsers.add_parser(
+        "archive-reviews",
+        help="Move avaliações antigas para a tabela de arquivo.",
+    )
+    archive_parser.add_argument(
+        "--months",
+        type=int,
+        default=REVIEWS_RETENTION_MONTHS,
+        help="Meses mantidos, além do mês atual.",
+    )
+    archive_parser.add_argument(
+        "--before", help="Arquiva as avaliações anteriores a esta data (YYYY-MM-DD)."
+    )
+    archive_parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+    archive_parser.set_defaults(handler=archive_reviews_command)
+
+    reanalyze_parser = subparsers.add_parser(
+        "reanalyze",
+        help="Reanalisa avaliações com o modelo e o prompt atuais.",
+    )
+    reanalyze_parser.add_argument("--start-date", help="Data inicial (YYYY-MM-DD).")
+    reanalyze_parser.add_argument("--end-date", help="Data final (YYYY-MM-DD).")
+    reanalyze_parser.add_argument(
+        "--missing", action="store_true", help="Avaliações sem análise."
+    )
+    reanalyze_parser.add_argument(
+        "--outdated",
+        action="store_true",
+        help="Análises feitas por outro modelo ou versão do prompt.",
+    )
+    reanalyze_parser.add_argument("--model", help="Análises feitas por este modelo.")
+    reanalyze_parser.add_argument(
+        "--resume", type=int, metavar="ID", help="Retoma uma reanálise interrompida."
+    )
+    reanalyze_parser.add_argument(
+        "--concurrency", type=int, default=REANALYSIS_CONCURRENCY
+    )
+    reanalyze_parser.add_argument(
+        "--batch-size", type=int, default=REANALYSIS_BATCH_SIZE
+    )
+    reanalyze_parser.add_argument(
+        "--rate",
+        type=float,
+        default=REANALYSIS_RATE_LIMIT,
+        help="Avaliações por segundo (0 desativa o limite).",
+    )
+    reanalyze_parser.add_argument(
+        "--no-yield",
+        action="store_true",
+        help="Não espera a fila de análises esvaziar.",
+    )
+    reanalyze_parser.set_defaults(handler=reanalyze_command)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+from typing import Callable
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateColumn
+from app.models.models import Base
+from app.services.keywords_service import rebuild_keywords
+from app.services.rollup_service import rebuild_rollup
+from app.services.search_service import (
+    SEARCH_TABLE,
+    create_search_index,
+    rebuild_search_index,
+)
+
+# Data backfills executed once, right after the column they depend on is added
+# to an existing table. Keyed by (table name, column name).
+COLUMN_BACKFILLS: dict[tuple[str, str], list[str]] = {
+    ("reviews", "analysis_status"): [
+        "UPDATE reviews SET analysis_status = 'DONE' "
+        "WHERE id IN (SELECT review_id FROM sentiment_analysis)",
+    ],
+}
+
+# Backfills executed once, right after the table they populate is created on a
+# database that may already hold data. Keyed by table name.
+TABLE_BACKFILLS: dict[str, Callable[[Connection], None]] = {
+    "sentiment_daily_rollup": rebuild_rollup,
+    "review_keywords": rebuild_keywords,
+}
+
+
+def sync_schema(engine: Engine) -> None:
+    """
+    Creates missing tables and brings existing ones up to date with the models.
+
+    `Base.metadata.create_all` only creates tables that do not exist yet, so
+    columns and indexes added to the models later are applied here with
+    `ALTER TABLE ... ADD COLUMN` / `CREATE INDEX`, followed by the matching
+    entries of `COLUMN_BACKFILLS` and `TABLE_BACKFILLS`. The full-text index,
+    which lives outside the models, is created and filled the same way.
+
+    Args:
+        engine (Engine): The SQLAlchemy engine connected to the target database.
+    """
+    with engine.begin() as connection:
+        existing_tables = set(inspect(connection).get_table_names())
+        Base.metadata.create_all(bind=connection)
+        inspector = inspect(connection)
+
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                if table.name in TABLE_BACKFILLS:
+                    TABLE_BACKFILLS[table.name](connection)
+                continue
+
+            existing_columns = {
+                column["name"] for column in inspector.get_columns(table.name)
+            }
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+
+                column_ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                connection.execute(
+                    text(f"ALTER TABLE {table.name} ADD COLUMN {column_ddl}")
+                )
+                for statement in COLUMN_BACKFILLS.get((table.name, column.name), []):
+                    connection.execute(text(statement))
+
+            existing_indexes = {
+                index["name"] for index in inspector.get_indexes(table.name)
+            }
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(bind=connection)
+
+        create_search_index(connection)
+        if SEARCH_TABLE not in existing_tables:
+            rebuild_search_index(connection)
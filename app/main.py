@@ -1,8 +1,73 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.routes import review_route
+from app.database.db_connection import (
+    AsyncSessionLocal,
+    SessionLocal,
+    dispose_async_engine,
+    dispose_engines,
+    get_async_engine,
+    get_database_health,
+    get_engine,
+    warm_up_async_pool,
+    warm_up_pool,
+)
+from app.database.migrations import sync_schema
+from app.routes import async_review_route, review_route
+from app.services.ai_service import configure_analysis_cache, warm_up_clients
+from app.services.analysis_worker import AnalysisWorker, AsyncAnalysisWorker
+from app.services.metrics import CONTENT_TYPE, MetricsMiddleware, registry
+from app.utils import variables
+from app.utils.variables import (
+    ANALYSIS_CACHE_PERSISTENT,
+    ANALYSIS_ENGINE,
+    ASYNC_MODE,
+    DB_POOL_WARMUP,
+    LLM_CLIENT_WARMUP,
+    METRICS_ENABLED,
+)
 from fastapi_pagination import add_pagination
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Synchronizes the schema (unless `DB_AUTO_MIGRATE` is off), warms up the
+    connection pool and the LLM client and starts the background sentiment
+    analysis workers for the app's lifetime.
+
+    The engines and the LLM client are created here, not when the app is
+    imported. `DB_AUTO_MIGRATE` is read here too, since the gunicorn master
+    turns it off after migrating, before forking the workers.
+    """
+    if variables.DB_AUTO_MIGRATE:
+        sync_schema(get_engine())
+    warm_up_pool(get_engine(), DB_POOL_WARMUP)
+
+    if LLM_CLIENT_WARMUP and ANALYSIS_ENGINE != "local":
+        warm_up_clients(is_async=ASYNC_MODE)
+
+    if ANALYSIS_CACHE_PERSISTENT:
+        configure_analysis_cache(SessionLocal)
+
+    if ASYNC_MODE:
+        await warm_up_async_pool(get_async_engine(), DB_POOL_WARMUP)
+        async_analysis_worker = AsyncAnalysisWorker(AsyncSessionLocal)
+        async_analysis_worker.start()
+        yield
+        await async_analysis_worker.stop()
+        await dispose_async_engine()
+        dispose_engines()
+        return
+
+    analysis_worker = AnalysisWorker(SessionLocal)
+    analysis_worker.start()
+    yield
+    analysis_worker.stop()
+    dispose_engines()
+
+
 app = FastAPI(
     title="API de Análise de Sentimentos",
     description="API para análise automática de sentimentos em avaliações de clientes.",
@@ -10,6 +75,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -20,10 +86,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+if ASYNC_MODE:
+    app.include_router(async_review_route.router)
+
 app.include_router(review_route.router)
 
 add_pagination(app)
 
+
 @app.get("/")
 def get_health_check():
     """
@@ -33,3 +106,41 @@ def get_health_check():
         dict: A message confirming that the API is operational.
     """
     return {"message": "Health check successful"}
+
+
+@app.get("/health")
+def get_readiness(response: Response) -> dict:
+    """
+    Readiness probe: reports whether this process can serve requests.
+
+    The database is pinged at most once every `HEALTH_CHECK_INTERVAL` seconds
+    through the connection pool; in between, the cached result and the pool
+    state are reported.
+
+    Returns:
+        dict: Readiness, database reachability and pool state. The status code
+            is 503 when the database is unreachable or the pool is exhausted.
+    """
+    health = get_database_health().check()
+
+    if not health["ready"]:
+        response.status_code = 503
+
+    return health
+
+
+if METRICS_ENABLED:
+
+    @app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+    def get_metrics() -> PlainTextResponse:
+        """
+        Exposes the metrics of this process in the Prometheus text format.
+
+        Includes the request latency per route, the latency of each review
+        processing stage, model calls, tokens and estimated cost, cache hit
+        ratios and the connection pool state.
+
+        Returns:
+            PlainTextResponse: The metrics, read at scrape time.
+        """
+        return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
@@ -1,5 +1,5 @@
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import Column, String, Enum, Integer, ForeignKey, Float
+from sqlalchemy import Column, String, Enum, Integer, ForeignKey, Float, Index, Text
 from sqlalchemy.orm import relationship
 from enum import Enum as PyEnum
 
@@ -21,6 +21,26 @@ class SentimentEnum(str, PyEnum):
     NEGATIVE = "negativa"
 
 
+class AnalysisStatusEnum(str, PyEnum):
+    """
+    Enumeration representing the lifecycle of a review's sentiment analysis.
+
+    Attributes:
+        PENDING (str): Waiting in the queue to be analyzed.
+        PROCESSING (str): Claimed by a worker and being analyzed.
+        DONE (str): Analysis stored successfully.
+        FAILED (str): Analysis gave up after exhausting the retry attempts.
+        DEGRADED (str): Analyzed by the local fallback while the LLM was
+            unavailable; queued to be analyzed again by the LLM.
+    """
+
+    PENDING = "pending"
+    PROCESSING = "processing"
+    DONE = "done"
+    FAILED = "failed"
+    DEGRADED = "degraded"
+
+
 class Review(Base):
     """
     Represents a customer review.
@@ -31,7 +51,15 @@ class Review(Base):
         review_date (int): Timestamp representing the review date.
         review_text (str): The text content of the review.
         sentiment (SentimentEnum): The sentiment classification of the review.
+        analysis_status (AnalysisStatusEnum): Current state of the AI analysis.
+        analysis_attempts (int): How many times the analysis was attempted.
+        analysis_next_attempt_at (int): Timestamp after which the review can be
+            claimed by a worker (retry backoff or processing lease).
+        analysis_error (str): Last error raised while analyzing the review.
+        content_hash (str): SHA-256 of the customer name, date and text, used to
+            find duplicate submissions (None for reviews stored before it).
         sentiment_analysis (SentimentAnalysis): Relationship to the sentiment analysis.
+        keywords (list[ReviewKeyword]): Normalized keywords of the analysis.
     """
 
     __tablename__ = "reviews"
@@ -41,6 +69,27 @@ class Review(Base):
     review_date = Column(Integer, nullable=False)
     review_text = Column(String, nullable=False)
     sentiment = Column(Enum(SentimentEnum), nullable=False)
+    analysis_status = Column(
+        Enum(AnalysisStatusEnum, native_enum=False),
+        nullable=False,
+        default=AnalysisStatusEnum.PENDING,
+        server_default=AnalysisStatusEnum.PENDING.name,
+    )
+    analysis_attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    analysis_next_attempt_at = Column(Integer, nullable=True)
+    analysis_error = Column(String, nullable=True)
+    content_hash = Column(String(64), nullable=True)
+
+    __table_args__ = (
+        Index(
+            "ix_reviews_analysis_queue",
+            "analysis_status",
+            "analysis_next_attempt_at",
+        ),
+        # Matches the (review_date, id) keyset used to page listings and reports.
+        Index("ix_reviews_review_date_id", "review_date", "id"),
+        Index("ix_reviews_content_hash", "content_hash"),
+    )
 
     sentiment_analysis = relationship(
         "SentimentAnalysis",
@@ -48,12 +97,21 @@ class Review(Base):
         cascade="all, delete-orphan",
         uselist=False,
     )
+    keywords = relationship(
+        "ReviewKeyword",
+        back_populates="review",
+        cascade="all, delete-orphan",
+    )
 
 
 class SentimentAnalysis(Base):
     """
     Represents an AI sentiment analysis for a review.
 
+    The usage columns (tokens and latency) are None when no model call produced
+    the analysis: a cache hit, the lexicon, or analyses stored before they were
+    recorded.
+
     Attributes:
         id (int): Primary key, auto-incremented.
         review_id (int): Foreign key linking to the associated review.
@@ -61,6 +119,15 @@ class SentimentAnalysis(Base):
         score (float): Sentiment score ranging from -1 (negative) to 1 (positive).
         keywords (str): Keywords extracted from the review text.
         explanation (str): Explanation of the sentiment classification.
+        model (str): Engine that produced the analysis (the LLM name, or
+            "lexicon"); None for analyses stored before it was recorded.
+        prompt_version (str): Version of the prompt sent to the LLM.
+        prompt_tokens (int): Prompt tokens of the model call. A call with
+            several reviews is split evenly between them.
+        completion_tokens (int): Completion tokens of the model call, split the
+            same way.
+        latency_ms (int): Latency of the model call in milliseconds, split the
+            same way.
         review (Review): Relationship back to the review.
     """
 
@@ -77,5 +144,189 @@ class SentimentAnalysis(Base):
     score = Column(Float, nullable=False)
     keywords = Column(String, nullable=False)
     explanation = Column(String, nullable=False)
+    model = Column(String(64), nullable=True)
+    prompt_version = Column(String(32), nullable=True)
+    prompt_tokens = Column(Integer, nullable=True)
+    completion_tokens = Column(Integer, nullable=True)
+    latency_ms = Column(Integer, nullable=True)
 
     review = relationship("Review", back_populates="sentiment_analysis")
+
+
+class ReviewKeyword(Base):
+    """
+    One normalized keyword of a review's sentiment analysis.
+
+    Mirrors `SentimentAnalysis.keywords` one row per keyword, so reviews can be
+    looked up and keywords counted through an index instead of a LIKE scan.
+
+    Attributes:
+        review_id (int): Foreign key linking to the associated review.
+        keyword (str): The keyword, lowercased with collapsed whitespace.
+        review (Review): Relationship back to the review.
+    """
+
+    __tablename__ = "review_keywords"
+
+    review_id = Column(
+        Integer, ForeignKey("reviews.id", ondelete="CASCADE"), primary_key=True
+    )
+    keyword = Column(String(100), primary_key=True)
+
+    __table_args__ = (Index("ix_review_keywords_keyword", "keyword", "review_id"),)
+
+    review = relationship("Review", back_populates="keywords")
+
+
+class SentimentCache(Base):
+    """
+    Persistent tier of the sentiment analysis cache, shared across replicas.
+
+    Attributes:
+        cache_key (str): SHA-256 of the normalized review text, model and prompt
+            version.
+        model (str): Name of the model that produced the result.
+        prompt_version (str): Version of the prompt that produced the result.
+        result (str): JSON encoded analysis result.
+        created_at (int): Timestamp of when the entry was stored.
+    """
+
+    __tablename__ = "sentiment_cache"
+
+    cache_key = Column(String(64), primary_key=True)
+    model = Column(String, nullable=False)
+    prompt_version = Column(String, nullable=False)
+    result = Column(Text, nullable=False)
+    created_at = Column(Integer, nullable=False)
+
+
+class SentimentDailyRollup(Base):
+    """
+    Daily pre-aggregation of the sentiment analyses, used by the report summary.
+
+    Attributes:
+        day (int): Day of the review, as days since the Unix epoch (UTC).
+        sentiment (str): Normalized sentiment ("positive", "negative", "neutral").
+        count (int): Number of analyzed reviews.
+        score_sum (float): Sum of the analysis scores.
+        score_min (float): Lowest analysis score.
+        score_max (float): Highest analysis score.
+    """
+
+    __tablename__ = "sentiment_daily_rollup"
+
+    day = Column(Integer, primary_key=True)
+    sentiment = Column(String(16), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
+    score_min = Column(Float, nullable=False)
+    score_max = Column(Float, nullable=False)
+
+
+class ReviewArchive(Base):
+    """
+    Cold tier of the reviews: a review and its analysis, moved out of `reviews`
+    and `sentiment_analysis` by the retention policy (see
+    `app.services.archive_service`).
+
+    On PostgreSQL the table is partitioned by month of `review_date`, so report
+    queries only read the months they cover.
+
+    Attributes:
+        id (int): The ID the review had in `reviews`.
+        review_date (int): Timestamp representing the review date.
+        customer_name (str): Name of the customer who wrote the review.
+        review_text (str): The text content of the review.
+        sentiment (SentimentEnum): The sentiment declared by the customer.
+        analysis_status (AnalysisStatusEnum): State of the analysis when archived.
+        analysis_sentiment (str): Sentiment detected by the analysis, if any.
+        score (float): Score of the analysis.
+        keywords (str): Keywords of the analysis.
+        explanation (str): Explanation of the analysis.
+        model (str): Engine that produced the analysis.
+        prompt_version (str): Version of the prompt sent to the LLM.
+        archived_at (int): Timestamp of when the review was archived.
+    """
+
+    __tablename__ = "reviews_archive"
+
+    # The partition key must be part of the primary key.
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    review_date = Column(Integer, primary_key=True)
+    customer_name = Column(String, nullable=False)
+    review_text = Column(String, nullable=False)
+    sentiment = Column(Enum(SentimentEnum), nullable=False)
+    analysis_status = Column(
+        Enum(AnalysisStatusEnum, native_enum=False), nullable=False
+    )
+    analysis_sentiment = Column(String, nullable=True)
+    score = Column(Float, nullable=True)
+    keywords = Column(String, nullable=True)
+    explanation = Column(String, nullable=True)
+    model = Column(String(64), nullable=True)
+    prompt_version = Column(String(32), nullable=True)
+    archived_at = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ix_reviews_archive_review_date_id", "review_date", "id"),
+        {"postgresql_partition_by": "RANGE (review_date)"},
+    )
+
+
+class ReanalysisJob(Base):
+    """
+    Progress of a re-analysis job (see `app.services.reanalysis_service`).
+
+    Reviews are processed in ID order, so the last processed ID is enough to
+    resume the job after a crash.
+
+    Attributes:
+        id (int): Job ID, used to resume it.
+        filters (str): JSON encoded selection of the reviews to re-analyze.
+        status (str): "running" or "done".
+        last_review_id (int): Checkpoint: every matching review up to this ID
+            has been processed.
+        max_review_id (int): Highest review ID when the job started; newer
+            reviews are analyzed by the queue.
+        processed (int): Reviews re-analyzed so far.
+        failed (int): Reviews whose re-analysis failed and were skipped.
+        created_at (int): Timestamp of when the job started.
+        updated_at (int): Timestamp of the last checkpoint.
+    """
+
+    __tablename__ = "reanalysis_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    filters = Column(Text, nullable=False)
+    status = Column(String(16), nullable=False, default="running")
+    last_review_id = Column(Integer, nullable=False, default=0)
+    max_review_id = Column(Integer, nullable=False, default=0)
+    processed = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    created_at = Column(Integer, nullable=False)
+    updated_at = Column(Integer, nullable=False)
+
+
+class IdempotencyKey(Base):
+    """
+    Response of a `POST /reviews/` sent with an `Idempotency-Key` header.
+
+    A retry with the same key gets the stored response back instead of creating
+    the review again (see `app.services.idempotency_service`).
+
+    Attributes:
+        key (str): The key chosen by the client.
+        request_hash (str): SHA-256 of the request body, to reject the key when
+            it is reused for a different review.
+        review_id (int): The review created by the request.
+        response (str): JSON encoded response of the request.
+        created_at (int): Timestamp of when the request was handled.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    review_id = Column(Integer, ForeignKey("reviews.id"), nullable=False, index=True)
+    response = Column(Text, nullable=False)
+    created_at = Column(Integer, nullable=False)
@@ -0,0 +1,244 @@
+from fastapi import APIRouter, Depends, Header, Query, Request, Response
+from fastapi_pagination import Page
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.db_connection import get_async_db
+from app.routes.review_route import read_bulk_chunks, summarize_bulk_results
+from app.services.async_reviews_service import AsyncReviewService
+from app.services.response_cache import (
+    cached_response_async,
+    json_response,
+    response_cache,
+)
+from app.services.reviews_service import ReviewOut
+from app.utils.pagination import CursorPage, OffsetParams
+from app.utils.variables import IDEMPOTENCY_KEY_HEADER
+
+# Registered before `review_route.router` when ASYNC_MODE is enabled, so these
+# handlers take precedence; endpoints without an async version fall through to
+# the sync router. `{review_id:int}` keeps the dynamic routes from shadowing the
+# static paths of the sync router.
+router = APIRouter(prefix="/reviews", tags=["Reviews"])
+
+
+@router.post("/", status_code=201)
+async def reviews_create(
+    review_data: dict,
+    response: Response,
+    idempotency_key: str | None = Header(None, alias=IDEMPOTENCY_KEY_HEADER),
+    db: AsyncSession = Depends(get_async_db),
+) -> dict:
+    """
+    Creates a new review and queues it for sentiment analysis.
+
+    Args:
+        review_data (dict): The review payload.
+        response (Response): The response, to set its status code.
+        idempotency_key (str | None): The `Idempotency-Key` header, see the sync
+            route.
+        db (AsyncSession): Asyncio database session dependency.
+
+    Returns:
+        dict: The created review and its analysis status.
+    """
+    result = await AsyncReviewService(db).create_review(review_data, idempotency_key)
+    if result.get("duplicate"):
+        response.status_code = 200
+    return result
+
+
+@router.post("/bulk", status_code=201)
+async def reviews_create_bulk(
+    request: Request, db: AsyncSession = Depends(get_async_db)
+) -> dict:
+    """
+    Creates many reviews at once and queues them for sentiment analysis.
+
+    Args:
+        request (Request): The incoming request with the reviews in its body.
+        db (AsyncSession): Asyncio database session dependency.
+
+    Returns:
+        dict: The number of created and failed rows and the per-row results.
+    """
+    service = AsyncReviewService(db)
+    results: list[dict] = []
+
+    async for start_index, rows in read_bulk_chunks(request):
+        results += await service.create_reviews_bulk(rows, start_index)
+
+    return summarize_bulk_results(results)
+
+
+@router.get("/", response_model=Page[ReviewOut] | CursorPage[ReviewOut])
+async def get_all_reviews(
+    request: Request,
+    params: OffsetParams = Depends(),
+    cursor: str | None = None,
+    keyword: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    """
+    Retrieves all stored reviews, through the response cache.
+
+    Args:
+        request (Request): The incoming request, used for its query and ETag.
+        params (OffsetParams): Page, size and whether to count the total.
+        cursor (str | None): Selects keyset pagination; empty for the first page.
+        keyword (str | None): Only lists the reviews mentioning this keyword.
+        db (AsyncSession): Asyncio database session dependency.
+
+    Returns:
+        Response: The requested page of reviews, or 304 if unchanged.
+    """
+    return await cached_response_async(
+        request,
+        await response_cache.listing_key_async(request.query_params.multi_items()),
+        lambda: AsyncReviewService(db).get_all_reviews(params, cursor, keyword),
+    )
+
+
+@router.get("/report")
+async def get_reviews_report(
+    start_date: str,
+    end_date: str,
+    include_items: bool = True,
+    params: OffsetParams = Depends(),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    """
+    Generates a report of reviews within a given date range.
+
+    Args:
+        start_date (str): Start date in the format YYYY-MM-DD.
+        end_date (str): End date in the format YYYY-MM-DD.
+        include_items (bool): Whether to include the paginated review list.
+        params (OffsetParams): Page, size and whether to count the total.
+        cursor (str | None): Selects keyset pagination; empty for the first page.
+        db (AsyncSession): Asyncio database session dependency.
+
+    Returns:
+        Response: The sentiment summary of the period and its paginated reviews.
+    """
+    return json_response(
+        await AsyncReviewService(db).get_reviews_report(
+            start_date, end_date, include_items, params, cursor
+        )
+    )
+
+
+@router.get("/keywords/top")
+async def get_top_keywords(
+    limit: int = Query(20, ge=1, le=100),
+    start_date: str | None = None,
+    end_date: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> dict:
+    """
+    Lists the keywords mentioned by the most analyzed reviews.
+
+    Args:
+        limit (int): Maximum number of keywords.
+        start_date (str | None): Optional start date in the format YYYY-MM-DD.
+        end_date (str | None): Optional end date in the format YYYY-MM-DD.
+        db (AsyncSession): Asyncio database session dependency.
+
+    Returns:
+        dict: The keywords with the number of reviews mentioning each one.
+    """
+    return await AsyncReviewService(db).get_top_keywords(limit, start_date, end_date)
+
+
+@router.get("/stats")
+async def get_review_stats(
+    bucket: str = Query("day", pattern="^(day|week|month)$"),
+    start_date: str | None = None,
+    end_date: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> dict:
+    """
+    Reports sentiment trends per day, week or month, computed in the database.
+
+    Args:
+        bucket (str): "day", "week" or "month".
+        start_date (str | None): Optional start date in the format YYYY-MM-DD.
+        end_date (str | None): Optional end date in the format YYYY-MM-DD.
+        db (AsyncSession): Asyncio database session dependency.
+
+    Returns:
+        dict: Counts per sentiment, mean and percentile scores and agreement rate
+            between the declared and the analyzed sentiment, per bucket.
+    """
+    return await AsyncReviewService(db).get_review_stats(bucket, start_date, end_date)
+
+
+@router.get("/search")
+async def search_reviews(
+    q: str = Query(..., min_length=1, max_length=200),
+    size: int = Query(20, ge=1, le=100),
+    cursor: str = "",
+    sentiment: str | None = Query(None, pattern="^(positive|negative|neutral)$"),
+    start_date: str | None = None,
+    end_date: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> dict:
+    """
+    Searches reviews by the words of their text and analysis explanation.
+
+    Args:
+        q (str): The search terms.
+        size (int): Number of results per page.
+        cursor (str): Empty for the first page, then the `next_cursor` received.
+        sentiment (str | None): Only keeps the reviews analyzed with this
+            sentiment ("positive", "negative" or "neutral").
+        start_date (str | None): Optional start date in the format YYYY-MM-DD.
+        end_date (str | None): Optional end date in the format YYYY-MM-DD.
+        db (AsyncSession): Asyncio database session dependency.
+
+    Returns:
+        dict: The matching reviews, best matches first, and the cursor of the
+            next page.
+    """
+    return await AsyncReviewService(db).search_reviews(
+        q, size, cursor, sentiment, start_date, end_date
+    )
+
+
+@router.get("/{review_id:int}/analysis")
+async def get_review_analysis_status(
+    review_id: int, db: AsyncSession = Depends(get_async_db)
+) -> dict:
+    """
+    Retrieves the sentiment analysis status of a specific review.
+
+    Args:
+        review_id (int): The ID of the review.
+        db (AsyncSession): Asyncio database session dependency.
+
+    Returns:
+        dict: The analysis status, attempts, last error and result.
+    """
+    return await AsyncReviewService(db).get_analysis_status(review_id)
+
+
+@router.get("/{review_id:int}", response_model=dict)
+async def get_review_by_id(
+    request: Request, review_id: int, db: AsyncSession = Depends(get_async_db)
+) -> Response:
+    """
+    Retrieves a specific review by its ID, through the response cache.
+
+    Args:
+        request (Request): The incoming request, used for its ETag.
+        review_id (int): The ID of the review to retrieve.
+        db (AsyncSession): Asyncio database session dependency.
+
+    Returns:
+        Response: The requested review data or an error message if not found.
+    """
+    return await cached_response_async(
+        request,
+        await response_cache.review_key_async(review_id),
+        lambda: AsyncReviewService(db).get_review_by_id(review_id),
+        cacheable=lambda payload: "review" in payload,
+    )
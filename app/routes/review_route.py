@@ -1,68 +1,445 @@
-﻿from fastapi import APIRouter, Depends
+﻿import json
+from typing import AsyncIterator
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from fastapi_pagination import Page
-from sqlalchemy.orm import Session
-from app.database.db_connection import get_db
-from app.services.reviews_service import ReviewService, ReviewOut
+from sqlalchemy.orm import Session, sessionmaker
+from app.database.db_connection import get_db, get_session_factory
+from app.services.ai_service import (
+    analysis_cache,
+    analysis_router,
+    analysis_usage,
+    flow_control_stats,
+)
+from app.services.archive_service import (
+    build_archive_boundary_query,
+    reaches_archive,
+)
+from app.services.export_service import (
+    EXPORT_FORMATS,
+    build_export_query,
+    gzip_stream,
+    parse_export_columns,
+    stream_export,
+)
+from app.services.response_cache import (
+    cached_response,
+    json_response,
+    response_cache,
+)
+from app.services.reviews_service import ReviewService, ReviewOut, parse_report_range
+from app.utils.pagination import CursorPage, OffsetParams
+from app.utils.variables import BULK_INSERT_CHUNK_SIZE, IDEMPOTENCY_KEY_HEADER
 
 router = APIRouter(prefix="/reviews", tags=["Reviews"])
 
 
 @router.post("/", status_code=201)
-def reviews_create(review_data: dict, db: Session = Depends(get_db)) -> dict:
+def reviews_create(
+    review_data: dict,
+    response: Response,
+    idempotency_key: str | None = Header(None, alias=IDEMPOTENCY_KEY_HEADER),
+    db: Session = Depends(get_db),
+) -> dict:
     """
-    Retrieves all stored reviews.
+    Creates a new review and queues it for sentiment analysis.
+
+    Clients that retry should send an `Idempotency-Key` header: a retry with the
+    same key gets the original response back. An existing duplicate returned
+    under `REVIEW_DEDUP_ENABLED` is answered with 200 instead of 201.
+
+    Args:
+        review_data (dict): The review payload.
+        response (Response): The response, to set its status code.
+        idempotency_key (str | None): The `Idempotency-Key` header.
+        db (Session): Database session dependency.
+
+    Returns:
+        dict: The created review and its analysis status.
+    """
+    result = ReviewService(db).create_review(review_data, idempotency_key)
+    if result.get("duplicate"):
+        response.status_code = 200
+    return result
+
+
+@router.post("/bulk", status_code=201)
+async def reviews_create_bulk(request: Request, db: Session = Depends(get_db)) -> dict:
+    """
+    Creates many reviews at once and queues them for sentiment analysis.
+
+    Accepts a JSON array, an object shaped like `reviews.json` ({"reviews": [...]})
+    or an NDJSON stream (`Content-Type: application/x-ndjson`, one review per
+    line). NDJSON bodies are inserted chunk by chunk while they are read.
 
     Args:
+        request (Request): The incoming request with the reviews in its body.
         db (Session): Database session dependency.
 
     Returns:
-        dict: A list of all reviews stored in the database.
+        dict: The number of created and failed rows and the per-row results.
+    """
+    service = ReviewService(db)
+    results: list[dict] = []
+
+    async for start_index, rows in read_bulk_chunks(request):
+        results += await run_in_threadpool(
+            service.create_reviews_bulk, rows, start_index
+        )
+
+    return summarize_bulk_results(results)
+
+
+async def read_bulk_chunks(request: Request) -> AsyncIterator[tuple[int, list]]:
     """
-    return ReviewService(db).create_review(review_data)
+    Reads the body of a bulk request in chunks of `BULK_INSERT_CHUNK_SIZE` rows.
+
+    NDJSON bodies are parsed line by line while the stream arrives; lines that
+    are not valid JSON become `ValueError` rows, reported as row errors.
+
+    Args:
+        request (Request): The bulk request.
 
+    Raises:
+        HTTPException: If a JSON body is invalid or is not a list of reviews.
 
-@router.get("/")
-def get_all_reviews(db: Session = Depends(get_db)) -> Page[ReviewOut]:
+    Yields:
+        tuple[int, list]: The index of the first row of the chunk and its rows.
+    """
+    if "ndjson" not in request.headers.get("content-type", ""):
+        try:
+            payload = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="JSON inválido.")
+
+        if isinstance(payload, dict):
+            payload = payload.get("reviews")
+        if not isinstance(payload, list):
+            raise HTTPException(
+                status_code=400,
+                detail="Envie uma lista de avaliações ou um objeto com 'reviews'.",
+            )
+
+        yield 0, payload
+        return
+
+    chunk: list = []
+    index = 0
+    async for line in _iter_lines(request):
+        if not line.strip():
+            continue
+        try:
+            chunk.append(json.loads(line))
+        except ValueError:
+            chunk.append(ValueError("JSON inválido."))
+
+        if len(chunk) >= BULK_INSERT_CHUNK_SIZE:
+            yield index, chunk
+            index += len(chunk)
+            chunk = []
+
+    if chunk:
+        yield index, chunk
+
+
+def summarize_bulk_results(results: list[dict]) -> dict:
+    """
+    Builds the response of a bulk request from its per-row results.
+
+    Args:
+        results (list[dict]): The per-row results, in input order.
+
+    Returns:
+        dict: The number of created and failed rows and the per-row results.
+    """
+    created = sum(1 for result in results if result["status"] == "OK")
+
+    return {
+        "status": "OK",
+        "created": created,
+        "failed": len(results) - created,
+        "results": results,
+    }
+
+
+async def _iter_lines(request: Request) -> AsyncIterator[bytes]:
+    buffer = b""
+    async for body_chunk in request.stream():
+        buffer += body_chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+
+    if buffer:
+        yield buffer
+
+
+@router.get("/", response_model=Page[ReviewOut] | CursorPage[ReviewOut])
+def get_all_reviews(
+    request: Request,
+    params: OffsetParams = Depends(),
+    cursor: str | None = None,
+    keyword: str | None = None,
+    db: Session = Depends(get_db),
+) -> Response:
     """
     Retrieves all stored reviews.
 
+    Pages are served from the response cache and answer 304 when the client's
+    `If-None-Match` matches their ETag.
+
     Args:
+        request (Request): The incoming request, used for its query and ETag.
+        params (OffsetParams): Page, size and whether to count the total.
+        cursor (str | None): Selects keyset pagination; empty for the first page.
+        keyword (str | None): Only lists the reviews mentioning this keyword.
         db (Session): Database session dependency.
 
     Returns:
-        dict: A list of all reviews stored in the database.
+        Response: A list of all reviews stored in the database.
     """
-    return ReviewService(db).get_all_reviews()
+    return cached_response(
+        request,
+        response_cache.listing_key(request.query_params.multi_items()),
+        lambda: ReviewService(db).get_all_reviews(params, cursor, keyword),
+    )
 
 
 @router.get("/report")
 def get_reviews_report(
-    start_date: str, end_date: str, db: Session = Depends(get_db)
-) -> dict:
+    start_date: str,
+    end_date: str,
+    include_items: bool = True,
+    params: OffsetParams = Depends(),
+    cursor: str | None = None,
+    db: Session = Depends(get_db),
+) -> Response:
     """
     Generates a report of reviews within a given date range.
 
     Args:
         start_date (str): Start date in the format YYYY-MM-DD.
         end_date (str): End date in the format YYYY-MM-DD.
+        include_items (bool): Whether to include the paginated review list.
+        params (OffsetParams): Page, size and whether to count the total.
+        cursor (str | None): Selects keyset pagination; empty for the first page.
+        db (Session): Database session dependency.
+
+    Returns:
+        Response: A summary of the number of positive, negative, and neutral reviews within the specified period.
+    """
+    return json_response(
+        ReviewService(db).get_reviews_report(
+            start_date, end_date, include_items, params, cursor
+        )
+    )
+
+
+@router.get("/report/export")
+def export_reviews_report(
+    start_date: str,
+    end_date: str,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    columns: str | None = None,
+    gzip: bool = False,
+    session_factory: sessionmaker = Depends(get_session_factory),
+) -> StreamingResponse:
+    """
+    Streams every review of a date range, with its analysis, as CSV or NDJSON.
+
+    Unlike `GET /reviews/report`, the export is not paginated: rows are read in
+    batches from a server-side cursor and written to the response as they come.
+
+    Args:
+        start_date (str): Start date in the format YYYY-MM-DD.
+        end_date (str): End date in the format YYYY-MM-DD.
+        format (str): "csv" or "ndjson".
+        columns (str | None): Comma-separated columns to export (default: all).
+        gzip (bool): Whether to compress the file with gzip.
+        session_factory (sessionmaker): Opens the session used by the stream.
+
+    Returns:
+        StreamingResponse: The report file.
+    """
+    try:
+        start_timestamp, end_timestamp = parse_report_range(start_date, end_date)
+    except ValueError:
+        raise HTTPException(
+            status_code=400, detail="Formato de data inválido. Use YYYY-MM-DD."
+        )
+
+    selected_columns = parse_export_columns(columns)
+    with session_factory() as session:
+        archived = reaches_archive(
+            session.scalar(build_archive_boundary_query()), start_timestamp
+        )
+    query = build_export_query(
+        start_timestamp, end_timestamp, selected_columns, archived
+    )
+    content = stream_export(session_factory, query, selected_columns, format)
+
+    filename = f"report_{start_date}_{end_date}.{format}"
+    media_type = EXPORT_FORMATS[format]
+    if gzip:
+        content = gzip_stream(content)
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/keywords/top")
+def get_top_keywords(
+    limit: int = Query(20, ge=1, le=100),
+    start_date: str | None = None,
+    end_date: str | None = None,
+    db: Session = Depends(get_db),
+) -> dict:
+    """
+    Lists the keywords mentioned by the most analyzed reviews.
+
+    Args:
+        limit (int): Maximum number of keywords.
+        start_date (str | None): Optional start date in the format YYYY-MM-DD.
+        end_date (str | None): Optional end date in the format YYYY-MM-DD.
+        db (Session): Database session dependency.
+
+    Returns:
+        dict: The keywords with the number of reviews mentioning each one.
+    """
+    return ReviewService(db).get_top_keywords(limit, start_date, end_date)
+
+
+@router.get("/stats")
+def get_review_stats(
+    bucket: str = Query("day", pattern="^(day|week|month)$"),
+    start_date: str | None = None,
+    end_date: str | None = None,
+    db: Session = Depends(get_db),
+) -> dict:
+    """
+    Reports sentiment trends per day, week or month, computed in the database.
+
+    Only aggregates travel over the wire: clients no longer need to page through
+    `/reviews/report` to build the same series.
+
+    Args:
+        bucket (str): "day", "week" or "month".
+        start_date (str | None): Optional start date in the format YYYY-MM-DD.
+        end_date (str | None): Optional end date in the format YYYY-MM-DD.
         db (Session): Database session dependency.
 
     Returns:
-        dict: A summary of the number of positive, negative, and neutral reviews within the specified period.
+        dict: Counts per sentiment, mean and percentile scores and agreement rate
+            between the declared and the analyzed sentiment, per bucket.
     """
-    return ReviewService(db).get_reviews_report(start_date, end_date)
+    return ReviewService(db).get_review_stats(bucket, start_date, end_date)
 
 
-@router.get("/{review_id}")
-def get_review_by_id(review_id: int, db: Session = Depends(get_db)) -> dict:
+@router.get("/search")
+def search_reviews(
+    q: str = Query(..., min_length=1, max_length=200),
+    size: int = Query(20, ge=1, le=100),
+    cursor: str = "",
+    sentiment: str | None = Query(None, pattern="^(positive|negative|neutral)$"),
+    start_date: str | None = None,
+    end_date: str | None = None,
+    db: Session = Depends(get_db),
+) -> dict:
+    """
+    Searches reviews by the words of their text and analysis explanation.
+
+    Args:
+        q (str): The search terms.
+        size (int): Number of results per page.
+        cursor (str): Empty for the first page, then the `next_cursor` received.
+        sentiment (str | None): Only keeps the reviews analyzed with this
+            sentiment ("positive", "negative" or "neutral").
+        start_date (str | None): Optional start date in the format YYYY-MM-DD.
+        end_date (str | None): Optional end date in the format YYYY-MM-DD.
+        db (Session): Database session dependency.
+
+    Returns:
+        dict: The matching reviews, best matches first, and the cursor of the
+            next page.
+    """
+    return ReviewService(db).search_reviews(
+        q, size, cursor, sentiment, start_date, end_date
+    )
+
+
+@router.get("/analysis/cache")
+def get_analysis_cache_stats() -> dict:
+    """
+    Reports the hit/miss counters of the sentiment analysis cache.
+
+    Returns:
+        dict: Hits per tier, misses, hit ratio, size and current prompt version.
+    """
+    return analysis_cache.stats()
+
+
+@router.get("/analysis/usage")
+def get_analysis_usage_stats() -> dict:
+    """
+    Reports the tokens and latency per review of the model calls, comparing
+    single-review calls with batched ones, how the analysis engines shared the
+    traffic and how much the calls were throttled or coalesced.
+
+    Returns:
+        dict: Per mode counters, the number of batch fallbacks, the routing
+            counters (share served locally, latency saved), the limiter waits
+            and the coalesced analyses.
+    """
+    return {
+        **analysis_usage.stats(),
+        "routing": analysis_router.stats(),
+        **flow_control_stats(),
+    }
+
+
+@router.get("/{review_id}/analysis")
+def get_review_analysis_status(review_id: int, db: Session = Depends(get_db)) -> dict:
+    """
+    Retrieves the sentiment analysis status of a specific review.
+
+    Args:
+        review_id (int): The ID of the review.
+        db (Session): Database session dependency.
+
+    Returns:
+        dict: The analysis status ("pending", "processing", "done" or "failed"),
+            attempts, last error and the analysis result when available.
+    """
+    return ReviewService(db).get_analysis_status(review_id)
+
+
+@router.get("/{review_id}", response_model=dict)
+def get_review_by_id(
+    request: Request, review_id: int, db: Session = Depends(get_db)
+) -> Response:
     """
     Retrieves a specific review by its ID.
 
+    Found reviews are served from the response cache and answer 304 when the
+    client's `If-None-Match` matches their ETag.
+
     Args:
+        request (Request): The incoming request, used for its ETag.
         review_id (int): The ID of the review to retrieve.
         db (Session): Database session dependency.
 
     Returns:
-        dict: The requested review data or an error message if not found.
+        Response: The requested review data or an error message if not found.
     """
-    return ReviewService(db).get_review_by_id(review_id)
+    return cached_response(
+        request,
+        response_cache.review_key(review_id),
+        lambda: ReviewService(db).get_review_by_id(review_id),
+        cacheable=lambda payload: "review" in payload,
+    )
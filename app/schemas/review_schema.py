@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 
+
 class ReviewCreate(BaseModel):
     """
     Schema for creating a new customer review.
@@ -10,6 +11,7 @@ class ReviewCreate(BaseModel):
         review_text (str): The text content of the review.
         sentiment (str): The sentiment classification of the review (e.g., "positive", "negative", "neutral").
     """
+
     customer_name: str
     review_date: str
     review_text: str
@@ -1,35 +1,667 @@
+import asyncio
+import hashlib
+import json
+import logging
+import math
 import openai
 import os
-from pydantic import BaseModel
+import random
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Literal, get_args
+from pydantic import BaseModel, Field, ValidationError, field_validator, model_validator
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import sessionmaker
+from app.models.models import SentimentCache
+from app.services.flow_control import (
+    AsyncSingleFlight,
+    CircuitBreaker,
+    CircuitOpenError,
+    LLMLimiter,
+    SingleFlight,
+)
+from app.services.local_analyzer import (
+    SENTIMENT_THRESHOLD,
+    analyze_with_lexicon,
+    strip_accents,
+)
+from app.utils.variables import (
+    ANALYSIS_CACHE_MAX_SIZE,
+    ANALYSIS_CACHE_PERSISTENT_TTL,
+    ANALYSIS_CACHE_TTL,
+    ANALYSIS_DEGRADED_FALLBACK,
+    ANALYSIS_ENGINE,
+    ANALYSIS_INPUT_TOKEN_BUDGET,
+    ANALYSIS_LOCAL_MIN_CONFIDENCE,
+    ANALYSIS_PROMPT_BATCH_SIZE,
+    ANALYSIS_PROMPT_TOKEN_BUDGET,
+    LLM_CONNECT_TIMEOUT,
+    LLM_DEADLINE,
+    LLM_MAX_RETRIES,
+    LLM_MAX_TOKENS_PER_REVIEW,
+    LLM_RETRY_BACKOFF,
+    LLM_TIMEOUT,
+    MARITACA_BASE_URL,
+)
+
+logger = logging.getLogger(__name__)
 
+# Clients of the provider, built on first use by `get_client` and
+# `get_async_client` (or by `warm_up_clients` at startup), so importing the app
+# does not build them. Tests replace them by assigning these names.
+client: openai.OpenAI | None = None
+async_client: openai.AsyncOpenAI | None = None
+_client_lock = threading.Lock()
 
-client = openai.OpenAI(
-    api_key=os.getenv("MARITACA_API_KEY"),
-    base_url="https://chat.maritaca.ai/api",
+# Errors worth retrying: the provider is slow, unreachable or overloaded.
+RETRYABLE_ERRORS = (
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
 )
 
+# Set in a result produced by the local fallback while the LLM was unavailable.
+DEGRADED_KEY = "degraded"
+
+MODEL_NAME = "sabia-3"
+
+SENTIMENT_PROMPT = """
+        Analise o sentimento do comentário a seguir e responda tudo em PORTUGUÊS-BR:
+        'sentiment': O sentimento geral do comentário: 'positiva', 'negativa' ou 'neutra';
+        'score': Uma pontuação de sentimento de -1 (muito negativa) a 1 (muito positiva);
+        'keywords': Uma lista de palavras-chave POSITIVAS e seguindo das NEGATIVAS que ajudaram a determinar o resultado;
+        'explanation': Uma breve explicação da análise do sentimento
+    """
+
+BATCH_SENTIMENT_PROMPT = SENTIMENT_PROMPT + """
+        Você receberá vários comentários, cada um precedido do seu número entre
+        colchetes, como [1]. Analise cada comentário separadamente e responda em
+        'results' com um item por comentário, informando o número do comentário
+        em 'index'.
+    """
+
+# Rough characters-per-token ratio used to pack reviews under the token budget.
+CHARS_PER_TOKEN = 4
+
+# Put in place of the middle of a review cut by `truncate_review_text`.
+TRUNCATION_MARK = " […] "
+
+SentimentLabel = Literal["positiva", "negativa", "neutra"]
+SENTIMENT_LABELS = get_args(SentimentLabel)
+# Spellings the model drifts to, without accents, and the label they stand for.
+SENTIMENT_REPAIRS = {
+    "positivo": "positiva",
+    "positive": "positiva",
+    "negativo": "negativa",
+    "negative": "negativa",
+    "neutro": "neutra",
+    "neutral": "neutra",
+}
+
+# Per-call usage added to the results of the model. It is not cached, since a
+# cache hit costs no tokens.
+USAGE_KEYS = ("prompt_tokens", "completion_tokens", "latency_ms")
+
+
+def repair_review_details(data):
+    """
+    Fixes the usual drift of the model output before it is validated.
+
+    Sentiments outside `SENTIMENT_LABELS` ("Positivo", "positive") are mapped
+    back to them, or derived from the score when unknown; scores sent as text
+    (also with a decimal comma) are parsed and clamped to [-1, 1]; a keyword
+    string is split on commas, and blank or repeated keywords are dropped.
+    Fixing the answer locally is free, while asking again costs a model call.
+
+    Values that cannot be repaired (a missing score or explanation) are left as
+    they are, so the validation still rejects them.
+
+    Args:
+        data: The output of the model for one review.
+
+    Returns:
+        The repaired output (a copy), or `data` itself when nothing changed.
+    """
+    if not isinstance(data, dict):
+        return data
+
+    repaired = dict(data)
+
+    score = _repair_score(data.get("score"))
+    if score is not None:
+        repaired["score"] = score
+
+    sentiment = _repair_sentiment(data.get("sentiment"))
+    if sentiment is None and score is not None:
+        sentiment = _sentiment_from_score(score)
+    if sentiment is not None:
+        repaired["sentiment"] = sentiment
+
+    keywords = data.get("keywords")
+    if keywords is None:
+        keywords = []
+    elif isinstance(keywords, str):
+        keywords = keywords.split(",")
+    if isinstance(keywords, list):
+        repaired["keywords"] = list(
+            dict.fromkeys(
+                keyword.strip()
+                for keyword in keywords
+                if isinstance(keyword, str) and keyword.strip()
+            )
+        )
+
+    if isinstance(data.get("explanation"), str):
+        repaired["explanation"] = data["explanation"].strip()
+
+    if repaired == data:
+        return data
+
+    analysis_usage.record_repair()
+    return repaired
+
 
 class ReviewDetails(BaseModel):
     """
     Represents the sentiment analysis result for a given review.
 
+    The sentiment is an enum and the score is bounded in the JSON schema sent to
+    the model; answers that still drift are fixed by `repair_review_details`
+    before validation.
+
     Attributes:
-        sentiment (str): The general sentiment classification (e.g., "positive", "negative", "neutral").
-        score (float): A sentiment score ranging from -1 (very negative) to 1 (very positive).
-        keywords (list[str]): List of key positive and negative words that influenced the sentiment.
+        sentiment (str): The general sentiment classification ("positiva",
+            "negativa" or "neutra").
+        score (float): A sentiment score ranging from -1 (very negative) to 1
+            (very positive).
+        keywords (list[str]): List of key positive and negative words that
+            influenced the sentiment.
         explanation (str): A brief explanation of the sentiment analysis result.
     """
 
-    sentiment: str
-    score: float
+    sentiment: SentimentLabel
+    score: float = Field(ge=-1.0, le=1.0)
     keywords: list[str]
     explanation: str
 
+    @model_validator(mode="before")
+    @classmethod
+    def repair(cls, data):
+        return repair_review_details(data)
+
+
+class IndexedReviewDetails(ReviewDetails):
+    """
+    The analysis of one review of a batch, identified by its number in the prompt.
+
+    Attributes:
+        index (int): The number the review was given in the prompt, from 1.
+    """
+
+    index: int
+
+
+class ReviewBatchDetails(BaseModel):
+    """
+    Structured output of a batch analysis.
+
+    Attributes:
+        results (list[IndexedReviewDetails]): One analysis per review.
+    """
+
+    results: list[IndexedReviewDetails]
+
+    @field_validator("results", mode="before")
+    @classmethod
+    def drop_invalid_results(cls, results):
+        # An invalid item would reject the whole batch; dropped, only its review
+        # falls back to a single call.
+        if not isinstance(results, list):
+            return results
+
+        valid = []
+        for item in results:
+            try:
+                valid.append(IndexedReviewDetails.model_validate(item))
+            except ValidationError:
+                continue
+        return valid
+
+
+def build_prompt_version() -> str:
+    """
+    Fingerprints everything that shapes the model's answer: both prompts, the
+    response schemas and the input cut (`ANALYSIS_INPUT_TOKEN_BUDGET`).
+
+    Changing any of them invalidates every cached result and marks the stored
+    analyses as outdated for the reanalysis job.
+
+    Returns:
+        str: The first 12 hex digits of the SHA-256 fingerprint.
+    """
+    contract = json.dumps(
+        [
+            SENTIMENT_PROMPT,
+            BATCH_SENTIMENT_PROMPT,
+            ReviewDetails.model_json_schema(),
+            ReviewBatchDetails.model_json_schema(),
+            ANALYSIS_INPUT_TOKEN_BUDGET,
+        ],
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(contract.encode("utf-8")).hexdigest()[:12]
+
+
+PROMPT_VERSION = build_prompt_version()
+
+
+class AnalysisUsage:
+    """
+    Token and latency counters of the model calls, per analysis mode.
+
+    "single" counts calls made with one review and "batch" calls made with
+    several, so their tokens and latency per review can be compared.
+    """
+
+    MODES = ("single", "batch")
+
+    def __init__(self):
+        """
+        Initializes the counters.
+        """
+        self._lock = threading.Lock()
+        self.clear()
+
+    def record(self, mode: str, reviews: int, usage, latency: float) -> None:
+        """
+        Accounts for one model call.
+
+        Args:
+            mode (str): "single" or "batch".
+            reviews (int): Number of reviews sent in the call.
+            usage: The `usage` of the completion (may be None).
+            latency (float): Duration of the call, in seconds.
+        """
+        with self._lock:
+            counters = self._counters[mode]
+            counters["calls"] += 1
+            counters["reviews"] += reviews
+            counters["prompt_tokens"] += getattr(usage, "prompt_tokens", 0) or 0
+            counters["completion_tokens"] += getattr(usage, "completion_tokens", 0) or 0
+            counters["latency"] += latency
+
+    def record_fallback(self) -> None:
+        """
+        Accounts for a review of a batch that had to be analyzed on its own.
+        """
+        with self._lock:
+            self.fallbacks += 1
+
+    def record_repair(self) -> None:
+        """
+        Accounts for an answer of the model fixed by `repair_review_details`.
+        """
+        with self._lock:
+            self.repairs += 1
+
+    def latency_per_review(self) -> float | None:
+        """
+        Average model latency per review over every call, in seconds.
+
+        Returns:
+            float | None: The average, or None before the first call.
+        """
+        with self._lock:
+            reviews = sum(counters["reviews"] for counters in self._counters.values())
+            latency = sum(counters["latency"] for counters in self._counters.values())
+
+        return latency / reviews if reviews else None
+
+    def clear(self) -> None:
+        """
+        Resets every counter.
+        """
+        with self._lock:
+            self._counters = {
+                mode: {
+                    "calls": 0,
+                    "reviews": 0,
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "latency": 0.0,
+                }
+                for mode in self.MODES
+            }
+            self.fallbacks = 0
+            self.repairs = 0
+
+    def stats(self) -> dict:
+        """
+        Reports the counters.
+
+        Returns:
+            dict: Per mode, the calls, reviews, tokens, tokens per review and
+                latency per review in milliseconds, plus the batch fallbacks
+                and the repaired answers.
+        """
+        with self._lock:
+            stats = {}
+            for mode, counters in self._counters.items():
+                reviews = counters["reviews"]
+                tokens = counters["prompt_tokens"] + counters["completion_tokens"]
+                stats[mode] = {
+                    "calls": counters["calls"],
+                    "reviews": reviews,
+                    "prompt_tokens": counters["prompt_tokens"],
+                    "completion_tokens": counters["completion_tokens"],
+                    "tokens_per_review": (
+                        round(tokens / reviews, 2) if reviews else 0.0
+                    ),
+                    "latency_per_review_ms": (
+                        round(counters["latency"] * 1000 / reviews, 3)
+                        if reviews
+                        else 0.0
+                    ),
+                }
+            stats["fallbacks"] = self.fallbacks
+            stats["repairs"] = self.repairs
+            return stats
+
+
+class AnalysisCache:
+    """
+    Two-tier cache of sentiment analysis results.
+
+    The first tier is an in-process LRU bounded by `max_size` entries and `ttl`
+    seconds. The optional second tier is the `sentiment_cache` table, so results
+    survive restarts and are shared between replicas; hits on it are promoted to
+    the in-process tier.
+    """
+
+    def __init__(
+        self,
+        max_size: int = ANALYSIS_CACHE_MAX_SIZE,
+        ttl: int = ANALYSIS_CACHE_TTL,
+        session_factory: sessionmaker | None = None,
+        persistent_ttl: int = ANALYSIS_CACHE_PERSISTENT_TTL,
+    ):
+        """
+        Initializes the cache.
+
+        Args:
+            max_size (int): Maximum number of entries kept in memory.
+            ttl (int): Seconds an entry stays valid in memory.
+            session_factory (sessionmaker | None): Enables the persistent tier.
+            persistent_ttl (int): Seconds an entry stays valid in the database.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.session_factory = session_factory
+        self.persistent_ttl = persistent_ttl
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> dict | None:
+        """
+        Looks up a cached analysis result.
+
+        Args:
+            key (str): The cache key built by `build_cache_key`.
+
+        Returns:
+            dict | None: The cached result, or None on a miss.
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return entry[1]
+            if entry:
+                del self._entries[key]
+
+        value = self._get_persistent(key, now)
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.persistent_hits += 1
+
+        self._set_memory(key, value, now)
+        return value
+
+    def set(self, key: str, value: dict) -> None:
+        """
+        Stores an analysis result in every enabled tier, without its usage
+        (`USAGE_KEYS`).
+
+        Args:
+            key (str): The cache key built by `build_cache_key`.
+            value (dict): The analysis result.
+        """
+        now = time.time()
+        value = strip_call_usage(value)
+        self._set_memory(key, value, now)
+        self._set_persistent(key, value, now)
+
+    def clear(self) -> None:
+        """
+        Drops the in-process entries and resets the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.memory_hits = self.persistent_hits = self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        Reports the cache counters.
+
+        Returns:
+            dict: Hits per tier, misses, hit ratio and current size.
+        """
+        with self._lock:
+            hits = self.memory_hits + self.persistent_hits
+            lookups = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "persistent_hits": self.persistent_hits,
+                "misses": self.misses,
+                "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "persistent": self.session_factory is not None,
+                "prompt_version": PROMPT_VERSION,
+            }
+
+    def _set_memory(self, key: str, value: dict, now: float) -> None:
+        with self._lock:
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _get_persistent(self, key: str, now: float) -> dict | None:
+        if self.session_factory is None:
+            return None
+
+        try:
+            with self.session_factory() as session:
+                entry = session.get(SentimentCache, key)
+                if entry and entry.created_at + self.persistent_ttl > now:
+                    return json.loads(entry.result)
+        except SQLAlchemyError:
+            logger.warning("Falha ao consultar o cache persistente.", exc_info=True)
+
+        return None
+
+    def _set_persistent(self, key: str, value: dict, now: float) -> None:
+        if self.session_factory is None:
+            return
+
+        try:
+            with self.session_factory() as session:
+                session.merge(
+                    SentimentCache(
+                        cache_key=key,
+                        model=MODEL_NAME,
+                        prompt_version=PROMPT_VERSION,
+                        result=json.dumps(value, ensure_ascii=False),
+                        created_at=int(now),
+                    )
+                )
+                session.commit()
+        except SQLAlchemyError:
+            logger.warning("Falha ao gravar no cache persistente.", exc_info=True)
+
+
+analysis_cache = AnalysisCache()
+analysis_usage = AnalysisUsage()
+llm_limiter = LLMLimiter()
+llm_breaker = CircuitBreaker()
+# Concurrent analyses of the same cache key share one model call.
+analysis_flights = SingleFlight()
+async_analysis_flights = AsyncSingleFlight()
+
+
+def build_client_options() -> dict:
+    """
+    Builds the options shared by the sync and async clients of the provider.
+
+    Retries are done by `_call_model`, which also feeds the circuit breaker, so
+    the SDK's own retries are disabled.
+    """
+    return {
+        "api_key": os.getenv("MARITACA_API_KEY"),
+        "base_url": MARITACA_BASE_URL,
+        "timeout": openai.Timeout(LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+        "max_retries": 0,
+    }
+
+
+def get_client() -> openai.OpenAI:
+    """
+    Provides the sync client of the provider, built on first use.
+    """
+    global client
+
+    if client is None:
+        with _client_lock:
+            if client is None:
+                client = openai.OpenAI(**build_client_options())
+    return client
+
+
+def get_async_client() -> openai.AsyncOpenAI:
+    """
+    Provides the async client of the provider, built on first use.
+    """
+    global async_client
+
+    if async_client is None:
+        with _client_lock:
+            if async_client is None:
+                async_client = openai.AsyncOpenAI(**build_client_options())
+    return async_client
+
+
+def warm_up_clients(is_async: bool = False) -> None:
+    """
+    Builds the client used by the app before the first analysis.
+
+    Building a client sets up its HTTP connection pool and TLS context; doing it
+    at startup keeps that cost out of the first requests. No call is made to
+    the provider.
+
+    Args:
+        is_async (bool): Whether to build the async client instead of the sync
+            one.
+    """
+    if is_async:
+        get_async_client()
+    else:
+        get_client()
+
+
+def flow_control_stats() -> dict:
+    """
+    Reports the model call limiter, the circuit breaker and the coalescing of
+    repeated analyses.
+
+    Returns:
+        dict: The limiter counters, the breaker state and, summed over the
+            thread and asyncio paths, the analyses led, coalesced into another
+            call and timed out.
+    """
+    flights = analysis_flights.stats()
+    async_flights = async_analysis_flights.stats()
+
+    return {
+        "limiter": llm_limiter.stats(),
+        "circuit_breaker": llm_breaker.stats(),
+        "coalescing": {name: flights[name] + async_flights[name] for name in flights},
+    }
+
+
+def configure_analysis_cache(session_factory: sessionmaker | None) -> None:
+    """
+    Enables (or disables, with None) the persistent tier of the analysis cache.
+
+    Args:
+        session_factory (sessionmaker | None): Factory used to open sessions.
+    """
+    analysis_cache.session_factory = session_factory
+
+
+def normalize_review_text(review_text: str) -> str:
+    """
+    Normalizes a review so trivially different copies share a cache entry.
+
+    Applies Unicode NFKC normalization, lowercasing and whitespace collapsing.
+
+    Args:
+        review_text (str): The text of the customer review.
+
+    Returns:
+        str: The normalized text.
+    """
+    normalized = unicodedata.normalize("NFKC", review_text).lower()
+    return re.sub(r"\s+", " ", normalized).strip()
+
+
+def build_cache_key(review_text: str) -> str:
+    """
+    Builds the content-addressed cache key of a review.
+
+    Args:
+        review_text (str): The text of the customer review.
+
+    Returns:
+        str: SHA-256 hex digest of the model, prompt version and normalized text.
+    """
+    payload = "\n".join(
+        [MODEL_NAME, PROMPT_VERSION, normalize_review_text(review_text)]
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
 
 def analyze_review_sentiment(review_text: str) -> dict:
     """
     Analyzes the sentiment of a given customer review using the Maritaca AI model.
 
+    Results are cached by content, so repeated reviews skip the model call, and
+    concurrent calls for the same content wait for a single model call. Only
+    the result that made the call carries its usage (`USAGE_KEYS`).
+
     Args:
         review_text (str): The text of the customer review.
 
@@ -39,23 +671,886 @@ def analyze_review_sentiment(review_text: str) -> dict:
             - "score": A numerical sentiment score (-1 to 1).
             - "keywords": Key positive and negative words influencing the sentiment.
             - "explanation": A short description explaining the sentiment classification.
+            - "prompt_tokens", "completion_tokens" and "latency_ms": The usage
+              of the model call, absent when no call was made.
     """
-    prompt = f"""
-        Analise o sentimento do comentário a seguir e responda tudo em PORTUGUÊS-BR:
-        'sentiment': O sentimento geral do comentário: 'positiva', 'negativa' ou 'neutra';
-        'score': Uma pontuação de sentimento de -1 (muito negativa) a 1 (muito positiva);
-        'keywords': Uma lista de palavras-chave POSITIVAS e seguindo das NEGATIVAS que ajudaram a determinar o resultado;
-        'explanation': Uma breve explicação da análise do sentimento
+    cache_key = build_cache_key(review_text)
+
+    cached = analysis_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    usage = {}
+
+    def analyze() -> dict:
+        result = _request_sentiment_analysis(review_text)
+        analysis_cache.set(cache_key, result)
+        usage.update(pick_call_usage(result))
+        return strip_call_usage(result)
+
+    return {**analysis_flights.do(cache_key, analyze), **usage}
+
+
+def estimate_tokens(review_text: str) -> int:
     """
+    Roughly estimates the number of tokens of a text, without a tokenizer.
+    """
+    return len(review_text) // CHARS_PER_TOKEN + 1
 
-    completion = client.beta.chat.completions.parse(
-        model="sabia-3",
-        messages=[
-            {"role": "system", "content": prompt},
-            {"role": "user", "content": review_text},
-        ],
-        response_format=ReviewDetails,
+
+def truncate_review_text(
+    review_text: str, token_budget: int = ANALYSIS_INPUT_TOKEN_BUDGET
+) -> str:
+    """
+    Cuts a review down to about `token_budget` estimated tokens.
+
+    The beginning (two thirds of the budget) and the end of the review are
+    kept, cut at word boundaries, and the middle is replaced by
+    `TRUNCATION_MARK`: long reviews usually state the verdict in their first
+    and last sentences. The cache key is still built from the whole text.
+
+    Args:
+        review_text (str): The text of the customer review.
+        token_budget (int): Maximum estimated tokens kept; 0 disables the cut.
+
+    Returns:
+        str: The text sent to the model.
+    """
+    if token_budget <= 0 or estimate_tokens(review_text) <= token_budget:
+        return review_text
+
+    kept = max((token_budget - 1) * CHARS_PER_TOKEN - len(TRUNCATION_MARK), 2)
+    head = review_text[: kept * 2 // 3]
+    tail = review_text[len(review_text) - (kept - len(head)) :]
+    if " " in head.strip():
+        head = head.rsplit(" ", 1)[0]
+    if " " in tail.strip():
+        tail = tail.split(" ", 1)[1]
+
+    return head.rstrip() + TRUNCATION_MARK + tail.lstrip()
+
+
+def pick_call_usage(result) -> dict:
+    """
+    Returns the usage of the model call carried by a result (see `USAGE_KEYS`).
+    """
+    if not isinstance(result, dict):
+        return {}
+    return {key: result[key] for key in USAGE_KEYS if key in result}
+
+
+def strip_call_usage(result):
+    """
+    Returns a copy of a result without the usage of its model call, so it is
+    not counted twice; errors are returned as they are.
+    """
+    if not isinstance(result, dict):
+        return result
+    return {key: value for key, value in result.items() if key not in USAGE_KEYS}
+
+
+def build_call_usage(usage, latency: float, reviews: int) -> dict:
+    """
+    Splits the usage of one model call evenly between the reviews it analyzed.
+
+    Args:
+        usage: The `usage` of the completion (may be None).
+        latency (float): Duration of the call, in seconds.
+        reviews (int): Number of reviews sent in the call.
+
+    Returns:
+        dict: The share of each review, as stored in `SentimentAnalysis`:
+            prompt and completion tokens (None when the provider did not report
+            them) and latency in milliseconds.
+    """
+    shares = {"latency_ms": round(latency * 1000 / reviews)}
+    for key in ("prompt_tokens", "completion_tokens"):
+        tokens = getattr(usage, key, None)
+        shares[key] = round(tokens / reviews) if tokens is not None else None
+
+    return shares
+
+
+def build_max_tokens(reviews: int) -> dict:
+    """
+    Builds the cap on the answer of a call with `reviews` reviews, as extra
+    arguments of the completion request (none when the cap is disabled).
+    """
+    if LLM_MAX_TOKENS_PER_REVIEW <= 0:
+        return {}
+    return {"max_tokens": LLM_MAX_TOKENS_PER_REVIEW * reviews}
+
+
+def pack_batches(
+    review_texts: list[str],
+    max_reviews: int = ANALYSIS_PROMPT_BATCH_SIZE,
+    token_budget: int = ANALYSIS_PROMPT_TOKEN_BUDGET,
+) -> list[list[int]]:
+    """
+    Groups reviews, in order, into batches for a single model call.
+
+    A batch is closed when it reaches `max_reviews` reviews or when the next
+    review would push its estimated size over `token_budget`. A review larger
+    than the budget gets a batch of its own. Reviews are measured as sent, that
+    is, after `truncate_review_text`.
+
+    Args:
+        review_texts (list[str]): The texts to analyze.
+        max_reviews (int): Maximum number of reviews per call.
+        token_budget (int): Maximum estimated tokens of review text per call.
+
+    Returns:
+        list[list[int]]: The positions of the texts in each batch.
+    """
+    batches: list[list[int]] = []
+    batch: list[int] = []
+    batch_tokens = 0
+
+    for position, review_text in enumerate(review_texts):
+        tokens = estimate_tokens(truncate_review_text(review_text))
+        if batch and (
+            len(batch) >= max_reviews or batch_tokens + tokens > token_budget
+        ):
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+
+        batch.append(position)
+        batch_tokens += tokens
+
+    if batch:
+        batches.append(batch)
+
+    return batches
+
+
+def analyze_reviews_sentiment_batch(review_texts: list[str]) -> list[dict | Exception]:
+    """
+    Analyzes many reviews, packing several of them into each model call.
+
+    Cached and repeated texts are resolved first, and texts already being
+    analyzed by another caller wait for that call; the remaining ones are grouped
+    by `pack_batches` and sent with `BATCH_SENTIMENT_PROMPT`, so the instructions
+    are paid once per batch instead of once per review. Reviews missing from (or
+    invalid in) a batch answer are analyzed one by one with
+    `analyze_review_sentiment`'s request.
+
+    Args:
+        review_texts (list[str]): The texts of the customer reviews.
+
+    Returns:
+        list[dict | Exception]: For each text, in order, its analysis result (as
+            returned by `analyze_review_sentiment`) or the error that prevented it.
+    """
+    results, pending = _lookup_batch(review_texts, analysis_cache.get)
+    keys, followed = analysis_flights.begin(pending)
+    unfinished = set(keys)
+
+    try:
+        for batch in pack_batches([pending[key][0] for key in keys]):
+            batch_keys = [keys[position] for position in batch]
+            texts = [pending[key][0] for key in batch_keys]
+            analyses = {}
+
+            if len(texts) > 1:
+                try:
+                    analyses = _request_batch_sentiment_analysis(texts)
+                except Exception:
+                    logger.warning("Falha na análise em lote.", exc_info=True)
+
+            for position, key in enumerate(batch_keys):
+                result = analyses.get(position)
+                if result is None:
+                    if len(texts) > 1:
+                        analysis_usage.record_fallback()
+                    try:
+                        result = _request_sentiment_analysis(texts[position])
+                    except Exception as error:
+                        result = error
+
+                _store_batch_result(results, pending[key][1], key, result)
+                analysis_flights.finish(key, result)
+                unfinished.discard(key)
+    finally:
+        for key in unfinished:
+            analysis_flights.finish(key, RuntimeError("Análise interrompida."))
+
+    for key, flight in followed.items():
+        result = analysis_flights.wait(flight)
+        _fill_positions(results, pending[key][1], strip_call_usage(result))
+
+    return results
+
+
+async def analyze_reviews_sentiment_batch_async(
+    review_texts: list[str],
+) -> list[dict | Exception]:
+    """
+    Asyncio version of `analyze_reviews_sentiment_batch`; batches are sent
+    concurrently.
+
+    Args:
+        review_texts (list[str]): The texts of the customer reviews.
+
+    Returns:
+        list[dict | Exception]: For each text, its analysis result or error.
+    """
+    if analysis_cache.session_factory is None:
+        results, pending = _lookup_batch(review_texts, analysis_cache.get)
+    else:
+        results, pending = await asyncio.to_thread(
+            _lookup_batch, review_texts, analysis_cache.get
+        )
+    keys, followed = async_analysis_flights.begin(pending)
+    unfinished = set(keys)
+
+    async def analyze_batch(batch_keys: list[str]) -> None:
+        texts = [pending[key][0] for key in batch_keys]
+        analyses = {}
+
+        if len(texts) > 1:
+            try:
+                analyses = await _request_batch_sentiment_analysis_async(texts)
+            except Exception:
+                logger.warning("Falha na análise em lote.", exc_info=True)
+
+        for position, key in enumerate(batch_keys):
+            result = analyses.get(position)
+            if result is None:
+                if len(texts) > 1:
+                    analysis_usage.record_fallback()
+                try:
+                    result = await _request_sentiment_analysis_async(texts[position])
+                except Exception as error:
+                    result = error
+
+            if analysis_cache.session_factory is None:
+                _store_batch_result(results, pending[key][1], key, result)
+            else:
+                await asyncio.to_thread(
+                    _store_batch_result, results, pending[key][1], key, result
+                )
+            async_analysis_flights.finish(key, result)
+            unfinished.discard(key)
+
+    try:
+        await asyncio.gather(
+            *(
+                analyze_batch([keys[position] for position in batch])
+                for batch in pack_batches([pending[key][0] for key in keys])
+            )
+        )
+    finally:
+        for key in unfinished:
+            async_analysis_flights.finish(key, RuntimeError("Análise interrompida."))
+
+    for key, flight in followed.items():
+        result = await async_analysis_flights.wait(flight)
+        _fill_positions(results, pending[key][1], strip_call_usage(result))
+
+    return results
+
+
+class SentimentAnalyzer:
+    """
+    Interface of the sentiment analysis engines.
+
+    An engine analyzes a list of review texts and returns, for each one, a
+    result in the shape of `ReviewDetails` (as a dict) or the error that
+    prevented it. Results are tagged with the `model` and `prompt_version` that
+    produced them, which are stored with the analysis.
+    """
+
+    name = "base"
+    model: str | None = None
+    prompt_version: str | None = None
+
+    def analyze_batch(self, review_texts: list[str]) -> list[dict | Exception]:
+        """
+        Analyzes the given reviews.
+
+        Args:
+            review_texts (list[str]): The texts of the customer reviews.
+
+        Returns:
+            list[dict | Exception]: One result or error per text, in order.
+        """
+        raise NotImplementedError
+
+    async def analyze_batch_async(
+        self, review_texts: list[str]
+    ) -> list[dict | Exception]:
+        """
+        Asyncio version of `analyze_batch`. Runs it in a thread by default.
+        """
+        return await asyncio.to_thread(self.analyze_batch, review_texts)
+
+    def tag(self, results: list[dict | Exception]) -> list[dict | Exception]:
+        """
+        Adds the engine's `model` and `prompt_version` to each result.
+
+        Results are copied, since they may be shared with the analysis cache.
+        """
+        return [
+            (
+                result
+                if isinstance(result, Exception)
+                else {
+                    **result,
+                    "model": self.model,
+                    "prompt_version": self.prompt_version,
+                }
+            )
+            for result in results
+        ]
+
+
+class LLMAnalyzer(SentimentAnalyzer):
+    """
+    Engine backed by the Maritaca model, with caching and batched prompts.
+    """
+
+    name = "llm"
+    model = MODEL_NAME
+    prompt_version = PROMPT_VERSION
+
+    def analyze_batch(self, review_texts: list[str]) -> list[dict | Exception]:
+        return self.tag(analyze_reviews_sentiment_batch(review_texts))
+
+    async def analyze_batch_async(
+        self, review_texts: list[str]
+    ) -> list[dict | Exception]:
+        return self.tag(await analyze_reviews_sentiment_batch_async(review_texts))
+
+
+class LexiconAnalyzer(SentimentAnalyzer):
+    """
+    Offline, CPU-only engine based on a Portuguese polarity lexicon.
+
+    See `app.services.local_analyzer.analyze_with_lexicon`.
+    """
+
+    name = "local"
+    model = "lexicon"
+
+    def analyze_with_confidence(self, review_texts: list[str]) -> list[tuple]:
+        """
+        Analyzes the given reviews and reports how sure the lexicon is.
+
+        Returns:
+            list[tuple[dict, float]]: The result and confidence of each text.
+        """
+        answers = [analyze_with_lexicon(review_text) for review_text in review_texts]
+        results = self.tag([result for result, _ in answers])
+        return [
+            (result, confidence) for result, (_, confidence) in zip(results, answers)
+        ]
+
+    def analyze_batch(self, review_texts: list[str]) -> list[dict | Exception]:
+        return [result for result, _ in self.analyze_with_confidence(review_texts)]
+
+    async def analyze_batch_async(
+        self, review_texts: list[str]
+    ) -> list[dict | Exception]:
+        # Pure CPU work measured in microseconds; not worth a thread hop.
+        return self.analyze_batch(review_texts)
+
+
+class AnalysisRouter:
+    """
+    Chooses which engine analyzes each review, according to a routing policy.
+
+    Policies:
+        "llm": every review goes to the LLM.
+        "local": every review is answered by the lexicon.
+        "local_then_llm": the lexicon answers first and the reviews whose
+            confidence is below `min_confidence` are escalated to the LLM. If the
+            LLM fails for an escalated review, the lexicon answer is kept.
+
+    With `degraded_fallback`, reviews the LLM could not analyze because the
+    provider is unavailable (see `is_provider_unavailable`) get the lexicon
+    answer marked with `DEGRADED_KEY`, so they are stored and re-analyzed later.
+    """
+
+    POLICIES = ("llm", "local", "local_then_llm")
+
+    def __init__(
+        self,
+        policy: str = ANALYSIS_ENGINE,
+        min_confidence: float = ANALYSIS_LOCAL_MIN_CONFIDENCE,
+        local: LexiconAnalyzer | None = None,
+        llm: SentimentAnalyzer | None = None,
+        degraded_fallback: bool = ANALYSIS_DEGRADED_FALLBACK,
+    ):
+        """
+        Initializes the router.
+
+        Args:
+            policy (str): One of `POLICIES`.
+            min_confidence (float): Confidence below which a local answer is
+                escalated, for the "local_then_llm" policy.
+            local (LexiconAnalyzer | None): The local engine.
+            llm (SentimentAnalyzer | None): The LLM engine.
+            degraded_fallback (bool): Whether to answer with the lexicon when
+                the LLM is unavailable.
+
+        Raises:
+            ValueError: If the policy is unknown.
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(
+                f"ANALYSIS_ENGINE inválido: {policy}. Use {', '.join(self.POLICIES)}."
+            )
+
+        self.policy = policy
+        self.min_confidence = min_confidence
+        self.local = local or LexiconAnalyzer()
+        self.llm = llm or LLMAnalyzer()
+        self.degraded_fallback = degraded_fallback
+        self._lock = threading.Lock()
+        self.clear()
+
+    def analyze_batch(self, review_texts: list[str]) -> list[dict | Exception]:
+        """
+        Analyzes the given reviews with the engines chosen by the policy.
+
+        Args:
+            review_texts (list[str]): The texts of the customer reviews.
+
+        Returns:
+            list[dict | Exception]: One result or error per text, in order.
+        """
+        if self.policy == "llm":
+            self._record(len(review_texts), served_locally=0, escalated=0)
+            results = self.llm.analyze_batch(review_texts)
+            return self._degrade_unavailable(review_texts, results)
+
+        results, escalated = self._analyze_locally(review_texts)
+        if escalated:
+            answers = self.llm.analyze_batch([review_texts[i] for i in escalated])
+            self._merge_escalated(results, escalated, answers)
+
+        return results
+
+    async def analyze_batch_async(
+        self, review_texts: list[str]
+    ) -> list[dict | Exception]:
+        """
+        Asyncio version of `analyze_batch`.
+        """
+        if self.policy == "llm":
+            self._record(len(review_texts), served_locally=0, escalated=0)
+            results = await self.llm.analyze_batch_async(review_texts)
+            return self._degrade_unavailable(review_texts, results)
+
+        results, escalated = self._analyze_locally(review_texts)
+        if escalated:
+            answers = await self.llm.analyze_batch_async(
+                [review_texts[i] for i in escalated]
+            )
+            self._merge_escalated(results, escalated, answers)
+
+        return results
+
+    def clear(self) -> None:
+        """
+        Resets the routing counters.
+        """
+        with self._lock:
+            self.reviews = 0
+            self.served_locally = 0
+            self.escalated = 0
+            self.escalation_failures = 0
+            self.degraded = 0
+            self.local_latency = 0.0
+
+    def stats(self) -> dict:
+        """
+        Reports how the traffic was routed.
+
+        The latency saved is estimated from the average LLM latency per review
+        observed by `analysis_usage`, minus the time spent in the lexicon.
+
+        Returns:
+            dict: Policy, reviews per engine, share served locally, local latency
+                per review and estimated latency saved, in milliseconds.
+        """
+        llm_latency = analysis_usage.latency_per_review()
+
+        with self._lock:
+            saved = (
+                round(
+                    (self.served_locally * llm_latency - self.local_latency) * 1000, 3
+                )
+                if llm_latency is not None
+                else None
+            )
+            analyzed_locally = self.served_locally + self.escalated
+            return {
+                "policy": self.policy,
+                "min_confidence": self.min_confidence,
+                "reviews": self.reviews,
+                "served_locally": self.served_locally,
+                "escalated": self.escalated,
+                "escalation_failures": self.escalation_failures,
+                "degraded": self.degraded,
+                "served_by_llm": self.reviews - self.served_locally,
+                "local_share": (
+                    round(self.served_locally / self.reviews, 4)
+                    if self.reviews
+                    else 0.0
+                ),
+                "local_latency_per_review_ms": (
+                    round(self.local_latency * 1000 / analyzed_locally, 3)
+                    if analyzed_locally
+                    else 0.0
+                ),
+                "estimated_latency_saved_ms": saved,
+            }
+
+    def _analyze_locally(self, review_texts: list[str]) -> tuple[list, list[int]]:
+        started = time.perf_counter()
+        answers = self.local.analyze_with_confidence(review_texts)
+        elapsed = time.perf_counter() - started
+
+        results = [result for result, _ in answers]
+        escalated = []
+        if self.policy == "local_then_llm":
+            escalated = [
+                position
+                for position, (_, confidence) in enumerate(answers)
+                if confidence < self.min_confidence
+            ]
+
+        self._record(
+            len(review_texts),
+            served_locally=len(review_texts) - len(escalated),
+            escalated=len(escalated),
+            local_latency=elapsed,
+        )
+        return results, escalated
+
+    def _merge_escalated(
+        self, results: list, escalated: list[int], answers: list
+    ) -> None:
+        failures = degraded = 0
+        for position, answer in zip(escalated, answers):
+            if isinstance(answer, Exception):
+                logger.warning("Escalonamento ao LLM falhou: %s", answer)
+                failures += 1
+                if self.degraded_fallback and is_provider_unavailable(answer):
+                    results[position] = {**results[position], DEGRADED_KEY: True}
+                    degraded += 1
+                continue
+            results[position] = answer
+
+        if failures:
+            with self._lock:
+                self.escalation_failures += failures
+                self.degraded += degraded
+
+    def _degrade_unavailable(self, review_texts: list[str], results: list) -> list:
+        unavailable = [
+            position
+            for position, result in enumerate(results)
+            if is_provider_unavailable(result)
+        ]
+        if not self.degraded_fallback or not unavailable:
+            return results
+
+        answers = self.local.analyze_batch([review_texts[i] for i in unavailable])
+        for position, answer in zip(unavailable, answers):
+            results[position] = {**answer, DEGRADED_KEY: True}
+
+        with self._lock:
+            self.degraded += len(unavailable)
+        return results
+
+    def _record(
+        self,
+        reviews: int,
+        served_locally: int,
+        escalated: int,
+        local_latency: float = 0.0,
+    ) -> None:
+        with self._lock:
+            self.reviews += reviews
+            self.served_locally += served_locally
+            self.escalated += escalated
+            self.local_latency += local_latency
+
+
+analysis_router = AnalysisRouter()
+
+
+def is_provider_unavailable(result) -> bool:
+    """
+    Tells whether an analysis error means the provider is down or overloaded,
+    rather than a problem with the review itself.
+    """
+    return isinstance(result, (CircuitOpenError, *RETRYABLE_ERRORS))
+
+
+def compute_retry_delay(attempt: int) -> float:
+    """
+    Computes the delay before retrying a model call ("full jitter" backoff).
+
+    Args:
+        attempt (int): The number of attempts already made (starting at 1).
+
+    Returns:
+        float: Seconds to wait, drawn between zero and
+            `LLM_RETRY_BACKOFF * 2 ** (attempt - 1)`.
+    """
+    return random.uniform(0, LLM_RETRY_BACKOFF * 2 ** (attempt - 1))
+
+
+def analyze_reviews(review_texts: list[str]) -> list[dict | Exception]:
+    """
+    Analyzes reviews with the engines selected by `ANALYSIS_ENGINE`.
+
+    This is the entry point used by the analysis workers.
+
+    Args:
+        review_texts (list[str]): The texts of the customer reviews.
+
+    Returns:
+        list[dict | Exception]: One result or error per text, in order.
+    """
+    return analysis_router.analyze_batch(review_texts)
+
+
+async def analyze_reviews_async(review_texts: list[str]) -> list[dict | Exception]:
+    """
+    Asyncio version of `analyze_reviews`.
+    """
+    return await analysis_router.analyze_batch_async(review_texts)
+
+
+def _lookup_batch(
+    review_texts: list[str], cache_get
+) -> tuple[list, dict[str, tuple[str, list[int]]]]:
+    results: list = [None] * len(review_texts)
+    pending: dict[str, tuple[str, list[int]]] = {}
+
+    for position, review_text in enumerate(review_texts):
+        cache_key = build_cache_key(review_text)
+        if cache_key in pending:
+            pending[cache_key][1].append(position)
+            continue
+
+        cached = cache_get(cache_key)
+        if cached is not None:
+            results[position] = cached
+        else:
+            pending[cache_key] = (review_text, [position])
+
+    return results, pending
+
+
+def _store_batch_result(
+    results: list, positions: list[int], cache_key: str, result
+) -> None:
+    if not isinstance(result, Exception):
+        analysis_cache.set(cache_key, result)
+
+    _fill_positions(results, positions, result)
+
+
+def _fill_positions(results: list, positions: list[int], result) -> None:
+    # Repeated texts share the result, but only the first one is charged the
+    # usage of the call.
+    for position in positions:
+        results[position] = result
+        result = strip_call_usage(result)
+
+
+def _build_messages(review_text: str) -> list[dict]:
+    return [
+        {"role": "system", "content": SENTIMENT_PROMPT},
+        {"role": "user", "content": truncate_review_text(review_text)},
+    ]
+
+
+def _build_batch_messages(review_texts: list[str]) -> list[dict]:
+    numbered = "\n\n".join(
+        f"[{index}] {truncate_review_text(review_text)}"
+        for index, review_text in enumerate(review_texts, start=1)
     )
+    return [
+        {"role": "system", "content": BATCH_SENTIMENT_PROMPT},
+        {"role": "user", "content": numbered},
+    ]
+
+
+def _parse_batch_completion(completion, size: int, latency: float) -> dict[int, dict]:
+    # Maps each position of the batch to its analysis, with its share of the
+    # call usage. Out of range or repeated indexes are dropped, so those
+    # reviews fall back to single calls.
+    parsed: ReviewBatchDetails | None = completion.choices[0].message.parsed
+    if parsed is None:
+        return {}
+
+    usage = build_call_usage(completion.usage, latency, size)
+    analyses: dict[int, dict] = {}
+    repeated: set[int] = set()
+    for item in parsed.results:
+        position = item.index - 1
+        if not 0 <= position < size:
+            continue
+        if position in analyses:
+            repeated.add(position)
+        analyses[position] = {
+            **item.model_dump(by_alias=True, exclude={"index"}),
+            **usage,
+        }
+
+    for position in repeated:
+        del analyses[position]
+
+    return analyses
+
+
+def _call_model(
+    messages: list[dict], response_format: type[BaseModel], reviews: int = 1
+):
+    # Returns the completion and the latency of the attempt that succeeded.
+    deadline = time.monotonic() + LLM_DEADLINE
+    attempt = 0
+
+    while True:
+        attempt += 1
+        llm_breaker.before_call()
+        try:
+            with llm_limiter.limit():
+                started = time.perf_counter()
+                completion = get_client().beta.chat.completions.parse(
+                    model=MODEL_NAME,
+                    messages=messages,
+                    response_format=response_format,
+                    **build_max_tokens(reviews),
+                )
+                latency = time.perf_counter() - started
+        except RETRYABLE_ERRORS:
+            llm_breaker.record_failure()
+            delay = compute_retry_delay(attempt)
+            if attempt > LLM_MAX_RETRIES or time.monotonic() + delay > deadline:
+                raise
+            time.sleep(delay)
+            continue
+        except Exception:
+            # The provider answered; the request itself was the problem.
+            llm_breaker.record_success()
+            raise
+
+        llm_breaker.record_success()
+        return completion, latency
+
+
+async def _call_model_async(
+    messages: list[dict], response_format: type[BaseModel], reviews: int = 1
+):
+    deadline = time.monotonic() + LLM_DEADLINE
+    attempt = 0
+
+    while True:
+        attempt += 1
+        llm_breaker.before_call()
+        try:
+            async with llm_limiter.limit_async():
+                started = time.perf_counter()
+                completion = await get_async_client().beta.chat.completions.parse(
+                    model=MODEL_NAME,
+                    messages=messages,
+                    response_format=response_format,
+                    **build_max_tokens(reviews),
+                )
+                latency = time.perf_counter() - started
+        except RETRYABLE_ERRORS:
+            llm_breaker.record_failure()
+            delay = compute_retry_delay(attempt)
+            if attempt > LLM_MAX_RETRIES or time.monotonic() + delay > deadline:
+                raise
+            await asyncio.sleep(delay)
+            continue
+        except Exception:
+            llm_breaker.record_success()
+            raise
+
+        llm_breaker.record_success()
+        return completion, latency
+
+
+def _request_sentiment_analysis(review_text: str) -> dict:
+    completion, latency = _call_model(_build_messages(review_text), ReviewDetails)
+    analysis_usage.record("single", 1, completion.usage, latency)
+    content = completion.choices[0].message.parsed
+
+    return {
+        **content.model_dump(by_alias=True),
+        **build_call_usage(completion.usage, latency, 1),
+    }
+
+
+async def _request_sentiment_analysis_async(review_text: str) -> dict:
+    completion, latency = await _call_model_async(
+        _build_messages(review_text), ReviewDetails
+    )
+    analysis_usage.record("single", 1, completion.usage, latency)
     content = completion.choices[0].message.parsed
 
-    return content.model_dump(by_alias=True)
+    return {
+        **content.model_dump(by_alias=True),
+        **build_call_usage(completion.usage, latency, 1),
+    }
+
+
+def _request_batch_sentiment_analysis(review_texts: list[str]) -> dict[int, dict]:
+    completion, latency = _call_model(
+        _build_batch_messages(review_texts), ReviewBatchDetails, len(review_texts)
+    )
+    analysis_usage.record("batch", len(review_texts), completion.usage, latency)
+
+    return _parse_batch_completion(completion, len(review_texts), latency)
+
+
+async def _request_batch_sentiment_analysis_async(
+    review_texts: list[str],
+) -> dict[int, dict]:
+    completion, latency = await _call_model_async(
+        _build_batch_messages(review_texts), ReviewBatchDetails, len(review_texts)
+    )
+    analysis_usage.record("batch", len(review_texts), completion.usage, latency)
+
+    return _parse_batch_completion(completion, len(review_texts), latency)
+
+
+def _repair_score(value) -> float | None:
+    if isinstance(value, str):
+        try:
+            value = float(value.strip().replace(",", "."))
+        except ValueError:
+            return None
+
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    if math.isnan(value):
+        return None
+
+    return min(max(float(value), -1.0), 1.0)
+
+
+def _repair_sentiment(value) -> str | None:
+    if not isinstance(value, str):
+        return None
+
+    label = strip_accents(value).strip(" .'\"")
+    return label if label in SENTIMENT_LABELS else SENTIMENT_REPAIRS.get(label)
+
+
+def _sentiment_from_score(score: float) -> str:
+    # Same thresholds as the lexicon.
+    if score >= SENTIMENT_THRESHOLD:
+        return "positiva"
+    if score <= -SENTIMENT_THRESHOLD:
+        return "negativa"
+    return "neutra"
@@ -0,0 +1,387 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from sqlalchemy import ColumnElement, Select, and_, or_, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from app.models.models import AnalysisStatusEnum, Review
+from app.services.ai_service import analyze_reviews, analyze_reviews_async
+from app.services.async_reviews_service import AsyncReviewService
+from app.services.flow_control import CircuitOpenError
+from app.services.metrics import stage_timer
+from app.services.response_cache import response_cache
+from app.services.reviews_service import ReviewService
+from app.utils.variables import (
+    ANALYSIS_BACKOFF_BASE,
+    ANALYSIS_BACKOFF_MAX,
+    ANALYSIS_BATCH_SIZE,
+    ANALYSIS_LEASE_SECONDS,
+    ANALYSIS_MAX_ATTEMPTS,
+    ANALYSIS_POLL_INTERVAL,
+    ANALYSIS_WORKERS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisWorker:
+    """
+    Pool of background threads that drains the sentiment analysis queue.
+
+    The queue is the `reviews` table itself: every review whose
+    `analysis_status` is pending (or processing with an expired lease) and whose
+    `analysis_next_attempt_at` is due can be claimed. Claims use
+    `SELECT ... FOR UPDATE SKIP LOCKED`, so several workers and replicas can share
+    the same queue without analyzing a review twice.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        workers: int = ANALYSIS_WORKERS,
+        batch_size: int = ANALYSIS_BATCH_SIZE,
+        poll_interval: float = ANALYSIS_POLL_INTERVAL,
+        max_attempts: int = ANALYSIS_MAX_ATTEMPTS,
+    ):
+        """
+        Initializes the worker pool.
+
+        Args:
+            session_factory (sessionmaker): Factory used to open database sessions.
+            workers (int): Number of worker threads. Zero disables the pool.
+            batch_size (int): Maximum number of reviews claimed at once.
+            poll_interval (float): Seconds to wait when the queue is empty.
+            max_attempts (int): Attempts before a review is marked as failed.
+        """
+        self.session_factory = session_factory
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self._stop_event = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        """
+        Starts the worker threads.
+        """
+        self._stop_event.clear()
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._run, name=f"analysis-worker-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Signals the worker threads to stop and waits for them to finish.
+
+        Args:
+            timeout (float): Maximum seconds to wait for each thread.
+        """
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                processed = self.run_once()
+            except Exception:
+                logger.exception("Falha ao processar a fila de análises.")
+                processed = 0
+
+            if not processed:
+                self._stop_event.wait(self.poll_interval)
+
+    def run_once(self) -> int:
+        """
+        Claims a batch of due reviews and analyzes them.
+
+        The claimed reviews are sent together to `analyze_reviews`, which routes
+        them to the configured engine and packs LLM calls. A review whose result
+        cannot be saved is registered as failed on its own, so the rest of the
+        batch is still saved.
+
+        Returns:
+            int: The number of reviews processed in this round.
+        """
+        claimed = self._claim_batch()
+        if not claimed:
+            return 0
+
+        with stage_timer("llm_analyze"):
+            results = analyze_reviews([text for _, text in claimed])
+
+        for (review_id, _), analysis_data in zip(claimed, results):
+            if isinstance(analysis_data, Exception):
+                logger.warning(
+                    "Análise da avaliação %s falhou: %s", review_id, analysis_data
+                )
+                self._register_failure(review_id, analysis_data)
+                continue
+
+            try:
+                with self.session_factory() as session:
+                    ReviewService(session).save_sentiment_analysis(
+                        review_id, analysis_data
+                    )
+            except Exception as error:
+                logger.exception(
+                    "Falha ao gravar a análise da avaliação %s.", review_id
+                )
+                self._register_failure(review_id, error)
+
+        return len(claimed)
+
+    def _claim_batch(self) -> list[tuple[int, str]]:
+        now = int(time.time())
+
+        with self.session_factory() as session:
+            reviews = session.scalars(build_claim_query(now, self.batch_size)).all()
+            claimed = claim_reviews(reviews, now)
+            session.commit()
+
+        response_cache.invalidate(
+            [review_id for review_id, _ in claimed], listing=False
+        )
+        return claimed
+
+    def _register_failure(self, review_id: int, error: Exception) -> None:
+        with self.session_factory() as session:
+            review: Review = session.get(Review, review_id)
+            if not review:
+                return
+
+            register_failure(review, error, self.max_attempts)
+            session.commit()
+
+        response_cache.invalidate([review_id], listing=False)
+
+
+class AsyncAnalysisWorker:
+    """
+    Asyncio counterpart of `AnalysisWorker`, used when `ASYNC_MODE` is enabled.
+
+    Each worker is a task on the event loop that claims reviews through an
+    `AsyncSession` and calls the model with `openai.AsyncOpenAI`, so waiting on
+    the LLM does not hold a thread.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        workers: int = ANALYSIS_WORKERS,
+        batch_size: int = ANALYSIS_BATCH_SIZE,
+        poll_interval: float = ANALYSIS_POLL_INTERVAL,
+        max_attempts: int = ANALYSIS_MAX_ATTEMPTS,
+    ):
+        """
+        Initializes the worker pool.
+
+        Args:
+            session_factory (async_sessionmaker): Factory of asyncio sessions.
+            workers (int): Number of worker tasks. Zero disables the pool.
+            batch_size (int): Maximum number of reviews claimed at once.
+            poll_interval (float): Seconds to wait when the queue is empty.
+            max_attempts (int): Attempts before a review is marked as failed.
+        """
+        self.session_factory = session_factory
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        """
+        Starts the worker tasks on the running event loop.
+        """
+        for index in range(self.workers):
+            self._tasks.append(
+                asyncio.create_task(self._run(), name=f"analysis-worker-{index}")
+            )
+
+    async def stop(self) -> None:
+        """
+        Cancels the worker tasks and waits for them to finish.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                processed = await self.run_once()
+            except Exception:
+                logger.exception("Falha ao processar a fila de análises.")
+                processed = 0
+
+            if not processed:
+                await asyncio.sleep(self.poll_interval)
+
+    async def run_once(self) -> int:
+        """
+        Claims a batch of due reviews and analyzes them concurrently.
+
+        Returns:
+            int: The number of reviews processed in this round.
+        """
+        now = int(time.time())
+
+        async with self.session_factory() as session:
+            query = build_claim_query(now, self.batch_size)
+            reviews = (await session.scalars(query)).all()
+            claimed = claim_reviews(reviews, now)
+            await session.commit()
+
+        if not claimed:
+            return 0
+
+        await response_cache.invalidate_async(
+            [review_id for review_id, _ in claimed], listing=False
+        )
+
+        with stage_timer("llm_analyze"):
+            results = await analyze_reviews_async([text for _, text in claimed])
+        await asyncio.gather(
+            *(
+                self._store(review_id, analysis_data)
+                for (review_id, _), analysis_data in zip(claimed, results)
+            )
+        )
+
+        return len(claimed)
+
+    async def _store(self, review_id: int, analysis_data: dict | Exception) -> None:
+        if isinstance(analysis_data, Exception):
+            logger.warning(
+                "Análise da avaliação %s falhou: %s", review_id, analysis_data
+            )
+            await self._register_failure(review_id, analysis_data)
+            return
+
+        try:
+            async with self.session_factory() as session:
+                await AsyncReviewService(session).save_sentiment_analysis(
+                    review_id, analysis_data
+                )
+        except Exception as error:
+            logger.exception("Falha ao gravar a análise da avaliação %s.", review_id)
+            await self._register_failure(review_id, error)
+
+    async def _register_failure(self, review_id: int, error: Exception) -> None:
+        async with self.session_factory() as session:
+            review: Review = await session.get(Review, review_id)
+            if review:
+                register_failure(review, error, self.max_attempts)
+                await session.commit()
+        await response_cache.invalidate_async([review_id], listing=False)
+
+
+def build_claim_query(now: int, batch_size: int) -> Select:
+    """
+    Builds the query that locks the next due reviews of the analysis queue.
+
+    Args:
+        now (int): Current timestamp.
+        batch_size (int): Maximum number of reviews to claim.
+
+    Returns:
+        Select: A `SELECT ... FOR UPDATE SKIP LOCKED` over the due reviews.
+    """
+    return (
+        select(Review)
+        .filter(build_due_filter(now))
+        .order_by(Review.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+
+
+def build_due_filter(now: int) -> ColumnElement[bool]:
+    """
+    Selects the reviews of the analysis queue that can be claimed at `now`.
+    """
+    due = or_(
+        Review.analysis_next_attempt_at.is_(None),
+        Review.analysis_next_attempt_at <= now,
+    )
+    return or_(
+        and_(Review.analysis_status == AnalysisStatusEnum.PENDING, due),
+        and_(
+            Review.analysis_status.in_(
+                [AnalysisStatusEnum.PROCESSING, AnalysisStatusEnum.DEGRADED]
+            ),
+            Review.analysis_next_attempt_at <= now,
+        ),
+    )
+
+
+def claim_reviews(reviews: list[Review], now: int) -> list[tuple[int, str]]:
+    """
+    Marks reviews as processing under a lease and counts the attempt.
+
+    Args:
+        reviews (list[Review]): The reviews locked by `build_claim_query`.
+        now (int): Current timestamp.
+
+    Returns:
+        list[tuple[int, str]]: The (id, text) pairs of the claimed reviews.
+    """
+    for review in reviews:
+        review.analysis_status = AnalysisStatusEnum.PROCESSING
+        review.analysis_attempts += 1
+        review.analysis_next_attempt_at = now + ANALYSIS_LEASE_SECONDS
+
+    return [(review.id, review.review_text) for review in reviews]
+
+
+def register_failure(review: Review, error: Exception, max_attempts: int) -> None:
+    """
+    Schedules a retry of a failed analysis, or marks it as failed for good.
+
+    A `CircuitOpenError` means the call was never made, so the attempt is given
+    back and the review waits for the circuit to close instead.
+
+    Args:
+        review (Review): The review whose analysis failed.
+        error (Exception): The error raised by the analyzer.
+        max_attempts (int): Attempts before the review is marked as failed.
+    """
+    review.analysis_error = str(error)[:500]
+    if isinstance(error, CircuitOpenError):
+        review.analysis_status = AnalysisStatusEnum.PENDING
+        review.analysis_attempts = max(review.analysis_attempts - 1, 0)
+        review.analysis_next_attempt_at = int(time.time() + error.retry_after) + 1
+    elif review.analysis_attempts >= max_attempts:
+        review.analysis_status = AnalysisStatusEnum.FAILED
+        review.analysis_next_attempt_at = None
+    else:
+        review.analysis_status = AnalysisStatusEnum.PENDING
+        review.analysis_next_attempt_at = int(
+            time.time() + compute_backoff(review.analysis_attempts)
+        )
+
+
+def compute_backoff(attempt: int) -> float:
+    """
+    Computes the delay before the next analysis attempt.
+
+    Uses exponential backoff capped at `ANALYSIS_BACKOFF_MAX`, with random jitter so
+    that reviews that failed together do not retry together.
+
+    Args:
+        attempt (int): The number of attempts already made (starting at 1).
+
+    Returns:
+        float: Seconds to wait before the review can be claimed again.
+    """
+    delay = min(ANALYSIS_BACKOFF_MAX, ANALYSIS_BACKOFF_BASE * 2 ** (attempt - 1))
+    return random.uniform(delay / 2, delay)
@@ -0,0 +1,270 @@
+import time
+from datetime import datetime, timezone
+from typing import Iterator
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    text,
+)
+from sqlalchemy.orm import Session
+from app.models.models import (
+    AnalysisStatusEnum,
+    IdempotencyKey,
+    Review,
+    ReviewArchive,
+    ReviewKeyword,
+    SentimentAnalysis,
+)
+from app.services.search_service import build_search_cleanup_statement
+from app.utils.variables import ARCHIVE_BATCH_SIZE
+
+ARCHIVE_TABLE = ReviewArchive.__tablename__
+# Reviews still owned by the analysis queue stay in `reviews`.
+ARCHIVABLE_STATUSES = (AnalysisStatusEnum.DONE, AnalysisStatusEnum.FAILED)
+# Text columns of the archive partitions compressed with lz4 (PostgreSQL 14+).
+COMPRESSED_COLUMNS = ("review_text", "explanation")
+
+# Columns copied to `reviews_archive`, and where each one comes from.
+ARCHIVE_COLUMNS = {
+    "id": Review.id,
+    "review_date": Review.review_date,
+    "customer_name": Review.customer_name,
+    "review_text": Review.review_text,
+    "sentiment": Review.sentiment,
+    "analysis_status": Review.analysis_status,
+    "analysis_sentiment": SentimentAnalysis.sentiment,
+    "score": SentimentAnalysis.score,
+    "keywords": SentimentAnalysis.keywords,
+    "explanation": SentimentAnalysis.explanation,
+    "model": SentimentAnalysis.model,
+    "prompt_version": SentimentAnalysis.prompt_version,
+}
+
+
+def month_start(timestamp: int) -> datetime:
+    """
+    Returns the first instant (UTC) of the month of a timestamp.
+    """
+    moment = datetime.fromtimestamp(timestamp, timezone.utc)
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(moment: datetime, months: int) -> datetime:
+    """
+    Moves the first day of a month by a number of months (negative goes back).
+    """
+    index = moment.year * 12 + moment.month - 1 + months
+    return moment.replace(year=index // 12, month=index % 12 + 1)
+
+
+def iter_months(start_timestamp: int, end_timestamp: int) -> Iterator[tuple]:
+    """
+    Lists the months (UTC) covering a range of timestamps.
+
+    Yields:
+        tuple[datetime, int, int]: The first day of each month and its bounds
+            as timestamps, the end being exclusive.
+    """
+    current = month_start(start_timestamp)
+    while int(current.timestamp()) <= end_timestamp:
+        following = add_months(current, 1)
+        yield current, int(current.timestamp()), int(following.timestamp())
+        current = following
+
+
+def retention_cutoff(months: int, now: float | None = None) -> int:
+    """
+    Computes the timestamp before which reviews are archived.
+
+    Whole months are kept: with `months=24`, the current month and the 24
+    before it stay in `reviews`.
+
+    Args:
+        months (int): Months kept besides the current one.
+        now (float | None): Current timestamp (defaults to the clock).
+
+    Returns:
+        int: The first instant (UTC) of the oldest month kept.
+    """
+    current = month_start(int(time.time() if now is None else now))
+    return int(add_months(current, -months).timestamp())
+
+
+def create_archive_partitions(
+    executor, start_timestamp: int, end_timestamp: int
+) -> None:
+    """
+    Creates the monthly partitions of the archive covering a range, if missing.
+
+    Only PostgreSQL partitions the archive; elsewhere this does nothing.
+
+    Args:
+        executor (Session | Connection): Where to execute the DDL.
+        start_timestamp (int): Start of the range.
+        end_timestamp (int): End of the range (inclusive).
+    """
+    dialect = getattr(executor, "dialect", None) or executor.get_bind().dialect
+    if dialect.name != "postgresql":
+        return
+
+    compress = (dialect.server_version_info or (0,)) >= (14,)
+    for month, lower, upper in iter_months(start_timestamp, end_timestamp):
+        partition = f"{ARCHIVE_TABLE}_{month:%Y_%m}"
+        executor.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {partition} PARTITION OF {ARCHIVE_TABLE} "
+                f"FOR VALUES FROM ({lower}) TO ({upper})"
+            )
+        )
+        if compress:
+            columns = ", ".join(
+                f"ALTER COLUMN {column} SET COMPRESSION lz4"
+                for column in COMPRESSED_COLUMNS
+            )
+            executor.execute(text(f"ALTER TABLE {partition} {columns}"))
+
+
+def build_archivable_query(cutoff: int, limit: int) -> Select:
+    """
+    Builds the query of the next reviews older than `cutoff` to archive.
+    """
+    return (
+        select(Review.id)
+        .filter(
+            Review.review_date < cutoff,
+            Review.analysis_status.in_(ARCHIVABLE_STATUSES),
+        )
+        .order_by(Review.id)
+        .limit(limit)
+    )
+
+
+def archive_batch(session: Session, review_ids: list[int]) -> None:
+    """
+    Moves reviews and their analyses to the archive, in the current transaction.
+
+    Their keywords, full-text index entries and idempotency keys are dropped.
+    The daily rollup is kept as it is, so report summaries still count them.
+
+    Args:
+        session (Session): The session. The caller is responsible for committing.
+        review_ids (list[int]): The reviews to archive.
+    """
+    dialect_name = session.get_bind().dialect.name
+    selected = Review.id.in_(review_ids)
+
+    first, last = session.execute(
+        select(func.min(Review.review_date), func.max(Review.review_date)).filter(
+            selected
+        )
+    ).one()
+    create_archive_partitions(session, first, last)
+
+    rows = (
+        select(*ARCHIVE_COLUMNS.values(), literal(int(time.time())))
+        .outerjoin(SentimentAnalysis, SentimentAnalysis.review_id == Review.id)
+        .filter(selected)
+    )
+    session.execute(
+        insert(ReviewArchive).from_select([*ARCHIVE_COLUMNS, "archived_at"], rows)
+    )
+
+    session.execute(build_search_cleanup_statement(dialect_name, selected))
+    session.execute(
+        delete(ReviewKeyword).filter(ReviewKeyword.review_id.in_(review_ids))
+    )
+    session.execute(
+        delete(IdempotencyKey).filter(IdempotencyKey.review_id.in_(review_ids))
+    )
+    session.execute(
+        delete(SentimentAnalysis).filter(SentimentAnalysis.review_id.in_(review_ids))
+    )
+    session.execute(delete(Review).filter(selected))
+
+
+def archive_reviews(
+    session: Session, cutoff: int, batch_size: int = ARCHIVE_BATCH_SIZE
+) -> int:
+    """
+    Applies the retention policy: moves every analyzed review older than
+    `cutoff` to the archive.
+
+    Reviews are moved `batch_size` at a time, each batch in its own transaction,
+    so the job holds short locks and can be interrupted and run again.
+
+    Args:
+        session (Session): The session.
+        cutoff (int): Reviews dated before this timestamp are archived.
+        batch_size (int): Reviews moved per transaction.
+
+    Returns:
+        int: The number of archived reviews.
+    """
+    archived = 0
+
+    while True:
+        review_ids = session.scalars(build_archivable_query(cutoff, batch_size)).all()
+        if not review_ids:
+            return archived
+
+        archive_batch(session, list(review_ids))
+        session.commit()
+        archived += len(review_ids)
+
+
+def build_archive_boundary_query() -> Select:
+    """
+    Builds the query of the newest archived review date (None when empty).
+    """
+    return select(func.max(ReviewArchive.review_date))
+
+
+def reaches_archive(boundary: int | None, start_timestamp: int) -> bool:
+    """
+    Tells whether a date range starting at `start_timestamp` covers archived
+    reviews, given the result of `build_archive_boundary_query`.
+    """
+    return boundary is not None and start_timestamp <= boundary
+
+
+def build_archive_range_filters(
+    start_timestamp: int, end_timestamp: int
+) -> tuple[ColumnElement[bool], ...]:
+    """
+    Builds the conditions selecting the archived reviews within a date range.
+    """
+    return (
+        ReviewArchive.review_date >= start_timestamp,
+        ReviewArchive.review_date <= end_timestamp,
+    )
+
+
+def build_archive_report_query(start_timestamp: int, end_timestamp: int) -> Select:
+    """
+    Builds the archive counterpart of the report query, with the same columns.
+    """
+    return select(
+        ReviewArchive.id,
+        ReviewArchive.customer_name,
+        ReviewArchive.review_date,
+        ReviewArchive.review_text,
+        ReviewArchive.analysis_status,
+        ReviewArchive.analysis_sentiment.label("sentiment"),
+        ReviewArchive.score,
+        ReviewArchive.keywords,
+        ReviewArchive.explanation,
+    ).filter(*build_archive_range_filters(start_timestamp, end_timestamp))
+
+
+def build_archive_count_query(start_timestamp: int, end_timestamp: int) -> Select:
+    """
+    Builds the `COUNT(*)` of the archived reviews within a date range.
+    """
+    return select(func.count(ReviewArchive.id)).filter(
+        *build_archive_range_filters(start_timestamp, end_timestamp)
+    )
@@ -0,0 +1,492 @@
+from typing import Iterable
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from app.models.models import IdempotencyKey, Review
+from app.services.archive_service import (
+    build_archive_boundary_query,
+    build_archive_count_query,
+    reaches_archive,
+)
+from app.services.idempotency_service import (
+    build_duplicate_query,
+    build_idempotency_record,
+    build_request_hash,
+    replay_response,
+    validate_idempotency_key,
+)
+from app.services.keywords_service import (
+    build_top_keywords_query,
+    serialize_top_keywords,
+)
+from app.services.metrics import stage_timer
+from app.services.response_cache import response_cache
+from app.services.rollup_service import (
+    build_rollup_statements,
+    build_summary,
+    build_summary_query,
+)
+from app.services.reviews_service import (
+    apply_sentiment_analysis,
+    build_all_reviews_query,
+    build_analysis_status_query,
+    build_count_query,
+    build_cursor_page,
+    build_keyset_query,
+    build_keyword_range_filters,
+    build_listing_filters,
+    build_report_filters,
+    build_report_query,
+    build_search_keyset_query,
+    build_search_request,
+    bulk_insert_results,
+    chunked,
+    parse_report_range,
+    prepare_bulk_rows,
+    serialize_analysis_status,
+    serialize_created_review,
+    serialize_listing_rows,
+    serialize_review,
+    serialize_search_rows,
+    transform_report_rows,
+    validate_review_data,
+)
+from app.services.search_service import build_search_index_statements
+from app.services.stats_service import (
+    build_bucket_column,
+    build_percentiles,
+    build_percentiles_query,
+    build_stats,
+    build_stats_query,
+)
+from app.utils.pagination import (
+    OffsetParams,
+    build_offset_page,
+    build_offset_query,
+)
+from app.utils.variables import REVIEW_DEDUP_ENABLED
+
+
+class AsyncReviewService:
+    """
+    Asyncio counterpart of `ReviewService`, used when `ASYNC_MODE` is enabled.
+
+    It builds the same queries and payloads as `ReviewService` (through the shared
+    helpers of `reviews_service`), but awaits an `AsyncSession` instead of
+    blocking a threadpool worker while Postgres answers.
+    """
+
+    def __init__(self, db: AsyncSession):
+        """
+        Initializes the AsyncReviewService with an asyncio database session.
+        """
+        self.db = db
+
+    async def create_review(
+        self, review_data: dict, idempotency_key: str | None = None
+    ) -> dict:
+        """
+        Creates a new customer review and queues it for sentiment analysis.
+
+        Args:
+            review_data (dict): The review payload, see `ReviewService.create_review`.
+            idempotency_key (str | None): The `Idempotency-Key` header, if sent.
+
+        Raises:
+            HTTPException: If required fields are missing or have invalid values,
+                or if the key was already used for a different review.
+
+        Returns:
+            dict: The created review details and its analysis status.
+        """
+        idempotency_key = validate_idempotency_key(idempotency_key)
+        if idempotency_key is not None:
+            request_hash = build_request_hash(review_data)
+            record = await self.db.get(IdempotencyKey, idempotency_key)
+            if record is not None:
+                return replay_response(record, request_hash)
+
+        with stage_timer("validate"):
+            values = validate_review_data(review_data)
+
+        with stage_timer("db_insert"):
+            review = None
+            if REVIEW_DEDUP_ENABLED:
+                review = (
+                    await self.db.scalars(build_duplicate_query(values["content_hash"]))
+                ).first()
+            created = review is None
+            if created:
+                review = Review(**values)
+                self.db.add(review)
+                await self.db.flush()
+                await self.index_reviews(Review.id == review.id)
+
+            response = serialize_created_review(
+                review, review_data["review_date"], created
+            )
+            if idempotency_key is not None:
+                self.db.add(
+                    build_idempotency_record(
+                        idempotency_key, request_hash, review.id, response
+                    )
+                )
+
+            try:
+                await self.db.commit()
+            except IntegrityError:
+                # A concurrent retry with the same key committed first.
+                await self.db.rollback()
+                if idempotency_key is None:
+                    raise
+                record = await self.db.get(IdempotencyKey, idempotency_key)
+                if record is None:
+                    raise
+                return replay_response(record, request_hash)
+
+        if created:
+            await response_cache.invalidate_async()
+
+        return response
+
+    async def create_reviews_bulk(
+        self, rows: Iterable, start_index: int = 0
+    ) -> list[dict]:
+        """
+        Validates and stores many reviews at once, queueing them for analysis.
+
+        Args:
+            rows (Iterable): Review payloads, see `ReviewService.create_reviews_bulk`.
+            start_index (int): Index of the first row, used in the results.
+
+        Returns:
+            list[dict]: One result per row, in input order.
+        """
+        results, valid_rows = prepare_bulk_rows(rows, start_index)
+
+        for chunk in chunked(valid_rows):
+            query = insert(Review).returning(Review.id, sort_by_parameter_order=True)
+            try:
+                with stage_timer("db_insert_bulk"):
+                    review_ids = (
+                        await self.db.scalars(query, [values for _, values in chunk])
+                    ).all()
+                    await self.index_reviews(Review.id.in_(review_ids))
+                    await self.db.commit()
+            except SQLAlchemyError:
+                await self.db.rollback()
+                review_ids = None
+
+            results.extend(bulk_insert_results(chunk, review_ids))
+
+        if valid_rows:
+            await response_cache.invalidate_async()
+
+        return sorted(results, key=lambda result: result["index"])
+
+    async def save_sentiment_analysis(
+        self, review_id: int, analysis_data: dict
+    ) -> None:
+        """
+        Stores the AI sentiment analysis of a review and marks it as done.
+
+        Args:
+            review_id (int): The ID of the analyzed review.
+            analysis_data (dict): The result returned by the analyzer.
+        """
+        with stage_timer("db_insert_analysis"):
+            review: Review = await self.db.scalar(
+                select(Review)
+                .options(
+                    selectinload(Review.sentiment_analysis),
+                    selectinload(Review.keywords),
+                )
+                .filter(Review.id == review_id)
+            )
+
+            if not review:
+                return
+
+            replaced = review.sentiment_analysis is not None
+            apply_sentiment_analysis(review, analysis_data)
+            await self.db.flush()
+
+            dialect_name = self.db.get_bind().dialect.name
+            for statement in build_rollup_statements(dialect_name, review, replaced):
+                await self.db.execute(statement)
+            await self.index_reviews(Review.id == review_id)
+
+            await self.db.commit()
+        await response_cache.invalidate_async([review_id])
+
+    async def index_reviews(self, *filters) -> None:
+        """
+        Asyncio version of `ReviewService.index_reviews`.
+        """
+        dialect_name = self.db.get_bind().dialect.name
+        for statement in build_search_index_statements(dialect_name, *filters):
+            await self.db.execute(statement)
+
+    async def get_analysis_status(self, review_id: int) -> dict:
+        """
+        Retrieves the sentiment analysis status of a specific review.
+
+        Args:
+            review_id (int): The ID of the review.
+
+        Returns:
+            dict: The analysis status, or a 404 message if the review is not found.
+        """
+        review: Review = (
+            await self.db.scalars(build_analysis_status_query(review_id))
+        ).first()
+
+        if not review:
+            return {
+                "status": 404,
+                "message": "Avaliação não encontrada",
+            }
+
+        return serialize_analysis_status(review)
+
+    async def get_all_reviews(
+        self,
+        params: OffsetParams | None = None,
+        cursor: str | None = None,
+        keyword: str | None = None,
+    ) -> dict:
+        """
+        Retrieves all stored customer reviews, paginated.
+
+        Args:
+            params (OffsetParams | None): Page, size and whether to count the total.
+            cursor (str | None): Switches to keyset pagination, see
+                `ReviewService.get_all_reviews`.
+            keyword (str | None): Only lists the reviews mentioning this keyword.
+
+        Returns:
+            dict: The requested page of reviews, see `ReviewService.get_all_reviews`.
+        """
+        params = params or OffsetParams()
+        filters = build_listing_filters(keyword)
+        query = build_all_reviews_query(*filters)
+        total = (
+            await self.db.scalar(build_count_query(*filters))
+            if params.include_total
+            else None
+        )
+
+        if cursor is not None:
+            keyset_query = build_keyset_query(query, cursor, params.size)
+            return build_cursor_page(
+                (await self.db.execute(keyset_query)).all(),
+                params.size,
+                total,
+                serialize_listing_rows,
+            )
+
+        rows = (await self.db.execute(build_offset_query(query, params))).all()
+
+        return build_offset_page(serialize_listing_rows(rows), params, total)
+
+    async def get_top_keywords(
+        self,
+        limit: int = 20,
+        start_date: str | None = None,
+        end_date: str | None = None,
+    ) -> dict:
+        """
+        Lists the keywords mentioned by the most analyzed reviews.
+
+        Args:
+            limit (int): Maximum number of keywords.
+            start_date (str | None): Optional start date in "YYYY-MM-DD" format.
+            end_date (str | None): Optional end date in "YYYY-MM-DD" format.
+
+        Returns:
+            dict: The keywords with their review count, or a 400 message if the
+                dates are invalid.
+        """
+        try:
+            filters = build_keyword_range_filters(start_date, end_date)
+        except ValueError:
+            return {
+                "status": 400,
+                "message": "Formato de data inválido. Use YYYY-MM-DD.",
+            }
+
+        rows = (await self.db.execute(build_top_keywords_query(limit, *filters))).all()
+
+        return serialize_top_keywords(rows)
+
+    async def get_review_stats(
+        self,
+        bucket: str = "day",
+        start_date: str | None = None,
+        end_date: str | None = None,
+    ) -> dict:
+        """
+        Computes sentiment trends of the analyzed reviews, grouped in the database.
+
+        Args:
+            bucket (str): "day", "week" or "month".
+            start_date (str | None): Optional start date in "YYYY-MM-DD" format.
+            end_date (str | None): Optional end date in "YYYY-MM-DD" format.
+
+        Returns:
+            dict: See `ReviewService.get_review_stats`.
+        """
+        try:
+            filters = build_keyword_range_filters(start_date, end_date)
+        except ValueError:
+            return {
+                "status": 400,
+                "message": "Formato de data inválido. Use YYYY-MM-DD.",
+            }
+
+        dialect_name = self.db.get_bind().dialect.name
+        bucket_column = build_bucket_column(bucket, dialect_name)
+
+        rows = (await self.db.execute(build_stats_query(bucket_column, *filters))).all()
+        percentile_rows = (
+            await self.db.execute(
+                build_percentiles_query(bucket_column, dialect_name, *filters)
+            )
+        ).all()
+
+        return build_stats(
+            bucket, rows, build_percentiles(percentile_rows, dialect_name)
+        )
+
+    async def search_reviews(
+        self,
+        q: str,
+        size: int = 20,
+        cursor: str = "",
+        sentiment: str | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+    ) -> dict:
+        """
+        Searches the review texts and analysis explanations, see
+        `ReviewService.search_reviews`.
+
+        Returns:
+            dict: The search terms and a cursor page of results, or a 400
+                message if the dates are invalid.
+        """
+        dialect_name = self.db.get_bind().dialect.name
+        try:
+            query = build_search_request(
+                dialect_name, q, sentiment, start_date, end_date
+            )
+        except ValueError:
+            return {
+                "status": 400,
+                "message": "Formato de data inválido. Use YYYY-MM-DD.",
+            }
+
+        rows = []
+        if query is not None:
+            with stage_timer("search"):
+                rows = (
+                    await self.db.execute(
+                        build_search_keyset_query(query, cursor, size)
+                    )
+                ).all()
+
+        return {
+            "query": q,
+            **build_cursor_page(rows, size, None, serialize_search_rows, "rank"),
+        }
+
+    async def get_review_by_id(self, review_id: int) -> dict:
+        """
+        Retrieves a specific customer review by its ID.
+
+        Args:
+            review_id (int): The ID of the review to retrieve.
+
+        Returns:
+            dict: The review details, or a 404 message if not found.
+        """
+        review: Review = await self.db.get(Review, review_id)
+
+        if not review:
+            return {
+                "status": 404,
+                "message": "Avaliação não encontrada",
+            }
+
+        return {"review": serialize_review(review)}
+
+    async def get_reviews_report(
+        self,
+        start_date: str,
+        end_date: str,
+        include_items: bool = True,
+        params: OffsetParams | None = None,
+        cursor: str | None = None,
+    ) -> dict:
+        """
+        Generates a report of customer reviews within a specified date range.
+
+        Args:
+            start_date (str): The start date in "YYYY-MM-DD" format.
+            end_date (str): The end date in "YYYY-MM-DD" format.
+            include_items (bool): Whether to include the paginated review list.
+            params (OffsetParams | None): Page, size and whether to count the total.
+            cursor (str | None): Switches the review list to keyset pagination.
+
+        Returns:
+            dict: The rollup summary and the paginated report, or a 400 message
+                if the dates are invalid.
+        """
+        try:
+            start_timestamp, end_timestamp = parse_report_range(start_date, end_date)
+        except ValueError:
+            return {
+                "status": 400,
+                "message": "Formato de data inválido. Use YYYY-MM-DD.",
+            }
+
+        summary_query = build_summary_query(start_timestamp, end_timestamp)
+        with stage_timer("report_summary"):
+            summary = build_summary((await self.db.execute(summary_query)).all())
+
+        if not include_items:
+            return summary
+
+        params = params or OffsetParams()
+
+        with stage_timer("report_query"):
+            archived = reaches_archive(
+                await self.db.scalar(build_archive_boundary_query()), start_timestamp
+            )
+            query = build_report_query(start_timestamp, end_timestamp, archived)
+
+            total = None
+            if params.include_total:
+                filters = build_report_filters(start_timestamp, end_timestamp)
+                total = await self.db.scalar(build_count_query(*filters))
+                if archived:
+                    total += await self.db.scalar(
+                        build_archive_count_query(start_timestamp, end_timestamp)
+                    )
+
+            if cursor is not None:
+                query = build_keyset_query(query, cursor, params.size)
+            else:
+                query = build_offset_query(query, params)
+            rows = (await self.db.execute(query)).all()
+
+        with stage_timer("report_transform"):
+            if cursor is not None:
+                page = build_cursor_page(
+                    rows, params.size, total, transform_report_rows
+                )
+            else:
+                page = build_offset_page(transform_report_rows(rows), params, total)
+
+        return {**summary, **page}
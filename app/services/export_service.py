@@ -0,0 +1,201 @@
+import csv
+import io
+import json
+import zlib
+from typing import Iterable, Iterator
+from fastapi import HTTPException
+from sqlalchemy import Select, select, union_all
+from sqlalchemy.orm import sessionmaker
+from app.models.models import Review, ReviewArchive, SentimentAnalysis
+from app.services.archive_service import build_archive_range_filters
+from app.services.reviews_service import build_report_filters
+from app.utils.dates import format_timestamp
+from app.utils.variables import EXPORT_BATCH_SIZE, SENTIMENT_MAPPING
+
+# Exportable columns, in their default order, and the SQL expression of each.
+EXPORT_COLUMNS = {
+    "id": Review.id,
+    "customer_name": Review.customer_name,
+    "review_date": Review.review_date,
+    "review_text": Review.review_text,
+    "analysis_status": Review.analysis_status,
+    "sentiment": SentimentAnalysis.sentiment,
+    "score": SentimentAnalysis.score,
+    "keywords": SentimentAnalysis.keywords,
+    "explanation": SentimentAnalysis.explanation,
+}
+
+# The same columns in `reviews_archive`.
+ARCHIVE_EXPORT_COLUMNS = {
+    "id": ReviewArchive.id,
+    "customer_name": ReviewArchive.customer_name,
+    "review_date": ReviewArchive.review_date,
+    "review_text": ReviewArchive.review_text,
+    "analysis_status": ReviewArchive.analysis_status,
+    "sentiment": ReviewArchive.analysis_sentiment,
+    "score": ReviewArchive.score,
+    "keywords": ReviewArchive.keywords,
+    "explanation": ReviewArchive.explanation,
+}
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def parse_export_columns(columns: str | None) -> list[str]:
+    """
+    Validates the comma-separated column selection of an export.
+
+    Args:
+        columns (str | None): E.g. "id,review_date,sentiment". None or empty
+            selects every column.
+
+    Raises:
+        HTTPException: If a column does not exist.
+
+    Returns:
+        list[str]: The selected columns, in the requested order.
+    """
+    if not columns:
+        return list(EXPORT_COLUMNS)
+
+    selected = [column.strip() for column in columns.split(",") if column.strip()]
+    invalid = [column for column in selected if column not in EXPORT_COLUMNS]
+
+    if invalid or not selected:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Colunas inválidas: {', '.join(invalid)}. "
+            f"Use: {', '.join(EXPORT_COLUMNS)}.",
+        )
+
+    return selected
+
+
+def build_export_query(
+    start_timestamp: int,
+    end_timestamp: int,
+    columns: list[str],
+    archived: bool = False,
+) -> Select:
+    """
+    Builds the report export query, reading only the selected columns.
+
+    Args:
+        start_timestamp (int): Start of the range (inclusive).
+        end_timestamp (int): End of the range (inclusive).
+        columns (list[str]): Keys of `EXPORT_COLUMNS`.
+        archived (bool): Whether the range reaches into `reviews_archive`, whose
+            reviews are then exported too.
+
+    Returns:
+        Select: The rows of the export, newest first.
+    """
+    query = (
+        select(*[EXPORT_COLUMNS[column] for column in columns])
+        .select_from(Review)
+        .outerjoin(SentimentAnalysis, SentimentAnalysis.review_id == Review.id)
+        .filter(*build_report_filters(start_timestamp, end_timestamp))
+    )
+    if not archived:
+        return query.order_by(Review.review_date.desc(), Review.id.desc())
+
+    # The sort keys are appended to both sides and left out of the exported
+    # values, since `columns` may not include them.
+    live_query = query.add_columns(
+        Review.review_date.label("sort_date"), Review.id.label("sort_id")
+    )
+    archive_query = select(
+        *[ARCHIVE_EXPORT_COLUMNS[column] for column in columns],
+        ReviewArchive.review_date,
+        ReviewArchive.id,
+    ).filter(*build_archive_range_filters(start_timestamp, end_timestamp))
+    export = union_all(live_query, archive_query).subquery("export")
+    return select(*export.c).order_by(
+        export.c.sort_date.desc(), export.c.sort_id.desc()
+    )
+
+
+def transform_export_row(row: tuple, columns: list[str]) -> dict:
+    """
+    Converts a row of `build_export_query` to the values of the report.
+
+    Dates, statuses and sentiments are rendered as in `GET /reviews/report`.
+    """
+    values = dict(zip(columns, row))
+
+    if "review_date" in values:
+        values["review_date"] = format_timestamp(values["review_date"])
+    if "analysis_status" in values:
+        values["analysis_status"] = values["analysis_status"].value
+    if values.get("sentiment") is not None:
+        values["sentiment"] = SENTIMENT_MAPPING.get(
+            values["sentiment"].lower(), "neutral"
+        )
+
+    return values
+
+
+def stream_export(
+    session_factory: sessionmaker,
+    query: Select,
+    columns: list[str],
+    export_format: str,
+) -> Iterator[bytes]:
+    """
+    Streams the rows of an export as CSV or NDJSON.
+
+    Rows are fetched `EXPORT_BATCH_SIZE` at a time with `yield_per`, which uses a
+    server-side cursor on Postgres, and each batch is encoded and yielded before
+    the next one is read, so memory stays flat whatever the size of the range.
+
+    Args:
+        session_factory (sessionmaker): Opens the session owned by the stream.
+        query (Select): Built by `build_export_query`.
+        columns (list[str]): The selected columns.
+        export_format (str): "csv" or "ndjson".
+
+    Yields:
+        bytes: UTF-8 encoded chunks, starting with the CSV header if any.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns)
+
+    if export_format == "csv":
+        writer.writeheader()
+
+    with session_factory() as session:
+        result = session.execute(
+            query, execution_options={"yield_per": EXPORT_BATCH_SIZE}
+        )
+
+        for partition in result.partitions():
+            for row in partition:
+                values = transform_export_row(row, columns)
+                if export_format == "csv":
+                    writer.writerow(values)
+                else:
+                    buffer.write(json.dumps(values, ensure_ascii=False) + "\n")
+
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def gzip_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Compresses a stream of chunks into a single gzip member, incrementally.
+    """
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+
+    yield compressor.flush()
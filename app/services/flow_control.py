@@ -0,0 +1,470 @@
+import asyncio
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from typing import Callable, Iterable
+from app.utils.variables import (
+    ANALYSIS_INFLIGHT_TIMEOUT,
+    LLM_BREAKER_FAILURES,
+    LLM_BREAKER_RESET,
+    LLM_DEADLINE,
+    LLM_MAX_CONCURRENCY,
+    LLM_RATE_BURST,
+    LLM_RATE_LIMIT,
+)
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter shared by the threads and tasks of a process.
+
+    Tokens refill at `rate` per second up to `burst`. A caller that finds the
+    bucket empty reserves the next token anyway and waits for it, so callers are
+    served in arrival order instead of racing each other.
+    """
+
+    def __init__(self, rate: float = LLM_RATE_LIMIT, burst: int = LLM_RATE_BURST):
+        """
+        Initializes the bucket, full.
+
+        Args:
+            rate (float): Tokens added per second. Zero disables the limit.
+            burst (int): Maximum number of tokens kept.
+        """
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int = 1) -> float:
+        """
+        Takes tokens.
+
+        Args:
+            tokens (int): Number of tokens to take.
+
+        Returns:
+            float: Seconds to wait before the tokens may be used.
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self, tokens: int = 1) -> float:
+        """
+        Takes tokens, sleeping until they are available.
+
+        Returns:
+            float: Seconds waited.
+        """
+        delay = self.reserve(tokens)
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self) -> float:
+        """
+        Asyncio version of `acquire`.
+        """
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+        return delay
+
+
+class LLMLimiter:
+    """
+    Gate in front of the model client: at most `max_concurrency` calls in flight
+    per process, started no faster than the token bucket allows.
+
+    Bursts wait here instead of being rejected by the provider with 429s. The
+    asyncio path gets one semaphore per event loop, since a semaphore used
+    in one loop cannot be awaited in another (test clients, benchmarks and
+    CLI commands each run their own).
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        bucket: TokenBucket | None = None,
+    ):
+        """
+        Initializes the limiter.
+
+        Args:
+            max_concurrency (int): Maximum number of simultaneous calls.
+            bucket (TokenBucket | None): The rate limiter.
+        """
+        self.max_concurrency = max_concurrency
+        self.bucket = bucket or TokenBucket()
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._async_semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.clear()
+
+    @contextmanager
+    def limit(self):
+        """
+        Holds a call slot and a rate token for the duration of a model call.
+        """
+        started = time.perf_counter()
+        with self._semaphore:
+            self.bucket.acquire()
+            self._record_wait(time.perf_counter() - started)
+            yield
+
+    @asynccontextmanager
+    async def limit_async(self):
+        """
+        Asyncio version of `limit`.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._async_semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._async_semaphores[loop] = asyncio.Semaphore(
+                    self.max_concurrency
+                )
+
+        started = time.perf_counter()
+        async with semaphore:
+            await self.bucket.acquire_async()
+            self._record_wait(time.perf_counter() - started)
+            yield
+
+    def clear(self) -> None:
+        """
+        Resets the counters.
+        """
+        with self._lock:
+            self.calls = 0
+            self.delayed = 0
+            self.wait_time = 0.0
+
+    def stats(self) -> dict:
+        """
+        Reports the limits and how much the calls had to wait for them.
+
+        Returns:
+            dict: Limits, calls, calls that waited and total wait in milliseconds.
+        """
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "rate_limit": self.bucket.rate,
+                "burst": self.bucket.burst,
+                "calls": self.calls,
+                "delayed": self.delayed,
+                "wait_ms": round(self.wait_time * 1000, 3),
+            }
+
+    def _record_wait(self, waited: float) -> None:
+        with self._lock:
+            self.calls += 1
+            # Ignore the bookkeeping noise of an uncontended acquire.
+            if waited > 0.001:
+                self.delayed += 1
+                self.wait_time += waited
+
+
+class CircuitOpenError(RuntimeError):
+    """
+    Raised instead of calling the model while the circuit breaker is open.
+
+    Attributes:
+        retry_after (float): Seconds until the breaker lets a call through.
+    """
+
+    def __init__(self, retry_after: float):
+        super().__init__("Modelo indisponível: circuito aberto.")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of the model provider.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls
+    fail fast with `CircuitOpenError` for `reset_timeout` seconds. Then a single
+    trial call is let through (half-open): its success closes the circuit, its
+    failure opens it again. A trial that never reports back (its caller was
+    cancelled or interrupted) is replaced by a new one after `trial_timeout`.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = LLM_BREAKER_FAILURES,
+        reset_timeout: float = LLM_BREAKER_RESET,
+        trial_timeout: float = LLM_DEADLINE,
+    ):
+        """
+        Initializes the breaker, closed.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit.
+            reset_timeout (float): Seconds the circuit stays open.
+            trial_timeout (float): Seconds after which a trial call that did not
+                report back is given up and another one is let through.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.trial_timeout = trial_timeout
+        self._lock = threading.Lock()
+        self.clear()
+
+    def before_call(self) -> None:
+        """
+        Lets a call through, or rejects it while the circuit is open.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with its
+                trial call started less than `trial_timeout` seconds ago.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+
+            now = time.monotonic()
+            if self.state == self.OPEN:
+                remaining = self._opened_at + self.reset_timeout - now
+            else:
+                remaining = self._trial_at + self.trial_timeout - now
+            if remaining <= 0:
+                self.state = self.HALF_OPEN
+                self._trial_at = now
+                return
+
+            self.rejected += 1
+            raise CircuitOpenError(max(remaining, 0.0) or self.reset_timeout)
+
+    def record_success(self) -> None:
+        """
+        Records that the provider answered, closing the circuit.
+        """
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        """
+        Records a failed call, opening the circuit at the threshold.
+        """
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.opens += 1
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def clear(self) -> None:
+        """
+        Closes the circuit and resets the counters.
+        """
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opens = 0
+            self.rejected = 0
+            self._opened_at = 0.0
+            self._trial_at = 0.0
+
+    def stats(self) -> dict:
+        """
+        Reports the state of the circuit.
+
+        Returns:
+            dict: State, consecutive failures, times opened and calls rejected.
+        """
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "opens": self.opens,
+                "rejected": self.rejected,
+            }
+
+
+class Flight:
+    """
+    One in-flight analysis, awaited by the callers that asked for the same key.
+
+    Attributes:
+        done: A `threading.Event` or, for `AsyncSingleFlight`, an
+            `asyncio.Future`, set when the leader finishes.
+        result: The leader's result or error.
+    """
+
+    def __init__(self, done):
+        self.done = done
+        self.result = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent work on the same key (threads).
+
+    The first caller of a key becomes its leader and does the work; callers that
+    arrive while it runs become followers and get the leader's result (or error)
+    when it finishes, all released together. Followers give up after `timeout`
+    seconds with a `TimeoutError`.
+    """
+
+    def __init__(self, timeout: float = ANALYSIS_INFLIGHT_TIMEOUT):
+        """
+        Initializes the registry of in-flight keys.
+
+        Args:
+            timeout (float): Seconds a follower waits for the leader.
+        """
+        self.timeout = timeout
+        self._flights: dict[str, Flight] = {}
+        self._lock = threading.Lock()
+        self.clear()
+
+    def begin(self, keys: Iterable[str]) -> tuple[list[str], dict[str, Flight]]:
+        """
+        Claims the leadership of every key that is not in flight yet.
+
+        Args:
+            keys (Iterable[str]): The keys about to be worked on.
+
+        Returns:
+            tuple[list[str], dict[str, Flight]]: The keys led by the caller, who
+                must `finish` each of them, and the flights of the other keys.
+        """
+        led: list[str] = []
+        followed: dict[str, Flight] = {}
+
+        with self._lock:
+            for key in keys:
+                flight = self._flights.get(key)
+                if flight is None:
+                    self._flights[key] = self._new_flight()
+                    led.append(key)
+                else:
+                    followed[key] = flight
+            self.leaders += len(led)
+            self.coalesced += len(followed)
+
+        return led, followed
+
+    def finish(self, key: str, result) -> None:
+        """
+        Publishes the result (or error) of a led key and releases its followers.
+        """
+        with self._lock:
+            flight = self._flights.pop(key, None)
+
+        if flight is not None:
+            flight.result = result
+            flight.done.set()
+
+    def wait(self, flight: Flight):
+        """
+        Waits for the leader of a flight.
+
+        Returns:
+            The leader's result or error, or a `TimeoutError` after `timeout`.
+        """
+        if flight.done.wait(self.timeout):
+            return flight.result
+
+        with self._lock:
+            self.timeouts += 1
+        return TimeoutError("Análise em andamento excedeu o tempo limite.")
+
+    def do(self, key: str, work: Callable[[], object]):
+        """
+        Runs `work` once for all the concurrent callers of `key`.
+
+        Raises:
+            Exception: The error raised by the leader, or `TimeoutError`.
+
+        Returns:
+            The result of `work`.
+        """
+        led, followed = self.begin([key])
+
+        if led:
+            try:
+                result = work()
+            except Exception as error:
+                self.finish(key, error)
+                raise
+            self.finish(key, result)
+            return result
+
+        result = self.wait(followed[key])
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def clear(self) -> None:
+        """
+        Resets the counters.
+        """
+        with self._lock:
+            self.leaders = 0
+            self.coalesced = 0
+            self.timeouts = 0
+
+    def stats(self) -> dict:
+        """
+        Reports how many callers led a call, joined one or timed out waiting.
+        """
+        with self._lock:
+            return {
+                "in_flight": len(self._flights),
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+                "timeouts": self.timeouts,
+            }
+
+    def _new_flight(self) -> Flight:
+        return Flight(threading.Event())
+
+
+class AsyncSingleFlight(SingleFlight):
+    """
+    Asyncio version of `SingleFlight`, whose followers await a future instead
+    of blocking their thread. Used through `begin`, `finish` and `wait`.
+    """
+
+    def finish(self, key: str, result) -> None:
+        with self._lock:
+            flight = self._flights.pop(key, None)
+
+        if flight is not None:
+            flight.result = result
+            if not flight.done.done():
+                flight.done.set_result(None)
+
+    async def wait(self, flight: Flight):
+        try:
+            await asyncio.wait_for(asyncio.shield(flight.done), self.timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            return TimeoutError("Análise em andamento excedeu o tempo limite.")
+
+        return flight.result
+
+    def _new_flight(self) -> Flight:
+        return Flight(asyncio.get_running_loop().create_future())
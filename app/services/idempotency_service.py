@@ -0,0 +1,100 @@
+import hashlib
+import json
+import time
+from fastapi import HTTPException
+from sqlalchemy import Select, select
+from app.models.models import IdempotencyKey, Review
+from app.utils.variables import IDEMPOTENCY_KEY_HEADER, IDEMPOTENCY_KEY_MAX_LENGTH
+
+
+def validate_idempotency_key(key: str | None) -> str | None:
+    """
+    Checks the `Idempotency-Key` header of a request, when sent.
+
+    Raises:
+        HTTPException: If the key is blank or longer than
+            `IDEMPOTENCY_KEY_MAX_LENGTH`.
+
+    Returns:
+        str | None: The key, or None when the header was not sent.
+    """
+    if key is None:
+        return None
+
+    if not key.strip() or len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"'{IDEMPOTENCY_KEY_HEADER}' deve ter de 1 a "
+                f"{IDEMPOTENCY_KEY_MAX_LENGTH} caracteres."
+            ),
+        )
+
+    return key
+
+
+def build_request_hash(review_data) -> str:
+    """
+    Hashes a request body, so a key reused for another review is detected.
+    """
+    body = json.dumps(review_data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+def build_content_hash(customer_name: str, review_date: int, review_text: str) -> str:
+    """
+    Fingerprints a review by its customer, date and text.
+
+    The values are hashed as sent, so only exact resubmissions match.
+
+    Returns:
+        str: The SHA-256 stored in `Review.content_hash`.
+    """
+    content = "\x1f".join((customer_name, str(review_date), review_text))
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def build_duplicate_query(content_hash: str) -> Select:
+    """
+    Builds the query of the first stored review with the same fingerprint.
+    """
+    return (
+        select(Review)
+        .filter(Review.content_hash == content_hash)
+        .order_by(Review.id)
+        .limit(1)
+    )
+
+
+def build_idempotency_record(
+    key: str, request_hash: str, review_id: int, response: dict
+) -> IdempotencyKey:
+    """
+    Builds the record saved with the review, in the same transaction.
+    """
+    return IdempotencyKey(
+        key=key,
+        request_hash=request_hash,
+        review_id=review_id,
+        response=json.dumps(response, ensure_ascii=False),
+        created_at=int(time.time()),
+    )
+
+
+def replay_response(record: IdempotencyKey, request_hash: str) -> dict:
+    """
+    Returns the stored response of a key already used.
+
+    Raises:
+        HTTPException: If the key was used for a different request body.
+
+    Returns:
+        dict: The response of the first request.
+    """
+    if record.request_hash != request_hash:
+        raise HTTPException(
+            status_code=422,
+            detail=f"'{IDEMPOTENCY_KEY_HEADER}' já foi usada com outra avaliação.",
+        )
+
+    return json.loads(record.response)
@@ -0,0 +1,127 @@
+import re
+from sqlalchemy import ColumnElement, Select, delete, func, insert, select
+from app.models.models import Review, ReviewKeyword, SentimentAnalysis
+
+KEYWORD_MAX_LENGTH = 100
+BACKFILL_CHUNK_SIZE = 1000
+
+
+def normalize_keywords(keywords: list[str]) -> list[str]:
+    """
+    Normalizes the keywords of an analysis for storage and lookup.
+
+    Keywords are lowercased, have their whitespace collapsed and are truncated to
+    `KEYWORD_MAX_LENGTH` characters. Empty values and duplicates are dropped.
+
+    Args:
+        keywords (list[str]): The keywords returned by the model.
+
+    Returns:
+        list[str]: The normalized keywords, in their original order.
+    """
+    normalized = []
+
+    for keyword in keywords:
+        keyword = normalize_keyword(keyword)
+        if keyword and keyword not in normalized:
+            normalized.append(keyword)
+
+    return normalized
+
+
+def normalize_keyword(keyword: str) -> str:
+    """
+    Normalizes a single keyword, see `normalize_keywords`.
+    """
+    return re.sub(r"\s+", " ", str(keyword)).strip().lower()[:KEYWORD_MAX_LENGTH]
+
+
+def build_keyword_filter(keyword: str) -> ColumnElement[bool]:
+    """
+    Builds the condition selecting the reviews that mention a keyword.
+
+    The subquery is answered from `ix_review_keywords_keyword`.
+
+    Args:
+        keyword (str): The keyword, normalized here.
+
+    Returns:
+        ColumnElement[bool]: A condition on `Review.id`.
+    """
+    return Review.id.in_(
+        select(ReviewKeyword.review_id).filter(
+            ReviewKeyword.keyword == normalize_keyword(keyword)
+        )
+    )
+
+
+def build_top_keywords_query(limit: int, *filters) -> Select:
+    """
+    Builds the query of the most frequent keywords.
+
+    Args:
+        limit (int): Maximum number of keywords.
+        *filters: Optional conditions on `Review` (e.g., a date range).
+
+    Returns:
+        Select: (keyword, count) rows, most frequent first.
+    """
+    count = func.count(ReviewKeyword.review_id)
+    query = select(ReviewKeyword.keyword, count.label("count"))
+
+    if filters:
+        query = query.join(Review, Review.id == ReviewKeyword.review_id).filter(
+            *filters
+        )
+
+    return (
+        query.group_by(ReviewKeyword.keyword)
+        .order_by(count.desc(), ReviewKeyword.keyword)
+        .limit(limit)
+    )
+
+
+def serialize_top_keywords(rows) -> dict:
+    """
+    Builds the top keywords response from the rows of `build_top_keywords_query`.
+    """
+    return {
+        "keywords": [{"keyword": keyword, "count": count} for keyword, count in rows]
+    }
+
+
+def rebuild_keywords(executor) -> None:
+    """
+    Repopulates `review_keywords` from the comma-joined
+    `SentimentAnalysis.keywords` of every stored analysis.
+
+    Used as the migration of existing databases and by
+    `python -m app.cli rebuild-keywords`.
+
+    Args:
+        executor (Session | Connection): Where to execute the statements. The
+            caller is responsible for committing.
+    """
+    executor.execute(delete(ReviewKeyword))
+
+    last_id = 0
+    while True:
+        rows = executor.execute(
+            select(SentimentAnalysis.review_id, SentimentAnalysis.keywords)
+            .filter(SentimentAnalysis.review_id > last_id)
+            .order_by(SentimentAnalysis.review_id)
+            .limit(BACKFILL_CHUNK_SIZE)
+        ).all()
+
+        if not rows:
+            return
+
+        keyword_rows = [
+            {"review_id": review_id, "keyword": keyword}
+            for review_id, keywords in rows
+            for keyword in normalize_keywords((keywords or "").split(","))
+        ]
+        if keyword_rows:
+            executor.execute(insert(ReviewKeyword), keyword_rows)
+
+        last_id = rows[-1].review_id
@@ -0,0 +1,203 @@
+import math
+import re
+import unicodedata
+
+# Polarity weights of the lexicon, keyed by the accent-free lowercase word.
+POSITIVE_TERMS: dict[str, float] = {
+    "adorei": 3.0,
+    "agil": 1.5,
+    "amei": 3.0,
+    "atencioso": 2.0,
+    "atenciosa": 2.0,
+    "bom": 2.0,
+    "boa": 2.0,
+    "cordial": 1.5,
+    "educado": 1.5,
+    "educada": 1.5,
+    "eficaz": 2.0,
+    "eficiente": 2.0,
+    "eficiencia": 1.5,
+    "excelente": 3.0,
+    "excepcional": 3.0,
+    "fantastico": 3.0,
+    "feliz": 2.0,
+    "gostei": 2.0,
+    "incrivel": 3.0,
+    "maravilhoso": 3.0,
+    "maravilhosa": 3.0,
+    "otimo": 3.0,
+    "otima": 3.0,
+    "parabens": 2.5,
+    "perfeito": 3.0,
+    "perfeita": 3.0,
+    "prestativo": 2.0,
+    "prestativa": 2.0,
+    "qualidade": 1.5,
+    "rapido": 1.5,
+    "rapida": 1.5,
+    "rapidez": 1.5,
+    "recomendo": 2.5,
+    "resolveu": 1.5,
+    "resolvido": 1.5,
+    "satisfatorio": 1.5,
+    "satisfatoria": 1.5,
+    "satisfeito": 2.0,
+    "satisfeita": 2.0,
+    "simpatico": 1.5,
+    "simpatica": 1.5,
+}
+
+NEGATIVE_TERMS: dict[str, float] = {
+    "absurdo": 2.5,
+    "atrasado": 2.0,
+    "atraso": 2.0,
+    "caro": 1.5,
+    "confuso": 1.5,
+    "confusa": 1.5,
+    "decepcao": 2.5,
+    "decepcionado": 2.5,
+    "decepcionada": 2.5,
+    "demora": 2.0,
+    "demorado": 2.0,
+    "demorada": 2.0,
+    "demorou": 2.0,
+    "descaso": 3.0,
+    "despreparado": 2.5,
+    "despreparada": 2.5,
+    "erro": 1.5,
+    "falha": 1.5,
+    "frustrado": 2.5,
+    "frustrada": 2.5,
+    "frustrante": 2.5,
+    "grosseiro": 2.5,
+    "grosseira": 2.5,
+    "horrivel": 3.0,
+    "ineficiente": 2.5,
+    "insatisfeito": 2.5,
+    "insatisfeita": 2.5,
+    "lamentavel": 2.5,
+    "lento": 2.0,
+    "lenta": 2.0,
+    "odiei": 3.0,
+    "pessimo": 3.0,
+    "pessima": 3.0,
+    "pior": 3.0,
+    "problema": 1.5,
+    "problemas": 1.5,
+    "reclamacao": 1.5,
+    "ruim": 2.5,
+    "terrivel": 3.0,
+}
+
+NEGATORS = {"nao", "nunca", "nem", "jamais", "sem", "nenhum", "nenhuma"}
+INTENSIFIERS = {
+    "muito": 1.5,
+    "extremamente": 1.8,
+    "super": 1.5,
+    "bastante": 1.4,
+    "totalmente": 1.5,
+    "realmente": 1.3,
+    "tao": 1.3,
+    "pouco": 0.5,
+    "meio": 0.5,
+}
+# Words after a contrastive conjunction weigh more than the ones before it, as
+# in "rápido, mas não resolveu".
+CONTRASTIVE = {"mas", "porem", "entretanto", "contudo", "todavia"}
+
+NEGATION_WINDOW = 3
+SCORE_NORMALIZATION = 4.0
+SENTIMENT_THRESHOLD = 0.2
+# Polarity mass at which a review counts as fully covered by the lexicon.
+CONFIDENT_MASS = 3.0
+
+
+def strip_accents(text: str) -> str:
+    """
+    Lowercases a text and removes its accents, to match the lexicon keys.
+    """
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def analyze_with_lexicon(review_text: str) -> tuple[dict, float]:
+    """
+    Analyzes the sentiment of a Portuguese review with the local lexicon.
+
+    Each lexicon word adds its weight, scaled by a preceding intensifier,
+    flipped by a negator up to `NEGATION_WINDOW` words before it and boosted
+    after a contrastive conjunction. The sum is squashed to [-1, 1].
+
+    Args:
+        review_text (str): The text of the customer review.
+
+    Returns:
+        tuple[dict, float]: The result, in the same shape as
+            `analyze_review_sentiment`, and the confidence of the engine, from 0
+            (no evidence, or evidence that contradicts itself) to 1.
+    """
+    words = re.findall(r"\w+", review_text.lower())
+    normalized = [strip_accents(word) for word in words]
+
+    total = 0.0
+    positive_mass = negative_mass = 0.0
+    positive_keywords: list[str] = []
+    negative_keywords: list[str] = []
+    contrast_position = max(
+        (index for index, word in enumerate(normalized) if word in CONTRASTIVE),
+        default=None,
+    )
+
+    negator_position = None
+
+    for index, word in enumerate(normalized):
+        if word in NEGATORS:
+            negator_position = index
+            continue
+        if word in POSITIVE_TERMS:
+            weight = POSITIVE_TERMS[word]
+        elif word in NEGATIVE_TERMS:
+            weight = -NEGATIVE_TERMS[word]
+        else:
+            continue
+
+        if index and normalized[index - 1] in INTENSIFIERS:
+            weight *= INTENSIFIERS[normalized[index - 1]]
+        # A negator flips only the first lexicon word that follows it.
+        if negator_position is not None and index - negator_position <= NEGATION_WINDOW:
+            weight *= -0.8
+        negator_position = None
+        if contrast_position is not None:
+            weight *= 1.5 if index > contrast_position else 0.5
+
+        total += weight
+        if weight > 0:
+            positive_mass += weight
+            positive_keywords.append(words[index])
+        else:
+            negative_mass -= weight
+            negative_keywords.append(words[index])
+
+    score = total / math.sqrt(total * total + SCORE_NORMALIZATION)
+    if score >= SENTIMENT_THRESHOLD:
+        sentiment = "positiva"
+    elif score <= -SENTIMENT_THRESHOLD:
+        sentiment = "negativa"
+    else:
+        sentiment = "neutra"
+
+    mass = positive_mass + negative_mass
+    agreement = 1 - min(positive_mass, negative_mass) / max(mass, 1e-9) * 2
+    confidence = min(1.0, mass / CONFIDENT_MASS) * agreement
+
+    result = {
+        "sentiment": sentiment,
+        "score": round(score, 4),
+        "keywords": list(dict.fromkeys(positive_keywords + negative_keywords)),
+        "explanation": (
+            f"Análise local por léxico: {len(positive_keywords)} termo(s) "
+            f"positivo(s) e {len(negative_keywords)} negativo(s)."
+        ),
+    }
+
+    return result, round(confidence, 4)
@@ -0,0 +1,453 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Iterable
+from app.utils.variables import (
+    LLM_COMPLETION_TOKEN_PRICE,
+    LLM_PROMPT_TOKEN_PRICE,
+    METRICS_ENABLED,
+)
+
+# Latency buckets, in seconds, shared by every histogram.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# A metric family: (name, type, help, [(labels, value), ...]).
+Family = tuple[str, str, str, list[tuple[dict, float]]]
+
+
+def format_labels(labels: dict) -> str:
+    """
+    Formats labels in the Prometheus text format, e.g. `{route="/reviews/"}`.
+    """
+    if not labels:
+        return ""
+
+    pairs = ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def format_value(value: float) -> str:
+    """
+    Formats a sample value, without a trailing ".0" on integers.
+    """
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Counter:
+    """
+    Monotonic counter with a fixed set of label names.
+    """
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, *labelvalues) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def collect(self) -> list[Family]:
+        with self._lock:
+            samples = [
+                (dict(zip(self.labelnames, labelvalues)), value)
+                for labelvalues, value in self._values.items()
+            ]
+        return [(self.name, "counter", self.help, samples)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    """
+    Histogram of observations (latencies, in seconds) with fixed buckets.
+
+    Each observation is a bisect and three additions under a lock; the
+    cumulative bucket counts are only computed when the metrics are scraped.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # Per label values: [count per bucket..., count above the last], sum.
+        self._values: dict[tuple, tuple[list[int], list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            entry = self._values.get(labelvalues)
+            if entry is None:
+                entry = self._values[labelvalues] = (
+                    [0] * (len(self.buckets) + 1),
+                    [0.0],
+                )
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    @contextmanager
+    def time(self, *labelvalues):
+        """
+        Observes the duration of the `with` block.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labelvalues)
+
+    def collect(self) -> list[Family]:
+        samples: dict[str, list] = {"bucket": [], "sum": [], "count": []}
+
+        with self._lock:
+            values = [
+                (labelvalues, list(counts), total[0])
+                for labelvalues, (counts, total) in self._values.items()
+            ]
+
+        for labelvalues, counts, total in values:
+            labels = dict(zip(self.labelnames, labelvalues))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                samples["bucket"].append(({**labels, "le": str(bound)}, cumulative))
+            samples["sum"].append((labels, total))
+            samples["count"].append((labels, cumulative))
+
+        return [
+            (self.name, "histogram", self.help, []),
+            *[
+                (f"{self.name}_{suffix}", "", "", suffix_samples)
+                for suffix, suffix_samples in samples.items()
+            ],
+        ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class MetricsRegistry:
+    """
+    The metrics of the process: recorded metrics plus collectors that read the
+    existing counters (caches, model usage, pool) when the metrics are scraped.
+    """
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        """
+        Initializes the registry.
+
+        Args:
+            enabled (bool): Whether stage timers and request metrics record.
+        """
+        self.enabled = enabled
+        self.metrics: list[Counter | Histogram] = []
+        self.collectors: list[Callable[[], Iterable[Family]]] = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[Family]]) -> None:
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        Renders every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The body of `GET /metrics`.
+        """
+        lines: list[str] = []
+        families = [family for metric in self.metrics for family in metric.collect()]
+        for collector in self.collectors:
+            families.extend(collector())
+
+        for name, kind, help, samples in families:
+            if kind:
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{format_labels(labels)} {format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """
+        Resets the recorded metrics.
+        """
+        for metric in self.metrics:
+            metric.clear()
+
+
+registry = MetricsRegistry()
+
+request_duration = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Duração das requisições HTTP por rota.",
+        ("method", "route", "status"),
+    )
+)
+stage_duration = registry.register(
+    Histogram(
+        "review_stage_duration_seconds",
+        "Duração das etapas internas do processamento de avaliações.",
+        ("stage",),
+    )
+)
+
+
+def stage_timer(stage: str):
+    """
+    Times a stage of the review processing (e.g. "db_insert", "llm_analyze").
+
+    Returns a no-op context manager when metrics are disabled.
+
+    Args:
+        stage (str): The stage label.
+    """
+    if not registry.enabled:
+        return nullcontext()
+    return stage_duration.time(stage)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording the duration of each request in
+    `http_request_duration_seconds`.
+
+    Requests are labeled with the route template (e.g. "/reviews/{review_id}")
+    rather than the raw path, so the number of series stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not registry.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            request_duration.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status),
+            )
+
+
+def collect_llm_usage() -> list[Family]:
+    """
+    Reads the model call counters of `analysis_usage` and estimates their cost.
+    """
+    from app.services.ai_service import analysis_usage
+
+    usage = analysis_usage.stats()
+    modes = [mode for mode in usage if isinstance(usage[mode], dict)]
+    prompt_tokens = sum(usage[mode]["prompt_tokens"] for mode in modes)
+    completion_tokens = sum(usage[mode]["completion_tokens"] for mode in modes)
+    cost = (
+        prompt_tokens * LLM_PROMPT_TOKEN_PRICE
+        + completion_tokens * LLM_COMPLETION_TOKEN_PRICE
+    ) / 1_000_000
+
+    return [
+        (
+            "llm_calls_total",
+            "counter",
+            "Chamadas ao modelo por modo (single ou batch).",
+            [({"mode": mode}, usage[mode]["calls"]) for mode in modes],
+        ),
+        (
+            "llm_reviews_total",
+            "counter",
+            "Avaliações enviadas ao modelo por modo.",
+            [({"mode": mode}, usage[mode]["reviews"]) for mode in modes],
+        ),
+        (
+            "llm_tokens_total",
+            "counter",
+            "Tokens consumidos por modo e tipo.",
+            [
+                ({"mode": mode, "type": kind}, usage[mode][f"{kind}_tokens"])
+                for mode in modes
+                for kind in ("prompt", "completion")
+            ],
+        ),
+        (
+            "llm_cost_total",
+            "counter",
+            "Custo estimado das chamadas ao modelo, em reais.",
+            [({}, round(cost, 6))],
+        ),
+        (
+            "llm_batch_fallbacks_total",
+            "counter",
+            "Avaliações de um lote reanalisadas individualmente.",
+            [({}, usage["fallbacks"])],
+        ),
+    ]
+
+
+def collect_caches() -> list[Family]:
+    """
+    Reads the counters of the analysis cache and of the response cache.
+    """
+    from app.services.ai_service import analysis_cache
+    from app.services.response_cache import response_cache
+
+    analysis = analysis_cache.stats()
+    responses = response_cache.stats()
+
+    return [
+        (
+            "cache_requests_total",
+            "counter",
+            "Consultas aos caches por resultado.",
+            [
+                ({"cache": "analysis", "result": "hit"}, analysis["memory_hits"]),
+                (
+                    {"cache": "analysis", "result": "persistent_hit"},
+                    analysis["persistent_hits"],
+                ),
+                ({"cache": "analysis", "result": "miss"}, analysis["misses"]),
+                ({"cache": "response", "result": "hit"}, responses["hits"]),
+                ({"cache": "response", "result": "miss"}, responses["misses"]),
+            ],
+        ),
+        (
+            "cache_hit_ratio",
+            "gauge",
+            "Fração das consultas atendidas pelo cache.",
+            [
+                ({"cache": "analysis"}, analysis["hit_ratio"]),
+                ({"cache": "response"}, responses["hit_ratio"]),
+            ],
+        ),
+        (
+            "analysis_cache_size",
+            "gauge",
+            "Entradas na camada em memória do cache de análises.",
+            [({}, analysis["size"])],
+        ),
+    ]
+
+
+def collect_db_pool() -> list[Family]:
+    """
+    Reads the state of the connection pool of the sync engine.
+    """
+    from app.database.db_connection import get_engine, get_pool_status
+
+    status = get_pool_status(get_engine())
+    gauges = ("size", "checked_out", "checked_in", "overflow", "max_overflow")
+
+    return [
+        (
+            f"db_pool_{gauge}",
+            "gauge",
+            f"Pool de conexões: {gauge}.",
+            [({}, status[gauge])],
+        )
+        for gauge in gauges
+        if gauge in status
+    ] + [
+        (
+            "db_pool_exhausted",
+            "gauge",
+            "1 quando todas as conexões do pool estão em uso.",
+            [({}, status["exhausted"])],
+        )
+    ]
+
+
+def collect_llm_flow_control() -> list[Family]:
+    """
+    Reads the limiter, circuit breaker and coalescing counters of the model calls.
+    """
+    from app.services.ai_service import flow_control_stats
+
+    stats = flow_control_stats()
+    limiter, breaker = stats["limiter"], stats["circuit_breaker"]
+
+    return [
+        (
+            "llm_limiter_delayed_total",
+            "counter",
+            "Chamadas ao modelo que esperaram pelos limites.",
+            [({}, limiter["delayed"])],
+        ),
+        (
+            "llm_limiter_wait_seconds_total",
+            "counter",
+            "Tempo total de espera imposto pelos limites.",
+            [({}, limiter["wait_ms"] / 1000)],
+        ),
+        (
+            "llm_circuit_open",
+            "gauge",
+            "1 quando o circuito do modelo está aberto ou em teste.",
+            [({}, breaker["state"] != "closed")],
+        ),
+        (
+            "llm_circuit_rejected_total",
+            "counter",
+            "Chamadas recusadas com o circuito aberto.",
+            [({}, breaker["rejected"])],
+        ),
+        (
+            "analysis_coalesced_total",
+            "counter",
+            "Análises que aproveitaram uma chamada igual em andamento.",
+            [({}, stats["coalescing"]["coalesced"])],
+        ),
+    ]
+
+
+for _collector in (
+    collect_llm_usage,
+    collect_llm_flow_control,
+    collect_caches,
+    collect_db_pool,
+):
+    registry.add_collector(_collector)
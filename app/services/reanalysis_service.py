@@ -0,0 +1,345 @@
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from sqlalchemy import ColumnElement, Select, func, or_, select
+from sqlalchemy.orm import Session, sessionmaker
+from app.models.models import (
+    AnalysisStatusEnum,
+    ReanalysisJob,
+    Review,
+    SentimentAnalysis,
+)
+from app.services.ai_service import (
+    LLMAnalyzer,
+    SentimentAnalyzer,
+    is_provider_unavailable,
+)
+from app.services.analysis_worker import build_due_filter
+from app.services.flow_control import TokenBucket
+from app.services.reviews_service import (
+    ReviewService,
+    build_report_filters,
+    parse_report_range,
+)
+from app.utils.variables import (
+    REANALYSIS_BATCH_SIZE,
+    REANALYSIS_CONCURRENCY,
+    REANALYSIS_PAUSE,
+    REANALYSIS_RATE_LIMIT,
+    REANALYSIS_YIELD_TO_QUEUE,
+)
+
+logger = logging.getLogger(__name__)
+
+# Reviews still owned by the analysis queue are left to it.
+REANALYZABLE_STATUSES = (AnalysisStatusEnum.DONE, AnalysisStatusEnum.FAILED)
+
+
+def build_reanalysis_filters(
+    filters: dict, model: str | None, prompt_version: str | None
+) -> list[ColumnElement[bool]]:
+    """
+    Builds the conditions selecting the reviews a job re-analyzes.
+
+    The selectors ("missing", "outdated" and "model") are combined with OR and
+    then restricted to the date range; without selectors, every review of the
+    range is re-analyzed. Reviews waiting in the analysis queue are skipped.
+
+    Args:
+        filters (dict): The job filters: "start_date" and "end_date"
+            ("YYYY-MM-DD", optional), "missing" (reviews without an analysis),
+            "outdated" (analyses not produced by `model` and `prompt_version`)
+            and "model" (analyses produced by that model).
+        model (str | None): Model of the engine used by the job.
+        prompt_version (str | None): Prompt version of the engine used by the job.
+
+    Raises:
+        ValueError: If a date is not in "YYYY-MM-DD" format.
+
+    Returns:
+        list[ColumnElement[bool]]: Conditions on `Review` and `SentimentAnalysis`,
+            to be used with an outer join between them.
+    """
+    conditions = [Review.analysis_status.in_(REANALYZABLE_STATUSES)]
+
+    selectors = []
+    if filters.get("missing"):
+        selectors.append(SentimentAnalysis.id.is_(None))
+    if filters.get("outdated"):
+        selectors.append(
+            SentimentAnalysis.id.is_not(None)
+            & or_(
+                SentimentAnalysis.model.is_distinct_from(model),
+                SentimentAnalysis.prompt_version.is_distinct_from(prompt_version),
+            )
+        )
+    if filters.get("model"):
+        selectors.append(SentimentAnalysis.model == filters["model"])
+    if selectors:
+        conditions.append(or_(*selectors))
+
+    start_date, end_date = filters.get("start_date"), filters.get("end_date")
+    if start_date or end_date:
+        start_timestamp, end_timestamp = parse_report_range(
+            start_date or "1970-01-01", end_date or "9999-12-31"
+        )
+        conditions.extend(build_report_filters(start_timestamp, end_timestamp))
+
+    return conditions
+
+
+def build_reanalysis_query(
+    conditions: list[ColumnElement[bool]],
+    after_id: int,
+    max_id: int,
+    limit: int,
+) -> Select:
+    """
+    Builds the query of the next reviews of a job, in ID order.
+
+    Args:
+        conditions (list[ColumnElement[bool]]): See `build_reanalysis_filters`.
+        after_id (int): The job checkpoint; only later reviews are returned.
+        max_id (int): The highest review ID covered by the job.
+        limit (int): Maximum number of reviews.
+
+    Returns:
+        Select: (id, review_text) rows.
+    """
+    return (
+        select(Review.id, Review.review_text)
+        .outerjoin(SentimentAnalysis, SentimentAnalysis.review_id == Review.id)
+        .filter(Review.id > after_id, Review.id <= max_id, *conditions)
+        .order_by(Review.id)
+        .limit(limit)
+    )
+
+
+def serialize_job(job: ReanalysisJob) -> dict:
+    """
+    Builds the progress payload of a re-analysis job.
+    """
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "filters": json.loads(job.filters),
+        "last_review_id": job.last_review_id,
+        "max_review_id": job.max_review_id,
+        "processed": job.processed,
+        "failed": job.failed,
+    }
+
+
+class Reanalyzer:
+    """
+    Re-analyzes stored reviews, e.g. after the prompt or the model changed.
+
+    Reviews are processed in pages of `concurrency * batch_size`, in ID order.
+    The batches of a page are sent to the engine in parallel, the results are
+    stored like the queue's, and the last processed ID is saved in
+    `reanalysis_jobs` after every page, so an interrupted job resumes where it
+    stopped.
+
+    The job runs in its own process, so it cannot see the limiter of the API
+    processes. It leaves their LLM quota alone by keeping to its own rate
+    (`rate` reviews per second), by waiting while the analysis queue has due
+    reviews (`yield_to_queue`) and by pausing while the provider is
+    unavailable, instead of failing the rest of the page.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        analyzer: SentimentAnalyzer | None = None,
+        concurrency: int = REANALYSIS_CONCURRENCY,
+        batch_size: int = REANALYSIS_BATCH_SIZE,
+        rate: float = REANALYSIS_RATE_LIMIT,
+        pause: float = REANALYSIS_PAUSE,
+        yield_to_queue: bool = REANALYSIS_YIELD_TO_QUEUE,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initializes the job runner.
+
+        Args:
+            session_factory (sessionmaker): Factory used to open database sessions.
+            analyzer (SentimentAnalyzer | None): The engine; the LLM by default.
+                Its `model` and `prompt_version` define which analyses are
+                outdated.
+            concurrency (int): Batches analyzed at the same time.
+            batch_size (int): Reviews per call to the engine.
+            rate (float): Reviews per second. Zero disables the limit.
+            pause (float): Seconds to wait while the provider is unavailable or
+                the queue has due reviews.
+            yield_to_queue (bool): Whether to wait for the analysis queue.
+            sleep (Callable[[float], None]): Used to wait (replaced in tests).
+        """
+        self.session_factory = session_factory
+        self.analyzer = analyzer or LLMAnalyzer()
+        self.concurrency = max(concurrency, 1)
+        self.batch_size = max(batch_size, 1)
+        self.bucket = TokenBucket(rate, burst=self.batch_size)
+        self.pause = pause
+        self.yield_to_queue = yield_to_queue
+        self.sleep = sleep
+
+    def start(self, filters: dict) -> int:
+        """
+        Creates a job covering the reviews stored so far.
+
+        Args:
+            filters (dict): See `build_reanalysis_filters`.
+
+        Raises:
+            ValueError: If a date is not in "YYYY-MM-DD" format.
+
+        Returns:
+            int: The job ID.
+        """
+        # Validates the filters before the job is stored.
+        build_reanalysis_filters(
+            filters, self.analyzer.model, self.analyzer.prompt_version
+        )
+        now = int(time.time())
+
+        with self.session_factory() as session:
+            job = ReanalysisJob(
+                filters=json.dumps(filters),
+                status="running",
+                last_review_id=0,
+                max_review_id=session.scalar(select(func.max(Review.id))) or 0,
+                processed=0,
+                failed=0,
+                created_at=now,
+                updated_at=now,
+            )
+            session.add(job)
+            session.commit()
+            return job.id
+
+    def run(
+        self, job_id: int, on_progress: Callable[[dict], None] | None = None
+    ) -> dict:
+        """
+        Runs a job, new or interrupted, until every matching review is processed.
+
+        Args:
+            job_id (int): The job ID.
+            on_progress (Callable[[dict], None] | None): Called with the progress
+                of the job after every page.
+
+        Returns:
+            dict: The final progress of the job (see `serialize_job`).
+        """
+        while True:
+            progress = self.run_page(job_id)
+            if on_progress:
+                on_progress(progress)
+            if progress["status"] == "done":
+                return progress
+
+    def run_page(self, job_id: int) -> dict:
+        """
+        Re-analyzes the next page of a job and saves its checkpoint.
+
+        Args:
+            job_id (int): The job ID.
+
+        Raises:
+            ValueError: If the job does not exist.
+
+        Returns:
+            dict: The progress of the job (see `serialize_job`).
+        """
+        with self.session_factory() as session:
+            job = session.get(ReanalysisJob, job_id)
+            if job is None:
+                raise ValueError(f"Reanálise {job_id} não encontrada.")
+            if job.status == "done":
+                return serialize_job(job)
+
+            self._wait_for_queue(session)
+
+            conditions = build_reanalysis_filters(
+                json.loads(job.filters),
+                self.analyzer.model,
+                self.analyzer.prompt_version,
+            )
+            rows = session.execute(
+                build_reanalysis_query(
+                    conditions,
+                    job.last_review_id,
+                    job.max_review_id,
+                    self.concurrency * self.batch_size,
+                )
+            ).all()
+
+            if not rows:
+                job.status = "done"
+            else:
+                self._process_page(session, job, rows)
+
+            job.updated_at = int(time.time())
+            session.commit()
+            return serialize_job(job)
+
+    def _wait_for_queue(self, session: Session) -> None:
+        while self.yield_to_queue:
+            due = session.scalar(
+                select(Review.id).filter(build_due_filter(int(time.time()))).limit(1)
+            )
+            session.rollback()
+            if due is None:
+                return
+            logger.info("Reanálise aguardando a fila de análises.")
+            self.sleep(self.pause)
+
+    def _process_page(self, session: Session, job: ReanalysisJob, rows: list) -> None:
+        batches = [
+            rows[start : start + self.batch_size]
+            for start in range(0, len(rows), self.batch_size)
+        ]
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            answers = executor.map(self._analyze, batches)
+            results = [result for answer in answers for result in answer]
+
+        service = ReviewService(session)
+        processed = failed = 0
+        last_review_id = job.last_review_id
+        unavailable = None
+
+        for (review_id, _), analysis_data in zip(rows, results):
+            if is_provider_unavailable(analysis_data):
+                # The checkpoint stops before this review; the ones after it are
+                # analyzed again on the next page, mostly from the cache.
+                unavailable = analysis_data
+                break
+
+            if isinstance(analysis_data, Exception):
+                logger.warning(
+                    "Reanálise da avaliação %s falhou: %s", review_id, analysis_data
+                )
+                failed += 1
+            else:
+                service.save_sentiment_analysis(review_id, analysis_data)
+                processed += 1
+            last_review_id = review_id
+
+        job.last_review_id = last_review_id
+        job.processed += processed
+        job.failed += failed
+
+        if unavailable is not None:
+            logger.warning(
+                "LLM indisponível (%s); reanálise pausada por %s s.",
+                unavailable,
+                self.pause,
+            )
+            session.commit()
+            self.sleep(self.pause)
+
+    def _analyze(self, batch: list) -> list[dict | Exception]:
+        self.bucket.acquire(len(batch))
+        return self.analyzer.analyze_batch([review_text for _, review_text in batch])
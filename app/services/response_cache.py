@@ -0,0 +1,440 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Iterable, NamedTuple
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+from app.utils.variables import (
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_CACHE_MAX_SIZE,
+    RESPONSE_CACHE_TTL,
+    RESPONSE_CACHE_URL,
+)
+
+# Generation of the listing pages; bumping it orphans every cached page at once.
+LISTING_SCOPE = "reviews"
+
+
+class CachedResponse(NamedTuple):
+    """
+    A serialized JSON response body and its entity tag.
+    """
+
+    etag: str
+    body: bytes
+
+
+class MemoryResponseBackend:
+    """
+    In-process LRU store of serialized responses, bounded by `max_size` entries.
+
+    Each process has its own copy, so writes made by another gunicorn worker or
+    replica are only seen once the entry expires.
+
+    Generations are bounded by `max_size` as well. When one is evicted every
+    unknown scope moves past all the generations handed out so far, so the
+    evicted scope can never go back to a number used by one of its old entries.
+    """
+
+    shared = False
+
+    def __init__(self, max_size: int = RESPONSE_CACHE_MAX_SIZE):
+        """
+        Initializes the store.
+
+        Args:
+            max_size (int): Maximum number of entries kept in memory.
+        """
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._generations: OrderedDict[str, int] = OrderedDict()
+        self._last_generation = 0
+        self._unknown_generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                return entry[1]
+            if entry:
+                del self._entries[key]
+
+        return None
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_generation(self, scope: str) -> int:
+        with self._lock:
+            return self._generations.get(scope, self._unknown_generation)
+
+    def bump_generation(self, scope: str) -> None:
+        with self._lock:
+            self._last_generation += 1
+            self._generations[scope] = self._last_generation
+            self._generations.move_to_end(scope)
+            if len(self._generations) > self.max_size:
+                self._generations.popitem(last=False)
+                self._last_generation += 1
+                self._unknown_generation = self._last_generation
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self._last_generation = self._unknown_generation = 0
+
+
+class SharedResponseBackend:
+    """
+    Store shared by every process and replica, on top of a Redis-compatible
+    client (`get`, `set(..., ex=)`, `incr`).
+
+    Any object with those methods can stand in for Redis, e.g. in tests.
+    """
+
+    shared = True
+
+    def __init__(self, client, prefix: str = "response-cache:"):
+        """
+        Initializes the store.
+
+        Args:
+            client: The Redis-compatible client.
+            prefix (str): Prefix of every key written by the cache.
+        """
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> bytes | None:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        self.client.set(self.prefix + key, value, ex=ttl)
+
+    def get_generation(self, scope: str) -> int:
+        return int(self.client.get(f"{self.prefix}generation:{scope}") or 0)
+
+    def bump_generation(self, scope: str) -> None:
+        self.client.incr(f"{self.prefix}generation:{scope}")
+
+    def clear(self) -> None:
+        # Entries expire on their own; moving to a new generation hides the
+        # cached pages right away.
+        self.bump_generation(LISTING_SCOPE)
+
+
+def build_response_backend(url: str = RESPONSE_CACHE_URL):
+    """
+    Builds the backend selected by `RESPONSE_CACHE_URL`.
+
+    Args:
+        url (str): Empty for the in-process backend, or a "redis://" URL for the
+            shared one (requires the `redis` package).
+
+    Returns:
+        MemoryResponseBackend | SharedResponseBackend: The backend.
+    """
+    if not url:
+        return MemoryResponseBackend()
+
+    import redis
+
+    return SharedResponseBackend(redis.Redis.from_url(url))
+
+
+class ResponseCache:
+    """
+    Read-through cache of the serialized bodies of the review read endpoints.
+
+    Single reviews are keyed under a generation number of their own, bumped when
+    the review changes: a reader that built the review before the change then
+    stores it under a key nobody looks up anymore, instead of caching the stale
+    body until it expires. Listing pages are keyed by their query string under a
+    shared generation number, so any write that may move a review between pages
+    invalidates every page with a single counter bump.
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        ttl: int = RESPONSE_CACHE_TTL,
+        enabled: bool = RESPONSE_CACHE_ENABLED,
+    ):
+        """
+        Initializes the cache.
+
+        Args:
+            backend: `MemoryResponseBackend` (default) or `SharedResponseBackend`.
+            ttl (int): Seconds an entry stays valid.
+            enabled (bool): Whether responses are cached at all.
+        """
+        self.backend = backend or MemoryResponseBackend()
+        self.ttl = ttl
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def review_key(self, review_id: int) -> str:
+        scope = f"review:{review_id}"
+        return f"{scope}:{self.backend.get_generation(scope)}"
+
+    async def review_key_async(self, review_id: int) -> str:
+        """
+        Asyncio version of `review_key`; a shared backend is called in a thread.
+        """
+        if self.backend.shared:
+            return await asyncio.to_thread(self.review_key, review_id)
+        return self.review_key(review_id)
+
+    def listing_key(self, params: Iterable[tuple[str, str]]) -> str:
+        query = "&".join(f"{name}={value}" for name, value in sorted(params))
+        generation = self.backend.get_generation(LISTING_SCOPE)
+        return f"{LISTING_SCOPE}:{generation}?{query}"
+
+    async def listing_key_async(self, params: Iterable[tuple[str, str]]) -> str:
+        """
+        Asyncio version of `listing_key`; a shared backend is called in a thread.
+        """
+        if self.backend.shared:
+            return await asyncio.to_thread(self.listing_key, list(params))
+        return self.listing_key(params)
+
+    def get(self, key: str) -> CachedResponse | None:
+        """
+        Looks up a cached response.
+
+        Args:
+            key (str): The key built by `review_key` or `listing_key`.
+
+        Returns:
+            CachedResponse | None: The cached response, or None on a miss.
+        """
+        if not self.enabled:
+            return None
+
+        value = self.backend.get(key)
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        etag, body = value.split(b"\n", 1)
+        return CachedResponse(etag.decode("ascii"), body)
+
+    def set(self, key: str, response: CachedResponse) -> None:
+        """
+        Stores a response for `ttl` seconds.
+        """
+        if self.enabled:
+            self.backend.set(
+                key, response.etag.encode("ascii") + b"\n" + response.body, self.ttl
+            )
+
+    def invalidate(self, review_ids: Iterable[int] = (), listing: bool = True) -> None:
+        """
+        Drops the cached responses affected by a write.
+
+        Args:
+            review_ids (Iterable[int]): Reviews whose detail changed.
+            listing (bool): Whether the listing pages may have changed.
+        """
+        if not self.enabled:
+            return
+
+        for review_id in review_ids:
+            self.backend.bump_generation(f"review:{review_id}")
+        if listing:
+            self.backend.bump_generation(LISTING_SCOPE)
+
+    async def invalidate_async(
+        self, review_ids: Iterable[int] = (), listing: bool = True
+    ) -> None:
+        """
+        Asyncio version of `invalidate`; a shared backend is called in a thread.
+        """
+        if self.backend.shared:
+            await asyncio.to_thread(self.invalidate, list(review_ids), listing)
+        else:
+            self.invalidate(review_ids, listing)
+
+    def clear(self) -> None:
+        """
+        Drops every cached response and resets the counters.
+        """
+        self.backend.clear()
+        with self._lock:
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        Reports the cache counters.
+
+        Returns:
+            dict: Hits, misses, hit ratio and whether the backend is shared.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "shared": self.backend.shared,
+            }
+
+
+response_cache = ResponseCache(build_response_backend())
+
+
+def encode_json(payload) -> bytes:
+    """
+    Serializes a payload to compact UTF-8 JSON.
+
+    Plain dicts, lists, strings and numbers (what the read endpoints return) are
+    written directly, with orjson when it is installed; only other values (enums,
+    Pydantic models, dates) go through `jsonable_encoder`, instead of walking the
+    whole payload with it first as FastAPI's `JSONResponse` does.
+
+    Args:
+        payload: The value returned by the service.
+
+    Returns:
+        bytes: The JSON body.
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, default=jsonable_encoder)
+
+    return json.dumps(
+        payload,
+        default=jsonable_encoder,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def json_response(payload) -> Response:
+    """
+    Answers with a payload serialized by `encode_json`, for the uncached read
+    endpoints returning large pages.
+    """
+    return Response(encode_json(payload), media_type="application/json")
+
+
+def encode_response(payload) -> CachedResponse:
+    """
+    Serializes a payload with `encode_json` and tags it.
+
+    Args:
+        payload: The value returned by the service.
+
+    Returns:
+        CachedResponse: The JSON body and its strong ETag.
+    """
+    body = encode_json(payload)
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+    return CachedResponse(etag, body)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Checks an `If-None-Match` header against an ETag (weak comparison).
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+
+    candidates = {candidate.strip() for candidate in header.split(",")}
+    return "*" in candidates or etag in {
+        candidate.removeprefix("W/") for candidate in candidates
+    }
+
+
+def build_response(request: Request, cached: CachedResponse) -> Response:
+    """
+    Answers with the cached body, or with 304 when the client already has it.
+    """
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+
+    if etag_matches(request, cached.etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(cached.body, media_type="application/json", headers=headers)
+
+
+def cached_response(
+    request: Request,
+    key: str,
+    build: Callable[[], object],
+    cacheable: Callable[[object], bool] = lambda payload: True,
+) -> Response:
+    """
+    Serves a read endpoint through the response cache.
+
+    On a hit the stored bytes are returned (or a 304 when `If-None-Match`
+    matches) without querying the database or serializing anything.
+
+    Args:
+        request (Request): The incoming request.
+        key (str): The key built by `review_key` or `listing_key`.
+        build (Callable): Produces the payload on a miss.
+        cacheable (Callable): Whether a payload may be stored (e.g. not a 404).
+
+    Returns:
+        Response: The JSON response, with its ETag.
+    """
+    cached = response_cache.get(key)
+
+    if cached is None:
+        payload = build()
+        cached = encode_response(payload)
+        if cacheable(payload):
+            response_cache.set(key, cached)
+
+    return build_response(request, cached)
+
+
+async def cached_response_async(
+    request: Request,
+    key: str,
+    build: Callable[[], Awaitable[object]],
+    cacheable: Callable[[object], bool] = lambda payload: True,
+) -> Response:
+    """
+    Asyncio version of `cached_response`; a shared backend is called in a thread.
+    """
+    if response_cache.backend.shared:
+        cached = await asyncio.to_thread(response_cache.get, key)
+    else:
+        cached = response_cache.get(key)
+
+    if cached is None:
+        payload = await build()
+        cached = encode_response(payload)
+        if cacheable(payload):
+            if response_cache.backend.shared:
+                await asyncio.to_thread(response_cache.set, key, cached)
+            else:
+                response_cache.set(key, cached)
+
+    return build_response(request, cached)
@@ -1,31 +1,702 @@
-from sqlalchemy import select
+from typing import Callable, Iterable, Iterator
+from sqlalchemy import Select, func, insert, select, tuple_, union_all
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session, joinedload
 from fastapi import HTTPException
-from fastapi_pagination import Page, Params
-from fastapi_pagination.ext.sqlalchemy import paginate
-from app.models.models import Review, SentimentAnalysis
-from app.utils.utils import convert_date_to_timestamp, convert_timestamp_to_date
-from app.services.ai_service import analyze_review_sentiment
-from pydantic import BaseModel, field_validator
+from app.models.models import (
+    AnalysisStatusEnum,
+    IdempotencyKey,
+    Review,
+    ReviewKeyword,
+    SentimentAnalysis,
+)
+from app.services.archive_service import (
+    build_archive_boundary_query,
+    build_archive_count_query,
+    build_archive_report_query,
+    reaches_archive,
+)
+from app.services.idempotency_service import (
+    build_content_hash,
+    build_duplicate_query,
+    build_idempotency_record,
+    build_request_hash,
+    replay_response,
+    validate_idempotency_key,
+)
+from app.services.keywords_service import (
+    build_keyword_filter,
+    build_top_keywords_query,
+    normalize_keywords,
+    serialize_top_keywords,
+)
+from app.services.metrics import stage_timer
+from app.services.response_cache import response_cache
+from app.services.rollup_service import (
+    build_rollup_statements,
+    build_summary,
+    build_summary_query,
+    normalize_sentiment,
+)
+from app.services.search_service import (
+    build_search_index_statements,
+    build_search_keyset_filter,
+    build_search_matches,
+    build_search_query,
+    build_search_sentiment_filter,
+)
+from app.services.stats_service import (
+    build_bucket_column,
+    build_percentiles,
+    build_percentiles_query,
+    build_stats,
+    build_stats_query,
+)
+from app.utils.pagination import (
+    OffsetParams,
+    build_offset_page,
+    build_offset_query,
+    decode_cursor,
+    encode_cursor,
+)
+from app.utils.dates import format_timestamp, format_timestamps, parse_iso_date
+from app.utils.variables import (
+    ANALYSIS_DEGRADED_RETRY_DELAY,
+    BULK_INSERT_CHUNK_SIZE,
+    REVIEW_DEDUP_ENABLED,
+)
+from pydantic import BaseModel
+import time
 
 
 class ReviewOut(BaseModel):
+    """
+    Schema of a listed review, documented by the listing endpoint. The items
+    themselves are built by `serialize_listing_rows`.
+    """
+
     id: int
     customer_name: str
     review_date: int
     review_text: str
     sentiment: str
 
-    @classmethod
-    def from_orm(cls, review: Review):
-        return cls(
-            id=review.id,
-            customer_name=review.customer_name,
-            review_date=review.review_date,
-            review_text=review.review_text,
-            sentiment=review.sentiment,
+
+# Columns read by the listing; no ORM object is built for its rows.
+LISTING_COLUMNS = (
+    Review.id,
+    Review.customer_name,
+    Review.review_date,
+    Review.review_text,
+    Review.sentiment,
+)
+
+# Columns read by the report, from the review and its analysis, if any.
+REPORT_COLUMNS = (
+    Review.id,
+    Review.customer_name,
+    Review.review_date,
+    Review.review_text,
+    Review.analysis_status,
+    SentimentAnalysis.sentiment,
+    SentimentAnalysis.score,
+    SentimentAnalysis.keywords,
+    SentimentAnalysis.explanation,
+)
+
+
+def validate_review_data(review_data: dict) -> dict:
+    """
+    Validates the payload of a review and converts it to `Review` columns.
+
+    Args:
+        review_data (dict): The review payload, as accepted by `create_review`.
+
+    Raises:
+        HTTPException: If required fields are missing or have invalid values.
+
+    Returns:
+        dict: The column values of the new review, queued for analysis.
+    """
+    if not isinstance(review_data, dict):
+        raise HTTPException(
+            status_code=400, detail="A avaliação deve ser um objeto JSON."
+        )
+
+    required_fields: list[str] = [
+        "customer_name",
+        "review_text",
+        "sentiment",
+        "review_date",
+    ]
+    for field in required_fields:
+        if field not in review_data or not review_data[field]:
+            raise HTTPException(status_code=400, detail=f"'{field}' é obrigatório.")
+
+    if not isinstance(review_data["customer_name"], str) or not isinstance(
+        review_data["review_text"], str
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail="Os campos 'customer_name' e 'review_text' devem ser strings.",
+        )
+
+    if review_data["sentiment"] not in ["positiva", "negativa", "neutra"]:
+        raise HTTPException(
+            status_code=400,
+            detail="O campo 'sentiment' deve ser 'positiva', 'negativa' ou 'neutra'.",
+        )
+
+    try:
+        review_timestamp: int = parse_iso_date(review_data["review_date"])
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=400, detail="Formato de data inválido. Use YYYY-MM-DD."
+        )
+
+    return {
+        "customer_name": review_data["customer_name"],
+        "review_text": review_data["review_text"],
+        "sentiment": review_data["sentiment"],
+        "review_date": review_timestamp,
+        "analysis_status": AnalysisStatusEnum.PENDING,
+        "analysis_next_attempt_at": int(time.time()),
+        "content_hash": build_content_hash(
+            review_data["customer_name"], review_timestamp, review_data["review_text"]
+        ),
+    }
+
+
+def serialize_created_review(review: Review, review_date: str, created: bool) -> dict:
+    """
+    Builds the response of `POST /reviews/`.
+
+    Args:
+        review (Review): The stored review.
+        review_date (str): The date as sent by the client.
+        created (bool): False when an existing duplicate is returned instead.
+
+    Returns:
+        dict: The review details and its analysis status, flagged with
+            "duplicate" when it was not created by this request.
+    """
+    response = {
+        "status": "OK",
+        "review": {
+            "id": review.id,
+            "customer_name": review.customer_name,
+            "review_text": review.review_text,
+            "sentiment": review.sentiment,
+            "review_date": review_date,
+            "analysis_status": review.analysis_status.value,
+        },
+    }
+    if not created:
+        response["duplicate"] = True
+
+    return response
+
+
+def prepare_bulk_rows(
+    rows: Iterable, start_index: int = 0
+) -> tuple[list[dict], list[tuple[int, dict]]]:
+    """
+    Validates bulk review payloads, splitting them into errors and valid rows.
+
+    Args:
+        rows (Iterable): Review payloads. An `Exception` item marks a row that
+            could not even be parsed and is reported as an error.
+        start_index (int): Index of the first row, used in the results.
+
+    Returns:
+        tuple[list[dict], list[tuple[int, dict]]]: The per-row error results and
+            the (index, column values) pairs of the valid rows.
+    """
+    errors: list[dict] = []
+    valid_rows: list[tuple[int, dict]] = []
+
+    for index, review_data in enumerate(rows, start=start_index):
+        if isinstance(review_data, Exception):
+            errors.append(
+                {"index": index, "status": "error", "detail": str(review_data)}
+            )
+            continue
+
+        try:
+            valid_rows.append((index, validate_review_data(review_data)))
+        except HTTPException as error:
+            errors.append({"index": index, "status": "error", "detail": error.detail})
+
+    return errors, valid_rows
+
+
+def bulk_insert_results(
+    chunk: list[tuple[int, dict]], review_ids: list[int] | None
+) -> list[dict]:
+    """
+    Builds the per-row results of an inserted bulk chunk.
+
+    Args:
+        chunk (list[tuple[int, dict]]): The (index, column values) pairs inserted.
+        review_ids (list[int] | None): The generated IDs, or None if the insert
+            failed.
+
+    Returns:
+        list[dict]: One result per row of the chunk.
+    """
+    if review_ids is None:
+        return [
+            {
+                "index": index,
+                "status": "error",
+                "detail": "Não foi possível salvar a avaliação.",
+            }
+            for index, _ in chunk
+        ]
+
+    return [
+        {
+            "index": index,
+            "status": "OK",
+            "id": review_id,
+            "analysis_status": AnalysisStatusEnum.PENDING.value,
+        }
+        for (index, _), review_id in zip(chunk, review_ids)
+    ]
+
+
+def chunked(rows: list, size: int = BULK_INSERT_CHUNK_SIZE) -> Iterator[list]:
+    """
+    Splits a list into consecutive chunks of at most `size` items.
+    """
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+def apply_sentiment_analysis(review: Review, analysis_data: dict) -> None:
+    """
+    Writes an analysis result into a review, creating or overwriting its
+    `SentimentAnalysis`, and marks the analysis as done.
+
+    The keywords are also written, normalized, to `review_keywords`. A result
+    produced by the local fallback (marked with "degraded") is stored too, but
+    the review is marked as degraded and queued again for the LLM.
+
+    Args:
+        review (Review): The analyzed review, with `sentiment_analysis` and
+            `keywords` loaded.
+        analysis_data (dict): The result returned by `analyze_review_sentiment`.
+    """
+    analysis = review.sentiment_analysis or SentimentAnalysis(review_id=review.id)
+    analysis.sentiment = analysis_data.get("sentiment", "")
+    analysis.score = analysis_data.get("score", 0.0)
+    analysis.keywords = ",".join(analysis_data.get("keywords", []))
+    analysis.explanation = analysis_data.get(
+        "explanation", "Análise sem explicação detalhada."
+    )
+    analysis.model = analysis_data.get("model")
+    analysis.prompt_version = analysis_data.get("prompt_version")
+    analysis.prompt_tokens = analysis_data.get("prompt_tokens")
+    analysis.completion_tokens = analysis_data.get("completion_tokens")
+    analysis.latency_ms = analysis_data.get("latency_ms")
+
+    review.sentiment_analysis = analysis
+    review.keywords = [
+        ReviewKeyword(keyword=keyword)
+        for keyword in normalize_keywords(analysis_data.get("keywords", []))
+    ]
+    review.analysis_error = None
+
+    if analysis_data.get("degraded"):
+        review.analysis_status = AnalysisStatusEnum.DEGRADED
+        review.analysis_attempts = 0
+        review.analysis_next_attempt_at = (
+            int(time.time()) + ANALYSIS_DEGRADED_RETRY_DELAY
+        )
+        return
+
+    review.analysis_status = AnalysisStatusEnum.DONE
+    review.analysis_next_attempt_at = None
+
+
+def serialize_analysis_status(review: Review) -> dict:
+    """
+    Builds the analysis status payload of a review.
+
+    Args:
+        review (Review): The review, with `sentiment_analysis` loaded.
+
+    Returns:
+        dict: The analysis status, attempts and result (when done).
+    """
+    analysis = review.sentiment_analysis
+    analysis_data = None
+    if analysis:
+        analysis_data = {
+            "sentiment": analysis.sentiment,
+            "score": analysis.score,
+            "keywords": analysis.keywords,
+            "explanation": analysis.explanation,
+            "model": analysis.model,
+            "prompt_version": analysis.prompt_version,
+            "prompt_tokens": analysis.prompt_tokens,
+            "completion_tokens": analysis.completion_tokens,
+            "latency_ms": analysis.latency_ms,
+        }
+
+    return {
+        "review_id": review.id,
+        "analysis_status": review.analysis_status.value,
+        "attempts": review.analysis_attempts,
+        "next_attempt_at": review.analysis_next_attempt_at,
+        "error": review.analysis_error,
+        "analysis": analysis_data,
+    }
+
+
+def serialize_review(review: Review) -> dict:
+    """
+    Builds the payload of a single review.
+
+    Args:
+        review (Review): The review.
+
+    Returns:
+        dict: The review details with a formatted date.
+    """
+    return {
+        "id": review.id,
+        "customer_name": review.customer_name,
+        "review_text": review.review_text,
+        "sentiment": review.sentiment,
+        "review_date": format_timestamp(review.review_date),
+        "analysis_status": review.analysis_status.value,
+    }
+
+
+def serialize_listing_rows(rows: list) -> list[dict]:
+    """
+    Builds the listing items from the rows of `build_all_reviews_query`.
+
+    Args:
+        rows (list): The `LISTING_COLUMNS` of each review.
+
+    Returns:
+        list[dict]: The fields of `ReviewOut`, per review.
+    """
+    return [
+        {
+            "id": row.id,
+            "customer_name": row.customer_name,
+            "review_date": row.review_date,
+            "review_text": row.review_text,
+            "sentiment": row.sentiment.value,
+        }
+        for row in rows
+    ]
+
+
+def transform_report_rows(rows: list) -> list[dict]:
+    """
+    Builds the report items from reviews and their analyses, if any.
+
+    The dates of the whole page are formatted at once (see `format_timestamps`).
+
+    Args:
+        rows (list): The `REPORT_COLUMNS` of each review; the analysis columns
+            are None when it was not analyzed yet.
+
+    Returns:
+        list[dict]: The review details merged with the translated analysis.
+    """
+    review_dates = format_timestamps([row.review_date for row in rows])
+
+    return [
+        {
+            "id": row.id,
+            "customer_name": row.customer_name,
+            "review_date": review_date,
+            "review_text": row.review_text,
+            "analysis_status": row.analysis_status.value,
+            "sentiment": (
+                normalize_sentiment(row.sentiment)
+                if row.sentiment is not None
+                else None
+            ),
+            "score": row.score,
+            "keywords": row.keywords,
+            "explanation": row.explanation,
+        }
+        for row, review_date in zip(rows, review_dates)
+    ]
+
+
+def build_analysis_status_query(review_id: int) -> Select:
+    """
+    Builds the query that loads a review with its analysis.
+    """
+    return (
+        select(Review)
+        .options(joinedload(Review.sentiment_analysis))
+        .filter(Review.id == review_id)
+    )
+
+
+def build_all_reviews_query(*filters) -> Select:
+    """
+    Builds the query that lists every review (matching `filters`), newest first.
+
+    `id` breaks ties between reviews of the same date, so the order is total and
+    both pagination modes are stable.
+    """
+    return (
+        select(*LISTING_COLUMNS)
+        .filter(*filters)
+        .order_by(Review.review_date.desc(), Review.id.desc())
+    )
+
+
+def build_listing_filters(keyword: str | None) -> tuple:
+    """
+    Builds the conditions of the review listing from its query parameters.
+    """
+    return (build_keyword_filter(keyword),) if keyword else ()
+
+
+def parse_report_range(start_date: str, end_date: str) -> tuple[int, int]:
+    """
+    Converts the dates of a report request to timestamps.
+
+    Args:
+        start_date (str): The start date in "YYYY-MM-DD" format.
+        end_date (str): The end date in "YYYY-MM-DD" format.
+
+    Raises:
+        ValueError: If the date format is invalid.
+
+    Returns:
+        tuple[int, int]: The start and end timestamps.
+    """
+    start_timestamp: int = parse_iso_date(start_date)
+    end_timestamp: int = parse_iso_date(end_date)
+
+    return start_timestamp, end_timestamp
+
+
+def build_report_filters(start_timestamp: int, end_timestamp: int) -> tuple:
+    """
+    Builds the conditions selecting the reviews within a date range.
+    """
+    return (
+        Review.review_date >= start_timestamp,
+        Review.review_date <= end_timestamp,
+    )
+
+
+def build_report_query(
+    start_timestamp: int, end_timestamp: int, archived: bool = False
+) -> Select:
+    """
+    Builds the query of the reviews (with analyses) within a date range.
+
+    Args:
+        start_timestamp (int): Start of the range (inclusive).
+        end_timestamp (int): End of the range (inclusive).
+        archived (bool): Whether the range reaches into `reviews_archive`, whose
+            reviews are then merged with the live ones (`UNION ALL`).
+
+    Returns:
+        Select: The `REPORT_COLUMNS` of each review, newest first.
+    """
+    query = (
+        select(*REPORT_COLUMNS)
+        .outerjoin(SentimentAnalysis, SentimentAnalysis.review_id == Review.id)
+        .filter(*build_report_filters(start_timestamp, end_timestamp))
+    )
+    if not archived:
+        return query.order_by(Review.review_date.desc(), Review.id.desc())
+
+    report = union_all(
+        query, build_archive_report_query(start_timestamp, end_timestamp)
+    ).subquery("report")
+    return select(*report.c).order_by(report.c.review_date.desc(), report.c.id.desc())
+
+
+def build_keyword_range_filters(start_date: str | None, end_date: str | None) -> tuple:
+    """
+    Builds the optional date range conditions of the top keywords query.
+
+    Raises:
+        ValueError: If a date format is invalid.
+    """
+    filters = ()
+
+    if start_date:
+        filters += (Review.review_date >= parse_iso_date(start_date),)
+    if end_date:
+        filters += (Review.review_date <= parse_iso_date(end_date),)
+
+    return filters
+
+
+def build_count_query(*filters) -> Select:
+    """
+    Builds the `COUNT(*)` of the reviews matching the given conditions.
+    """
+    return select(func.count(Review.id)).filter(*filters)
+
+
+def build_keyset_query(query: Select, cursor: str, size: int) -> Select:
+    """
+    Restricts a query ordered by (review_date, id) descending to one cursor page.
+
+    Instead of an OFFSET, the page starts right after the (review_date, id) pair
+    encoded in the cursor, which the `ix_reviews_review_date_id` index seeks to
+    directly, so every page costs the same regardless of its depth. One extra row
+    is fetched to know whether there is a next page.
+
+    Args:
+        query (Select): The listing query.
+        cursor (str): Token of the page, empty for the first page.
+        size (int): Number of items of the page.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+
+    Returns:
+        Select: The query of the page.
+    """
+    if cursor:
+        try:
+            review_date, review_id = decode_cursor(cursor)
+        except ValueError as error:
+            raise HTTPException(status_code=400, detail=str(error))
+
+        columns = query.selected_columns
+        query = query.filter(
+            tuple_(columns.review_date, columns.id) < (review_date, review_id)
         )
 
+    return query.limit(size + 1)
+
+
+def build_cursor_page(
+    rows: list,
+    size: int,
+    total: int | None,
+    transform: Callable[[list], list[dict]],
+    sort_column: str = "review_date",
+) -> dict:
+    """
+    Builds a cursor page from the rows fetched by `build_keyset_query`.
+
+    Args:
+        rows (list): Up to `size + 1` rows, with `sort_column` and `id` columns.
+        size (int): Number of items of the page.
+        total (int | None): Total number of items, if counted.
+        transform (Callable): Converts the rows of the page to their output
+            format.
+        sort_column (str): Column the rows are sorted by, before `id`.
+
+    Returns:
+        dict: The fields of `CursorPage`, with the cursor of the next page when
+            there is more.
+    """
+    next_cursor = None
+
+    if len(rows) > size:
+        rows = rows[:size]
+        next_cursor = encode_cursor(getattr(rows[-1], sort_column), rows[-1].id)
+
+    return {
+        "items": transform(rows),
+        "size": size,
+        "next_cursor": next_cursor,
+        "total": total,
+    }
+
+
+def build_search_request(
+    dialect_name: str,
+    q: str,
+    sentiment: str | None,
+    start_date: str | None,
+    end_date: str | None,
+) -> Select | None:
+    """
+    Builds the query of the reviews matching a search and its optional filters.
+
+    Args:
+        dialect_name (str): Name of the database dialect ("postgresql", "sqlite").
+        q (str): The search terms.
+        sentiment (str | None): Only keeps the reviews analyzed as "positive",
+            "negative" or "neutral".
+        start_date (str | None): Optional start date in "YYYY-MM-DD" format.
+        end_date (str | None): Optional end date in "YYYY-MM-DD" format.
+
+    Raises:
+        ValueError: If a date format is invalid.
+
+    Returns:
+        Select | None: See `build_search_query`; None when nothing can match.
+    """
+    filters = build_keyword_range_filters(start_date, end_date)
+    if sentiment:
+        filters += (build_search_sentiment_filter(sentiment),)
+
+    matches = build_search_matches(dialect_name, q)
+    if matches is None:
+        return None
+
+    return build_search_query(matches, *filters)
+
+
+def build_search_keyset_query(query: Select, cursor: str, size: int) -> Select:
+    """
+    Restricts a search query to one cursor page, like `build_keyset_query` but
+    keyed by (rank, id).
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    if cursor:
+        try:
+            rank, review_id = decode_cursor(cursor, float)
+        except ValueError as error:
+            raise HTTPException(status_code=400, detail=str(error))
+
+        query = query.filter(build_search_keyset_filter(query, rank, review_id))
+
+    return query.limit(size + 1)
+
+
+def serialize_search_rows(rows: list) -> list[dict]:
+    """
+    Builds the search results from the rows of `build_search_query`.
+
+    Returns:
+        list[dict]: The review details, its analyzed sentiment and explanation
+            (None when not analyzed yet) and the rank of the match.
+    """
+    review_dates = format_timestamps([row.review_date for row in rows])
+
+    return [
+        {
+            "id": row.id,
+            "customer_name": row.customer_name,
+            "review_date": review_date,
+            "review_text": row.review_text,
+            "sentiment": (
+                normalize_sentiment(row.sentiment)
+                if row.sentiment is not None
+                else None
+            ),
+            "explanation": row.explanation,
+            "rank": row.rank,
+        }
+        for row, review_date in zip(rows, review_dates)
+    ]
+
 
 class ReviewService:
     def __init__(self, db: Session):
@@ -34,9 +705,19 @@ class ReviewService:
         """
         self.db = db
 
-    def create_review(self, review_data: dict) -> dict:
+    def create_review(
+        self, review_data: dict, idempotency_key: str | None = None
+    ) -> dict:
         """
-        Creates a new customer review and performs sentiment analysis.
+        Creates a new customer review and queues it for sentiment analysis.
+
+        The review is stored with a pending analysis status and the response is
+        returned right away; `AnalysisWorker` picks it up in the background.
+
+        With an `idempotency_key`, the response is saved with the review and a
+        retry with the same key gets it back without writing anything. With
+        `REVIEW_DEDUP_ENABLED`, a review with the same customer, date and text
+        as a stored one is not created again: the stored one is returned.
 
         Args:
             db (Session): The database session.
@@ -45,101 +726,333 @@ class ReviewService:
                 - "review_text" (str): The content of the review.
                 - "sentiment" (str): The sentiment classification (must be "positiva", "negativa", or "neutra").
                 - "review_date" (str): The date of the review in "YYYY-MM-DD" format.
+            idempotency_key (str | None): The `Idempotency-Key` header, if sent.
 
         Raises:
-            HTTPException: If required fields are missing or have invalid values.
+            HTTPException: If required fields are missing or have invalid values,
+                or if the key was already used for a different review.
 
         Returns:
-            dict: A dictionary containing the created review details, including sentiment analysis.
+            dict: A dictionary containing the created review details and its
+                analysis status.
         """
-        required_fields: list[str] = [
-            "customer_name",
-            "review_text",
-            "sentiment",
-            "review_date",
-        ]
-        for field in required_fields:
-            if field not in review_data or not review_data[field]:
-                raise HTTPException(status_code=400, detail=f"'{field}' é obrigatório.")
-
-        if not isinstance(review_data["customer_name"], str) or not isinstance(
-            review_data["review_text"], str
-        ):
-            raise HTTPException(
-                status_code=400,
-                detail="Os campos 'customer_name' e 'review_text' devem ser strings.",
-            )
+        idempotency_key = validate_idempotency_key(idempotency_key)
+        if idempotency_key is not None:
+            request_hash = build_request_hash(review_data)
+            record = self.db.get(IdempotencyKey, idempotency_key)
+            if record is not None:
+                return replay_response(record, request_hash)
+
+        with stage_timer("validate"):
+            values = validate_review_data(review_data)
 
-        if review_data["sentiment"] not in ["positiva", "negativa", "neutra"]:
-            raise HTTPException(
-                status_code=400,
-                detail="O campo 'sentiment' deve ser 'positiva', 'negativa' ou 'neutra'.",
+        with stage_timer("db_insert"):
+            review = None
+            if REVIEW_DEDUP_ENABLED:
+                review = self.db.scalars(
+                    build_duplicate_query(values["content_hash"])
+                ).first()
+            created = review is None
+            if created:
+                review = Review(**values)
+                self.db.add(review)
+                self.db.flush()
+                self.index_reviews(Review.id == review.id)
+
+            response = serialize_created_review(
+                review, review_data["review_date"], created
             )
+            if idempotency_key is not None:
+                self.db.add(
+                    build_idempotency_record(
+                        idempotency_key, request_hash, review.id, response
+                    )
+                )
+
+            try:
+                self.db.commit()
+            except IntegrityError:
+                # A concurrent retry with the same key committed first.
+                self.db.rollback()
+                if idempotency_key is None:
+                    raise
+                record = self.db.get(IdempotencyKey, idempotency_key)
+                if record is None:
+                    raise
+                return replay_response(record, request_hash)
+
+        if created:
+            response_cache.invalidate()
+
+        return response
+
+    def create_reviews_bulk(self, rows: Iterable, start_index: int = 0) -> list[dict]:
+        """
+        Validates and stores many reviews at once, queueing them for analysis.
+
+        Rows are validated with the same rules as `create_review` and inserted
+        with multi-row `INSERT ... RETURNING` statements, one transaction per chunk
+        of `BULK_INSERT_CHUNK_SIZE` rows. Invalid rows, or rows of a chunk whose
+        insert failed, are reported individually without aborting the others.
+
+        Args:
+            rows (Iterable): Review payloads. An `Exception` item marks a row that
+                could not even be parsed and is reported as an error.
+            start_index (int): Index of the first row, used in the results.
+
+        Returns:
+            list[dict]: One result per row, in input order, with its "index",
+                "status" ("OK" or "error") and either the review "id" or a
+                "detail" message.
+        """
+        results, valid_rows = prepare_bulk_rows(rows, start_index)
+
+        for chunk in chunked(valid_rows):
+            with stage_timer("db_insert_bulk"):
+                results.extend(self._insert_reviews_chunk(chunk))
+
+        if valid_rows:
+            response_cache.invalidate()
+
+        return sorted(results, key=lambda result: result["index"])
+
+    def _insert_reviews_chunk(self, chunk: list[tuple[int, dict]]) -> list[dict]:
+        query = insert(Review).returning(Review.id, sort_by_parameter_order=True)
 
         try:
-            review_timestamp: int = convert_date_to_timestamp(
-                review_data["review_date"], "%Y-%m-%d"
-            )
-        except ValueError:
-            raise HTTPException(
-                status_code=400, detail="Formato de data inválido. Use YYYY-MM-DD."
-            )
+            review_ids = self.db.scalars(query, [values for _, values in chunk]).all()
+            self.index_reviews(Review.id.in_(review_ids))
+            self.db.commit()
+        except SQLAlchemyError:
+            self.db.rollback()
+            review_ids = None
 
-        new_review = Review(
-            customer_name=review_data["customer_name"],
-            review_text=review_data["review_text"],
-            sentiment=review_data["sentiment"],
-            review_date=review_timestamp,
-        )
+        return bulk_insert_results(chunk, review_ids)
 
-        self.db.add(new_review)
-        self.db.commit()
-        self.db.refresh(new_review)
+    def save_sentiment_analysis(self, review_id: int, analysis_data: dict) -> None:
+        """
+        Stores the AI sentiment analysis of a review and marks it as done.
 
-        sentiment_analysis_dict = analyze_review_sentiment(new_review.review_text)
+        An existing analysis for the same review is overwritten, and the cached
+        responses showing the review are invalidated.
 
-        new_analysis = SentimentAnalysis(
-            review_id=new_review.id,
-            sentiment=sentiment_analysis_dict.get("sentiment", ""),
-            score=sentiment_analysis_dict.get("score", 0.0),
-            keywords=",".join(sentiment_analysis_dict.get("keywords", [])),
-            explanation=sentiment_analysis_dict.get(
-                "explanation", "Análise sem explicação detalhada."
-            ),
-        )
+        Args:
+            review_id (int): The ID of the analyzed review.
+            analysis_data (dict): The result returned by `analyze_review_sentiment`.
+        """
+        with stage_timer("db_insert_analysis"):
+            review: Review = self.db.get(Review, review_id)
 
-        self.db.add(new_analysis)
-        self.db.commit()
+            if not review:
+                return
 
-        return {
-            "status": "OK",
-            "review": {
-                "id": new_review.id,
-                "customer_name": new_review.customer_name,
-                "review_text": new_review.review_text,
-                "sentiment": new_review.sentiment,
-                "review_date": review_data["review_date"],
-            },
-        }
+            replaced = review.sentiment_analysis is not None
+            apply_sentiment_analysis(review, analysis_data)
+            self.db.flush()
+
+            dialect_name = self.db.get_bind().dialect.name
+            for statement in build_rollup_statements(dialect_name, review, replaced):
+                self.db.execute(statement)
+            self.index_reviews(Review.id == review_id)
+
+            self.db.commit()
+        response_cache.invalidate([review_id])
+
+    def index_reviews(self, *filters) -> None:
+        """
+        Updates the full-text index of the reviews matching `filters`, in the
+        current transaction.
+        """
+        dialect_name = self.db.get_bind().dialect.name
+        for statement in build_search_index_statements(dialect_name, *filters):
+            self.db.execute(statement)
+
+    def get_analysis_status(self, review_id: int) -> dict:
+        """
+        Retrieves the sentiment analysis status of a specific review.
+
+        Args:
+            review_id (int): The ID of the review.
+
+        Returns:
+            dict: The analysis status, attempts and result (when done), or a 404
+                message if the review is not found.
+        """
+        review: Review = self.db.scalars(build_analysis_status_query(review_id)).first()
+
+        if not review:
+            return {
+                "status": 404,
+                "message": "Avaliação não encontrada",
+            }
 
-    def get_all_reviews(self) -> Page[ReviewOut]:
+        return serialize_analysis_status(review)
+
+    def get_all_reviews(
+        self,
+        params: OffsetParams | None = None,
+        cursor: str | None = None,
+        keyword: str | None = None,
+    ) -> dict:
         """
         Retrieves all stored customer reviews.
 
+        Only the listed columns are read, as plain rows, and turned into dicts
+        ready to be encoded, without building ORM objects or Pydantic models.
+
         Args:
-            db (Session): The database session.
+            params (OffsetParams | None): Page, size and whether to count the total.
+            cursor (str | None): Switches to keyset pagination when given; empty
+                for the first page, then the `next_cursor` of the previous page.
+            keyword (str | None): Only lists the reviews whose analysis mentions
+                this keyword.
 
         Returns:
-            dict: A dictionary containing a list of all reviews, or a 404 message if none are found.
+            dict: The page, with the fields of `Page[ReviewOut]`, or of
+                `CursorPage[ReviewOut]` when `cursor` is given.
         """
+        params = params or OffsetParams()
+        filters = build_listing_filters(keyword)
+        query = build_all_reviews_query(*filters)
+        total = (
+            self.db.scalar(build_count_query(*filters))
+            if params.include_total
+            else None
+        )
 
-        query = select(Review).order_by(Review.review_date.desc())
+        if cursor is not None:
+            return build_cursor_page(
+                self.db.execute(build_keyset_query(query, cursor, params.size)).all(),
+                params.size,
+                total,
+                serialize_listing_rows,
+            )
 
-        reviews = paginate(self.db, query)
+        rows = self.db.execute(build_offset_query(query, params)).all()
 
-        reviews.items = [ReviewOut.from_orm(review) for review in reviews.items]
+        return build_offset_page(serialize_listing_rows(rows), params, total)
 
-        return reviews
+    def get_top_keywords(
+        self,
+        limit: int = 20,
+        start_date: str | None = None,
+        end_date: str | None = None,
+    ) -> dict:
+        """
+        Lists the keywords mentioned by the most analyzed reviews.
+
+        Args:
+            limit (int): Maximum number of keywords.
+            start_date (str | None): Optional start date in "YYYY-MM-DD" format.
+            end_date (str | None): Optional end date in "YYYY-MM-DD" format.
+
+        Returns:
+            dict: The keywords with their review count, most frequent first, or a
+                400 message if the dates are invalid.
+        """
+        try:
+            filters = build_keyword_range_filters(start_date, end_date)
+        except ValueError:
+            return {
+                "status": 400,
+                "message": "Formato de data inválido. Use YYYY-MM-DD.",
+            }
+
+        rows = self.db.execute(build_top_keywords_query(limit, *filters)).all()
+
+        return serialize_top_keywords(rows)
+
+    def get_review_stats(
+        self,
+        bucket: str = "day",
+        start_date: str | None = None,
+        end_date: str | None = None,
+    ) -> dict:
+        """
+        Computes sentiment trends of the analyzed reviews, grouped in the database.
+
+        Args:
+            bucket (str): "day", "week" or "month".
+            start_date (str | None): Optional start date in "YYYY-MM-DD" format.
+            end_date (str | None): Optional end date in "YYYY-MM-DD" format.
+
+        Returns:
+            dict: Per bucket, the count per sentiment, the mean and percentile
+                scores and the agreement rate between the declared and the
+                analyzed sentiment, or a 400 message if the dates are invalid.
+        """
+        try:
+            filters = build_keyword_range_filters(start_date, end_date)
+        except ValueError:
+            return {
+                "status": 400,
+                "message": "Formato de data inválido. Use YYYY-MM-DD.",
+            }
+
+        dialect_name = self.db.get_bind().dialect.name
+        bucket_column = build_bucket_column(bucket, dialect_name)
+
+        rows = self.db.execute(build_stats_query(bucket_column, *filters)).all()
+        percentile_rows = self.db.execute(
+            build_percentiles_query(bucket_column, dialect_name, *filters)
+        ).all()
+
+        return build_stats(
+            bucket, rows, build_percentiles(percentile_rows, dialect_name)
+        )
+
+    def search_reviews(
+        self,
+        q: str,
+        size: int = 20,
+        cursor: str = "",
+        sentiment: str | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+    ) -> dict:
+        """
+        Searches the review texts and analysis explanations, best matches first.
+
+        Matches come from the full-text index (`tsvector` with the Portuguese
+        configuration on PostgreSQL, FTS5 on SQLite) and are paged by keyset on
+        (rank, id).
+
+        Args:
+            q (str): The search terms.
+            size (int): Number of results per page.
+            cursor (str): Empty for the first page, then the `next_cursor` of the
+                previous page.
+            sentiment (str | None): Only keeps the reviews analyzed as
+                "positive", "negative" or "neutral".
+            start_date (str | None): Optional start date in "YYYY-MM-DD" format.
+            end_date (str | None): Optional end date in "YYYY-MM-DD" format.
+
+        Returns:
+            dict: The search terms and a cursor page of results, or a 400
+                message if the dates are invalid.
+        """
+        dialect_name = self.db.get_bind().dialect.name
+        try:
+            query = build_search_request(
+                dialect_name, q, sentiment, start_date, end_date
+            )
+        except ValueError:
+            return {
+                "status": 400,
+                "message": "Formato de data inválido. Use YYYY-MM-DD.",
+            }
+
+        rows = []
+        if query is not None:
+            with stage_timer("search"):
+                rows = self.db.execute(
+                    build_search_keyset_query(query, cursor, size)
+                ).all()
+
+        return {
+            "query": q,
+            **build_cursor_page(rows, size, None, serialize_search_rows, "rank"),
+        }
 
     def get_review_by_id(self, review_id: int) -> dict:
         """
@@ -160,24 +1073,32 @@ class ReviewService:
                 "message": "Avaliação não encontrada",
             }
 
-        review_data = {
-            "id": review.id,
-            "customer_name": review.customer_name,
-            "review_text": review.review_text,
-            "sentiment": review.sentiment,
-            "review_date": convert_timestamp_to_date(review.review_date),
-        }
-
-        return {"review": review_data}
+        return {"review": serialize_review(review)}
 
-    def get_reviews_report(self, start_date: str, end_date: str) -> dict:
+    def get_reviews_report(
+        self,
+        start_date: str,
+        end_date: str,
+        include_items: bool = True,
+        params: OffsetParams | None = None,
+        cursor: str | None = None,
+    ) -> dict:
         """
         Generates a report of customer reviews within a specified date range.
 
+        The summary comes from the daily rollup table, so its cost depends on the
+        number of days in the range rather than on the number of reviews. When
+        the range reaches into `reviews_archive`, the review list also reads the
+        archived reviews.
+
         Args:
             db (Session): The database session.
             start_date (str): The start date in "YYYY-MM-DD" format.
             end_date (str): The end date in "YYYY-MM-DD" format.
+            include_items (bool): Whether to include the paginated review list.
+            params (OffsetParams | None): Page, size and whether to count the total.
+            cursor (str | None): Switches the review list to keyset pagination, see
+                `get_all_reviews`.
 
         Raises:
             HTTPException: If the date format is invalid.
@@ -186,50 +1107,52 @@ class ReviewService:
             dict: A report containing the total number of reviews and a breakdown by sentiment.
         """
         try:
-            start_timestamp: int = convert_date_to_timestamp(start_date, "%Y-%m-%d")
-            end_timestamp: int = convert_date_to_timestamp(end_date, "%Y-%m-%d")
-
+            start_timestamp, end_timestamp = parse_report_range(start_date, end_date)
         except ValueError:
             return {
                 "status": 400,
                 "message": "Formato de data inválido. Use YYYY-MM-DD.",
             }
 
-        query = (
-            select(Review)
-            .options(joinedload(Review.sentiment_analysis))
-            .filter(
-                Review.review_date >= start_timestamp,
-                Review.review_date <= end_timestamp,
+        with stage_timer("report_summary"):
+            summary = build_summary(
+                self.db.execute(
+                    build_summary_query(start_timestamp, end_timestamp)
+                ).all()
             )
-            .order_by(Review.review_date.desc())
-        )
 
-        sentiment_mapping = {
-            "positiva": "positive",
-            "negativa": "negative",
-            "neutra": "neutral",
-        }
+        if not include_items:
+            return summary
 
-        def transform_review(review: Review) -> dict:
-            analysis = review.sentiment_analysis
-            sentiment_en = sentiment_mapping.get(analysis.sentiment.lower(), "neutral")
+        params = params or OffsetParams()
 
-            return {
-                "id": review.id,
-                "customer_name": review.customer_name,
-                "review_date": convert_timestamp_to_date(review.review_date),
-                "review_text": review.review_text,
-                "sentiment": sentiment_en,
-                "score": analysis.score,
-                "keywords": analysis.keywords,
-                "explanation": analysis.explanation,
-            }
+        with stage_timer("report_query"):
+            archived = reaches_archive(
+                self.db.scalar(build_archive_boundary_query()), start_timestamp
+            )
+            query = build_report_query(start_timestamp, end_timestamp, archived)
 
-        paginated_reviews = paginate(self.db, query, params=Params()).dict()
+            total = None
+            if params.include_total:
+                filters = build_report_filters(start_timestamp, end_timestamp)
+                total = self.db.scalar(build_count_query(*filters))
+                if archived:
+                    total += self.db.scalar(
+                        build_archive_count_query(start_timestamp, end_timestamp)
+                    )
 
-        paginated_reviews["items"] = list(
-            map(transform_review, paginated_reviews["items"])
-        )
+            if cursor is not None:
+                query = build_keyset_query(query, cursor, params.size)
+            else:
+                query = build_offset_query(query, params)
+            rows = self.db.execute(query).all()
+
+        with stage_timer("report_transform"):
+            if cursor is not None:
+                page = build_cursor_page(
+                    rows, params.size, total, transform_report_rows
+                )
+            else:
+                page = build_offset_page(transform_report_rows(rows), params, total)
 
-        return paginated_reviews
+        return {**summary, **page}
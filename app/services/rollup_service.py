@@ -0,0 +1,261 @@
+from sqlalchemy import (
+    ColumnElement,
+    Executable,
+    Select,
+    case,
+    delete,
+    func,
+    insert,
+    select,
+    union_all,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from app.models.models import (
+    Review,
+    ReviewArchive,
+    SentimentAnalysis,
+    SentimentDailyRollup,
+)
+from app.utils.dates import build_epoch_day, epoch_day, epoch_day_start
+from app.utils.variables import SENTIMENT_MAPPING
+
+
+def rollup_day(timestamp: int) -> int:
+    """
+    Converts a review timestamp to its rollup day (days since the Unix epoch),
+    in the calendar of `APP_TIMEZONE` (see `app.utils.dates`).
+
+    Args:
+        timestamp (int): The review timestamp.
+
+    Returns:
+        int: The rollup day.
+    """
+    return epoch_day(timestamp)
+
+
+def normalize_sentiment(sentiment: str) -> str:
+    """
+    Maps the model's sentiment label to the report vocabulary.
+
+    Args:
+        sentiment (str): The label returned by the model (e.g., "Positiva").
+
+    Returns:
+        str: "positive", "negative" or "neutral".
+    """
+    return SENTIMENT_MAPPING.get((sentiment or "").lower(), "neutral")
+
+
+def build_normalized_sentiment(column) -> ColumnElement[str]:
+    """
+    SQL version of `normalize_sentiment`, applied to a sentiment column.
+
+    Args:
+        column: A column holding "positiva"/"negativa"/"neutra" labels, in any
+            case.
+
+    Returns:
+        ColumnElement[str]: "positive", "negative" or "neutral".
+    """
+    return case(
+        *[
+            (func.lower(column) == label, normalized)
+            for label, normalized in SENTIMENT_MAPPING.items()
+        ],
+        else_="neutral",
+    )
+
+
+def build_rollup_statements(
+    dialect_name: str, review: Review, replaced: bool
+) -> list[Executable]:
+    """
+    Builds the statements that keep the daily rollup in sync with an analysis
+    that was just written.
+
+    A new analysis is added with a single `INSERT ... ON CONFLICT DO UPDATE`.
+    When an existing analysis was overwritten, its old values cannot be
+    subtracted from min/max, so the whole day is recomputed instead.
+
+    Args:
+        dialect_name (str): Name of the database dialect ("postgresql", "sqlite").
+        review (Review): The review, with its new `sentiment_analysis` flushed.
+        replaced (bool): Whether a previous analysis was overwritten.
+
+    Returns:
+        list[Executable]: The statements to execute in the analysis transaction.
+    """
+    day = rollup_day(review.review_date)
+
+    if replaced:
+        return build_rebuild_statements(day, day)
+
+    analysis = review.sentiment_analysis
+    score = analysis.score
+    dialect_insert = (
+        postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    )
+    least, greatest = (
+        (func.least, func.greatest)
+        if dialect_name == "postgresql"
+        else (func.min, func.max)
+    )
+
+    statement = dialect_insert(SentimentDailyRollup).values(
+        day=day,
+        sentiment=normalize_sentiment(analysis.sentiment),
+        count=1,
+        score_sum=score,
+        score_min=score,
+        score_max=score,
+    )
+    return [
+        statement.on_conflict_do_update(
+            index_elements=[SentimentDailyRollup.day, SentimentDailyRollup.sentiment],
+            set_={
+                "count": SentimentDailyRollup.count + 1,
+                "score_sum": SentimentDailyRollup.score_sum + score,
+                "score_min": least(SentimentDailyRollup.score_min, score),
+                "score_max": greatest(SentimentDailyRollup.score_max, score),
+            },
+        )
+    ]
+
+
+def build_rebuild_statements(
+    start_day: int | None = None, end_day: int | None = None
+) -> list[Executable]:
+    """
+    Builds the statements that recompute the rollup from the analyses.
+
+    Archived analyses are included, so rebuilding does not drop the days moved
+    to `reviews_archive` from the report summaries.
+
+    Args:
+        start_day (int | None): First day to recompute. None recomputes everything.
+        end_day (int | None): Last day to recompute (inclusive).
+
+    Returns:
+        list[Executable]: A DELETE of the affected days followed by an
+            `INSERT ... SELECT` aggregating the analyses with GROUP BY.
+    """
+    live = select(
+        Review.review_date, SentimentAnalysis.sentiment, SentimentAnalysis.score
+    ).join(SentimentAnalysis, SentimentAnalysis.review_id == Review.id)
+    archived = select(
+        ReviewArchive.review_date,
+        ReviewArchive.analysis_sentiment,
+        ReviewArchive.score,
+    ).filter(ReviewArchive.analysis_sentiment.is_not(None))
+    cleanup = delete(SentimentDailyRollup)
+
+    if start_day is not None:
+        live = live.filter(
+            Review.review_date >= epoch_day_start(start_day),
+            Review.review_date < epoch_day_start(end_day + 1),
+        )
+        archived = archived.filter(
+            ReviewArchive.review_date >= epoch_day_start(start_day),
+            ReviewArchive.review_date < epoch_day_start(end_day + 1),
+        )
+        cleanup = cleanup.filter(
+            SentimentDailyRollup.day >= start_day, SentimentDailyRollup.day <= end_day
+        )
+
+    analyses = union_all(live, archived).subquery("analyses")
+    day_column = build_epoch_day(analyses.c.review_date)
+    sentiment_column = build_normalized_sentiment(analyses.c.sentiment)
+    aggregate = select(
+        day_column,
+        sentiment_column,
+        func.count(),
+        func.sum(analyses.c.score),
+        func.min(analyses.c.score),
+        func.max(analyses.c.score),
+    ).group_by(day_column, sentiment_column)
+
+    return [
+        cleanup,
+        insert(SentimentDailyRollup).from_select(
+            ["day", "sentiment", "count", "score_sum", "score_min", "score_max"],
+            aggregate,
+        ),
+    ]
+
+
+def rebuild_rollup(executor) -> None:
+    """
+    Recomputes the whole rollup table from the stored analyses.
+
+    Args:
+        executor (Session | Connection): Where to execute the statements. The
+            caller is responsible for committing.
+    """
+    for statement in build_rebuild_statements():
+        executor.execute(statement)
+
+
+def build_summary_query(start_timestamp: int, end_timestamp: int) -> Select:
+    """
+    Builds the rollup query behind the report summary.
+
+    Its cost depends on the number of days in the range, not on the number of
+    reviews.
+
+    Args:
+        start_timestamp (int): Start of the range (inclusive).
+        end_timestamp (int): End of the range (inclusive).
+
+    Returns:
+        Select: Count, score sum, min and max per sentiment.
+    """
+    return (
+        select(
+            SentimentDailyRollup.sentiment,
+            func.sum(SentimentDailyRollup.count),
+            func.sum(SentimentDailyRollup.score_sum),
+            func.min(SentimentDailyRollup.score_min),
+            func.max(SentimentDailyRollup.score_max),
+        )
+        .filter(
+            SentimentDailyRollup.day >= rollup_day(start_timestamp),
+            SentimentDailyRollup.day <= rollup_day(end_timestamp),
+        )
+        .group_by(SentimentDailyRollup.sentiment)
+    )
+
+
+def build_summary(rows) -> dict:
+    """
+    Builds the report summary from the rows of `build_summary_query`.
+
+    Args:
+        rows: (sentiment, count, score_sum, score_min, score_max) tuples.
+
+    Returns:
+        dict: Total of analyzed reviews, count per sentiment and score stats.
+    """
+    summary = {"total_reviews": 0, "positive": 0, "negative": 0, "neutral": 0}
+    score_sum = 0.0
+    score_min = score_max = None
+
+    for sentiment, count, sentiment_score_sum, sentiment_min, sentiment_max in rows:
+        summary[sentiment] = summary.get(sentiment, 0) + count
+        summary["total_reviews"] += count
+        score_sum += sentiment_score_sum
+        score_min = (
+            sentiment_min if score_min is None else min(score_min, sentiment_min)
+        )
+        score_max = (
+            sentiment_max if score_max is None else max(score_max, sentiment_max)
+        )
+
+    total = summary["total_reviews"]
+    summary.update(
+        average_score=round(score_sum / total, 4) if total else None,
+        min_score=score_min,
+        max_score=score_max,
+    )
+
+    return summary
@@ -0,0 +1,257 @@
+import re
+from sqlalchemy import (
+    ColumnElement,
+    Executable,
+    Float,
+    Select,
+    cast,
+    column,
+    delete,
+    func,
+    insert,
+    literal_column,
+    select,
+    table,
+    text,
+    tuple_,
+)
+from app.models.models import Review, SentimentAnalysis
+from app.services.rollup_service import build_normalized_sentiment
+
+SEARCH_TABLE = "review_search"
+# Text search configuration of the PostgreSQL index.
+SEARCH_CONFIG = "portuguese"
+# Relative weight of a match in the review text and in the analysis explanation.
+TEXT_WEIGHT = 2.0
+EXPLANATION_WEIGHT = 1.0
+
+# PostgreSQL: one `tsvector` per review, review text weighted "A" and the
+# explanation "B", under a GIN index.
+postgres_search = table(SEARCH_TABLE, column("review_id"), column("document"))
+# SQLite: an FTS5 table whose rowid is the review ID.
+sqlite_search = table(
+    SEARCH_TABLE, column("rowid"), column("review_text"), column("explanation")
+)
+
+SEARCH_DDL = {
+    "postgresql": [
+        f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+        "review_id INTEGER PRIMARY KEY REFERENCES reviews (id) ON DELETE CASCADE, "
+        "document TSVECTOR NOT NULL)",
+        f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_document "
+        f"ON {SEARCH_TABLE} USING GIN (document)",
+    ],
+    "sqlite": [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+        "review_text, explanation, tokenize = 'unicode61 remove_diacritics 2')",
+    ],
+}
+
+SEARCH_WORD = re.compile(r"\w+")
+
+
+def create_search_index(connection) -> None:
+    """
+    Creates the full-text index of the database dialect, if missing.
+
+    It is not part of `Base.metadata`: it is a `tsvector` table with a GIN
+    index on PostgreSQL and an FTS5 virtual table on SQLite.
+
+    Args:
+        connection (Connection): The connection to create it with.
+    """
+    for statement in SEARCH_DDL.get(connection.dialect.name, []):
+        connection.execute(text(statement))
+
+
+def drop_search_index(connection) -> None:
+    """
+    Drops the full-text index, if present.
+    """
+    connection.execute(text(f"DROP TABLE IF EXISTS {SEARCH_TABLE}"))
+
+
+def build_search_index_statements(dialect_name: str, *filters) -> list[Executable]:
+    """
+    Builds the statements that (re)index the reviews matching `filters`.
+
+    Run in the transaction that inserts reviews or writes their analysis, so the
+    index follows every write without a separate job.
+
+    Args:
+        dialect_name (str): Name of the database dialect ("postgresql", "sqlite").
+        *filters: Conditions on `Review` selecting the reviews to index (e.g.,
+            `Review.id.in_(ids)`). None reindexes every review.
+
+    Returns:
+        list[Executable]: A DELETE of their entries followed by an
+            `INSERT ... SELECT` of the review text and analysis explanation.
+    """
+    explanation = func.coalesce(SentimentAnalysis.explanation, "")
+
+    if dialect_name == "postgresql":
+        search = postgres_search
+        columns = ["review_id", "document"]
+        text_vector = func.to_tsvector(SEARCH_CONFIG, Review.review_text)
+        explanation_vector = func.to_tsvector(SEARCH_CONFIG, explanation)
+        values = [
+            Review.id,
+            func.setweight(text_vector, "A").op("||")(
+                func.setweight(explanation_vector, "B")
+            ),
+        ]
+    else:
+        search = sqlite_search
+        columns = ["rowid", "review_text", "explanation"]
+        values = [Review.id, Review.review_text, explanation]
+
+    documents = select(*values).outerjoin(
+        SentimentAnalysis, SentimentAnalysis.review_id == Review.id
+    )
+    if filters:
+        documents = documents.filter(*filters)
+
+    return [
+        build_search_cleanup_statement(dialect_name, *filters),
+        insert(search).from_select(columns, documents),
+    ]
+
+
+def build_search_cleanup_statement(dialect_name: str, *filters) -> Executable:
+    """
+    Builds the DELETE of the index entries of the reviews matching `filters`.
+
+    Run before the reviews themselves are deleted, since the entries are
+    selected through them. Without filters, the whole index is emptied.
+    """
+    if dialect_name == "postgresql":
+        search, key = postgres_search, postgres_search.c.review_id
+    else:
+        search, key = sqlite_search, sqlite_search.c.rowid
+
+    cleanup = delete(search)
+    if filters:
+        cleanup = cleanup.filter(key.in_(select(Review.id).filter(*filters)))
+
+    return cleanup
+
+
+def rebuild_search_index(executor) -> None:
+    """
+    Reindexes every stored review.
+
+    Used as the migration of existing databases and by
+    `python -m app.cli rebuild-search`.
+
+    Args:
+        executor (Session | Connection): Where to execute the statements. The
+            caller is responsible for committing.
+    """
+    dialect = getattr(executor, "dialect", None) or executor.get_bind().dialect
+
+    for statement in build_search_index_statements(dialect.name):
+        executor.execute(statement)
+
+
+def build_fts_query(q: str) -> str | None:
+    """
+    Converts a user query to an FTS5 expression matching every word, by prefix.
+
+    FTS5 has no Portuguese stemmer, so prefixes stand in for it ("demora" also
+    finds "demorado"). Words are quoted, so operators typed by the user are
+    matched as text instead of breaking the query.
+
+    Returns:
+        str | None: The expression, or None when the query has no words.
+    """
+    words = SEARCH_WORD.findall(q)
+    if not words:
+        return None
+
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def build_search_matches(dialect_name: str, q: str) -> Select | None:
+    """
+    Builds the query of the reviews matching `q`, with their rank.
+
+    Ranks are `ts_rank_cd` on PostgreSQL and the negated `bm25` on SQLite, so a
+    higher rank is always a better match. `ts_rank_cd` is a `real`, cast to
+    double precision: the driver reads a `real` as short text ("0.1"), so the
+    rank stored in a cursor would no longer equal the widened `real` it is
+    compared with, and the other reviews tied at that rank would be skipped.
+
+    Args:
+        dialect_name (str): Name of the database dialect ("postgresql", "sqlite").
+        q (str): The search terms, as typed by the user.
+
+    Returns:
+        Select | None: (review_id, rank) rows, or None when nothing can match.
+    """
+    if dialect_name == "postgresql":
+        query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        document = postgres_search.c.document
+        return select(
+            postgres_search.c.review_id.label("review_id"),
+            cast(func.ts_rank_cd(document, query), Float).label("rank"),
+        ).filter(document.op("@@")(query))
+
+    expression = build_fts_query(q)
+    if expression is None:
+        return None
+
+    search_column = literal_column(SEARCH_TABLE)
+    rank = -func.bm25(search_column, TEXT_WEIGHT, EXPLANATION_WEIGHT)
+    matched = search_column.op("MATCH")(expression)
+    return select(sqlite_search.c.rowid.label("review_id"), rank.label("rank")).filter(
+        matched
+    )
+
+
+def build_search_query(matches: Select, *filters) -> Select:
+    """
+    Builds the search results query, best matches first.
+
+    Args:
+        matches (Select): The query built by `build_search_matches`.
+        *filters: Conditions on `Review` and `SentimentAnalysis` (e.g., a date
+            range or a sentiment).
+
+    Returns:
+        Select: The review columns, analysis sentiment and explanation and rank
+            of each match, ordered by (rank, id) descending.
+    """
+    ranked = matches.subquery("matches")
+
+    return (
+        select(
+            Review.id,
+            Review.customer_name,
+            Review.review_date,
+            Review.review_text,
+            SentimentAnalysis.sentiment,
+            SentimentAnalysis.explanation,
+            ranked.c.rank,
+        )
+        .join(ranked, ranked.c.review_id == Review.id)
+        .outerjoin(SentimentAnalysis, SentimentAnalysis.review_id == Review.id)
+        .filter(*filters)
+        .order_by(ranked.c.rank.desc(), Review.id.desc())
+    )
+
+
+def build_search_keyset_filter(
+    query: Select, rank: float, review_id: int
+) -> ColumnElement[bool]:
+    """
+    Builds the condition starting a page of `query` after a (rank, id) pair.
+    """
+    ranked = query.selected_columns
+    return tuple_(ranked.rank, ranked.id) < (rank, review_id)
+
+
+def build_search_sentiment_filter(sentiment: str) -> ColumnElement[bool]:
+    """
+    Selects the reviews analyzed as "positive", "negative" or "neutral".
+    """
+    return build_normalized_sentiment(SentimentAnalysis.sentiment) == sentiment
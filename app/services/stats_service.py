@@ -0,0 +1,249 @@
+from datetime import date, timedelta
+from sqlalchemy import ColumnElement, Select, case, func, select
+from app.models.models import Review, SentimentAnalysis, SentimentEnum
+from app.services.rollup_service import build_normalized_sentiment
+from app.utils.dates import SECONDS_PER_DAY, build_epoch_day
+from app.utils.variables import SENTIMENT_MAPPING
+
+STATS_BUCKETS = ("day", "week", "month")
+STATS_PERCENTILES = (0.25, 0.5, 0.75)
+EPOCH = date(1970, 1, 1)
+# Resolution of the score histogram used for the percentiles outside PostgreSQL.
+SCORE_PRECISION = 2
+
+
+def build_bucket_column(bucket: str, dialect_name: str) -> ColumnElement:
+    """
+    Builds the expression grouping reviews by day, week (Monday to Sunday) or
+    month of their `review_date`, in the calendar of `APP_TIMEZONE` (see
+    `app.utils.dates`).
+
+    Days and weeks are numbered from the Unix epoch; months are "YYYY-MM".
+
+    Args:
+        bucket (str): "day", "week" or "month".
+        dialect_name (str): Name of the database dialect ("postgresql", "sqlite").
+
+    Returns:
+        ColumnElement: The bucket of each review.
+    """
+    day = build_epoch_day(Review.review_date)
+
+    if bucket == "day":
+        return day
+    if bucket == "week":
+        # 1970-01-01 was a Thursday; shifting by 3 days starts weeks on Monday.
+        return (day + 3) // 7
+    # The month of the day's UTC midnight is the month of the review date.
+    if dialect_name == "postgresql":
+        return func.to_char(
+            func.timezone("UTC", func.to_timestamp(day * SECONDS_PER_DAY)), "YYYY-MM"
+        )
+    return func.strftime("%Y-%m", day * SECONDS_PER_DAY, "unixepoch")
+
+
+def bucket_start(bucket: str, value) -> str:
+    """
+    Converts a value of `build_bucket_column` to the first day of its bucket.
+
+    Returns:
+        str: The date in "YYYY-MM-DD" format.
+    """
+    if bucket == "day":
+        return (EPOCH + timedelta(days=value)).isoformat()
+    if bucket == "week":
+        return (EPOCH + timedelta(days=value * 7 - 3)).isoformat()
+    return f"{value}-01"
+
+
+def build_declared_sentiment() -> ColumnElement[str]:
+    """
+    Maps the customer-declared `Review.sentiment` to the report vocabulary.
+    """
+    return case(
+        *[
+            (Review.sentiment == SentimentEnum(label), normalized)
+            for label, normalized in SENTIMENT_MAPPING.items()
+        ],
+        else_="neutral",
+    )
+
+
+def build_stats_query(bucket_column: ColumnElement, *filters) -> Select:
+    """
+    Builds the per bucket and sentiment aggregates of the analyzed reviews.
+
+    Args:
+        bucket_column (ColumnElement): See `build_bucket_column`.
+        *filters: Optional conditions on `Review` (e.g., a date range).
+
+    Returns:
+        Select: (bucket, sentiment, count, score sum, agreements) rows, where
+            agreements counts the reviews whose declared sentiment matches the
+            model's.
+    """
+    sentiment = build_normalized_sentiment(SentimentAnalysis.sentiment)
+    agreements = func.sum(case((build_declared_sentiment() == sentiment, 1), else_=0))
+
+    return (
+        select(
+            bucket_column,
+            sentiment,
+            func.count(),
+            func.sum(SentimentAnalysis.score),
+            agreements,
+        )
+        .join(SentimentAnalysis, SentimentAnalysis.review_id == Review.id)
+        .filter(*filters)
+        .group_by(bucket_column, sentiment)
+    )
+
+
+def build_percentiles_query(
+    bucket_column: ColumnElement, dialect_name: str, *filters
+) -> Select:
+    """
+    Builds the query behind the score percentiles of each bucket.
+
+    PostgreSQL computes them with `percentile_cont`. Other databases return a
+    histogram of the scores rounded to `SCORE_PRECISION` decimals, turned into
+    percentiles by `histogram_percentile`.
+
+    Returns:
+        Select: (bucket, p25, p50, p75) rows on PostgreSQL, (bucket, score,
+            count) rows otherwise.
+    """
+    if dialect_name == "postgresql":
+        columns = [
+            func.percentile_cont(fraction).within_group(SentimentAnalysis.score)
+            for fraction in STATS_PERCENTILES
+        ]
+        group_by = [bucket_column]
+    else:
+        score = func.round(SentimentAnalysis.score, SCORE_PRECISION)
+        columns = [score, func.count()]
+        group_by = [bucket_column, score]
+
+    return (
+        select(bucket_column, *columns)
+        .join(SentimentAnalysis, SentimentAnalysis.review_id == Review.id)
+        .filter(*filters)
+        .group_by(*group_by)
+    )
+
+
+def histogram_percentile(histogram: list[tuple[float, int]], fraction: float) -> float:
+    """
+    Computes a percentile from (value, count) pairs, interpolating like
+    `percentile_cont`.
+
+    Args:
+        histogram (list[tuple[float, int]]): Values and how often they occur.
+        fraction (float): The percentile, from 0 to 1.
+
+    Returns:
+        float: The percentile.
+    """
+    ordered = sorted(histogram)
+    total = sum(count for _, count in ordered)
+    position = (total - 1) * fraction
+    lower_rank, upper_rank = int(position), min(int(position) + 1, total - 1)
+    lower = upper = None
+    seen = 0
+
+    for value, count in ordered:
+        seen += count
+        if lower is None and seen > lower_rank:
+            lower = value
+        if seen > upper_rank:
+            upper = value
+            break
+
+    return lower + (upper - lower) * (position - lower_rank)
+
+
+def build_percentiles(rows, dialect_name: str) -> dict:
+    """
+    Builds the percentiles of each bucket from the rows of
+    `build_percentiles_query`.
+
+    Returns:
+        dict: Bucket value to a {"p25", "p50", "p75"} dict.
+    """
+    names = [f"p{round(fraction * 100)}" for fraction in STATS_PERCENTILES]
+
+    if dialect_name == "postgresql":
+        return {
+            bucket_value: dict(zip(names, (round(value, 4) for value in values)))
+            for bucket_value, *values in rows
+        }
+
+    histograms: dict = {}
+    for bucket_value, score, count in rows:
+        histograms.setdefault(bucket_value, []).append((score, count))
+
+    return {
+        bucket_value: {
+            name: round(histogram_percentile(histogram, fraction), 4)
+            for name, fraction in zip(names, STATS_PERCENTILES)
+        }
+        for bucket_value, histogram in histograms.items()
+    }
+
+
+def build_stats(bucket: str, rows, percentiles: dict) -> dict:
+    """
+    Builds the stats response from the rows of `build_stats_query`.
+
+    Args:
+        bucket (str): "day", "week" or "month".
+        rows: (bucket, sentiment, count, score sum, agreements) tuples.
+        percentiles (dict): The result of `build_percentiles`.
+
+    Returns:
+        dict: The totals of the period and one entry per bucket, oldest first,
+            with the count per sentiment, the mean and percentile scores and the
+            share of reviews whose declared sentiment matches the model's.
+    """
+    buckets: dict = {}
+    totals = {"positive": 0, "negative": 0, "neutral": 0}
+    agreements_total = 0
+
+    for bucket_value, sentiment, count, score_sum, agreements in rows:
+        entry = buckets.setdefault(
+            bucket_value,
+            {"positive": 0, "negative": 0, "neutral": 0, "score_sum": 0.0, "agree": 0},
+        )
+        entry[sentiment] += count
+        entry["score_sum"] += score_sum or 0.0
+        entry["agree"] += agreements
+        totals[sentiment] += count
+        agreements_total += agreements
+
+    items = []
+    for bucket_value in sorted(buckets):
+        entry = buckets[bucket_value]
+        total = entry["positive"] + entry["negative"] + entry["neutral"]
+        items.append(
+            {
+                "start_date": bucket_start(bucket, bucket_value),
+                "total_reviews": total,
+                "positive": entry["positive"],
+                "negative": entry["negative"],
+                "neutral": entry["neutral"],
+                "average_score": round(entry["score_sum"] / total, 4),
+                **percentiles.get(bucket_value, {}),
+                "agreement_rate": round(entry["agree"] / total, 4),
+            }
+        )
+
+    total_reviews = sum(totals.values())
+    return {
+        "bucket": bucket,
+        "total_reviews": total_reviews,
+        **totals,
+        "agreement_rate": (
+            round(agreements_total / total_reviews, 4) if total_reviews else None
+        ),
+        "buckets": items,
+    }
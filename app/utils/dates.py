@@ -0,0 +1,136 @@
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Iterable
+from zoneinfo import ZoneInfo
+from sqlalchemy import ColumnElement
+from .variables import APP_TIMEZONE
+
+SECONDS_PER_DAY = 86400
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Review dates are calendar days, stored as the timestamp of their midnight in
+# APP_TIMEZONE. In UTC a day is `timestamp // SECONDS_PER_DAY`. In any other
+# zone, adding its current UTC offset moves that midnight to the UTC midnight
+# of the same date, give or take a daylight saving hour (or a few, for dates
+# before the zone last moved its offset), so adding half a day on top finds the
+# date without a time zone lookup, in Python and in SQL alike.
+TIMEZONE = ZoneInfo(APP_TIMEZONE)
+IS_UTC = APP_TIMEZONE.upper() in ("UTC", "ETC/UTC")
+DAY_SHIFT = (
+    0
+    if IS_UTC
+    else int(datetime.now(TIMEZONE).utcoffset().total_seconds()) + SECONDS_PER_DAY // 2
+)
+
+
+def day_start(day: date) -> int:
+    """
+    Converts a calendar day to the timestamp of its midnight in APP_TIMEZONE.
+    """
+    if IS_UTC:
+        return (day.toordinal() - EPOCH_ORDINAL) * SECONDS_PER_DAY
+    return int(datetime(day.year, day.month, day.day, tzinfo=TIMEZONE).timestamp())
+
+
+@lru_cache(maxsize=4096)
+def parse_iso_date(value: str) -> int:
+    """
+    Converts a "YYYY-MM-DD" date to the timestamp of its midnight.
+
+    Uses `date.fromisoformat` instead of `datetime.strptime`, and caches the
+    results, since requests and imports repeat the same few dates.
+
+    Args:
+        value (str): The date.
+
+    Raises:
+        ValueError: If the date is not in "YYYY-MM-DD" format.
+        TypeError: If the value is not a string.
+
+    Returns:
+        int: The timestamp.
+    """
+    # `fromisoformat` also accepts "20240601" and week dates; only the extended
+    # format is valid here.
+    if len(value) != 10 or value[4] != "-" or value[7] != "-":
+        raise ValueError(f"Data inválida: {value!r}")
+
+    return day_start(date.fromisoformat(value))
+
+
+def epoch_day(timestamp: int) -> int:
+    """
+    Converts a review timestamp to its day (days since 1970-01-01), following
+    the APP_TIMEZONE convention.
+    """
+    return (timestamp + DAY_SHIFT) // SECONDS_PER_DAY
+
+
+def epoch_day_start(day: int) -> int:
+    """
+    Returns the lowest timestamp whose `epoch_day` is `day`.
+    """
+    return day * SECONDS_PER_DAY - DAY_SHIFT
+
+
+def build_epoch_day(column) -> ColumnElement[int]:
+    """
+    SQL version of `epoch_day`, applied to a timestamp column.
+    """
+    if DAY_SHIFT:
+        return (column + DAY_SHIFT) // SECONDS_PER_DAY
+    return column // SECONDS_PER_DAY
+
+
+@lru_cache(maxsize=65536)
+def format_epoch_day(day: int) -> str:
+    """
+    Formats a day (days since 1970-01-01) as "YYYY/MM/DD".
+
+    Cached per day: a page of reviews holds few distinct days, and the cache
+    covers about 180 years.
+    """
+    value = date.fromordinal(day + EPOCH_ORDINAL)
+    return f"{value.year:04d}/{value.month:02d}/{value.day:02d}"
+
+
+def format_timestamp(timestamp: int) -> str:
+    """
+    Formats a review timestamp as "YYYY/MM/DD".
+    """
+    return format_epoch_day((timestamp + DAY_SHIFT) // SECONDS_PER_DAY)
+
+
+def format_timestamps(timestamps: Iterable[int]) -> list[str]:
+    """
+    Formats the timestamps of a whole page of reviews as "YYYY/MM/DD".
+
+    Each distinct timestamp is converted once per call, and each distinct day
+    once per process.
+
+    Args:
+        timestamps (Iterable[int]): The review timestamps.
+
+    Returns:
+        list[str]: The formatted dates, in order.
+    """
+    formatted: dict[int, str] = {}
+    result = []
+
+    for timestamp in timestamps:
+        value = formatted.get(timestamp)
+        if value is None:
+            value = formatted[timestamp] = format_epoch_day(
+                (timestamp + DAY_SHIFT) // SECONDS_PER_DAY
+            )
+        result.append(value)
+
+    return result
+
+
+def clear_date_caches() -> None:
+    """
+    Empties the parsing and formatting caches (used by the benchmarks).
+    """
+    parse_iso_date.cache_clear()
+    format_epoch_day.cache_clear()
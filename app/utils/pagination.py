@@ -0,0 +1,110 @@
+import base64
+import json
+import math
+from typing import Generic, TypeVar
+from fastapi_pagination import Params
+from sqlalchemy import Select
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class OffsetParams(Params):
+    """
+    `Params` of the page/size pagination, with an opt-out for the total count.
+
+    Attributes:
+        include_total (bool): Whether to run the `COUNT(*)` query behind
+            `total` and `pages`.
+    """
+
+    include_total: bool = True
+
+
+def build_offset_query(query: Select, params: OffsetParams) -> Select:
+    """
+    Restricts a query to the page selected by `params`.
+    """
+    return query.offset((params.page - 1) * params.size).limit(params.size)
+
+
+def build_offset_page(items: list, params: OffsetParams, total: int | None) -> dict:
+    """
+    Builds an offset page with the same fields as `fastapi_pagination.Page`.
+
+    Args:
+        items (list): The serialized items of the page.
+        params (OffsetParams): The requested page and size.
+        total (int | None): Total number of items, None when not counted.
+
+    Returns:
+        dict: Items, total, page, size and number of pages.
+    """
+    return {
+        "items": items,
+        "total": total,
+        "page": params.page,
+        "size": params.size,
+        "pages": math.ceil(total / params.size) if total is not None else None,
+    }
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """
+    A page of the keyset (cursor) pagination.
+
+    Attributes:
+        items (list): The items of the page.
+        size (int): The requested page size.
+        next_cursor (str | None): Token of the next page, None on the last page.
+        total (int | None): Total number of items, None when not requested.
+    """
+
+    items: list[T]
+    size: int
+    next_cursor: str | None = None
+    total: int | None = None
+
+
+def encode_cursor(sort_value: int | float, review_id: int) -> str:
+    """
+    Builds the opaque token pointing right after a review.
+
+    Args:
+        sort_value (int | float): Sort key of the last review of the page: its
+            timestamp, or its rank in search results.
+        review_id (int): ID of the last review of the page.
+
+    Returns:
+        str: URL-safe token to send back as `cursor`.
+    """
+    payload = json.dumps([sort_value, review_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_type: type = int) -> tuple:
+    """
+    Reads a token built by `encode_cursor`.
+
+    Args:
+        cursor (str): The token received from the client.
+        sort_type (type): Type of the sort key, `int` for timestamps or `float`
+            for search ranks (which also accepts integers).
+
+    Raises:
+        ValueError: If the token is malformed.
+
+    Returns:
+        tuple: The sort key and review ID the page starts after.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, review_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (TypeError, ValueError, UnicodeDecodeError):
+        raise ValueError("Cursor inválido.")
+
+    sort_types = (int, float) if sort_type is float else (int,)
+    if type(sort_value) not in sort_types or type(review_id) is not int:
+        raise ValueError("Cursor inválido.")
+
+    return sort_value, review_id
@@ -1,11 +1,17 @@
 from datetime import datetime
+from .dates import TIMEZONE, format_timestamp, parse_iso_date
 from .variables import DATE_FORMAT
 
+ISO_DATE_FORMAT = "%Y-%m-%d"
+
 
 def convert_date_to_timestamp(date: str, format: str = DATE_FORMAT) -> int:
     """
     Converts a date string into a timestamp.
 
+    The date is taken in `APP_TIMEZONE`. "YYYY-MM-DD" dates go through the cached
+    `parse_iso_date`; other formats are parsed with `datetime.strptime`.
+
     Args:
         date (str): The date string to be converted.
         format (str, optional): The format of the date string. Defaults to DATE_FORMAT.
@@ -16,7 +22,10 @@ def convert_date_to_timestamp(date: str, format: str = DATE_FORMAT) -> int:
     Raises:
         ValueError: If the input date does not match the expected format.
     """
-    timestamp = datetime.strptime(date, format).timestamp()
+    if format == ISO_DATE_FORMAT:
+        return parse_iso_date(date)
+
+    timestamp = datetime.strptime(date, format).replace(tzinfo=TIMEZONE).timestamp()
     return int(timestamp)
 
 
@@ -24,10 +33,13 @@ def convert_timestamp_to_date(timestamp: int) -> str:
     """
     Converts a timestamp into a formatted date string.
 
+    See `app.utils.dates.format_timestamp`; pages of reviews should use
+    `format_timestamps`.
+
     Args:
         timestamp (int): The timestamp to be converted.
 
     Returns:
         str: The formatted date string in "YYYY/MM/DD" format.
     """
-    return datetime.fromtimestamp(timestamp).strftime("%Y/%m/%d")
+    return format_timestamp(timestamp)
@@ -1,6 +1,167 @@
-from datetime import datetime
+import os
 
 # ====================== DIRETÓRIOS LOCAIS e DATAS ======================
 DATE_FORMAT = "%Y/%m/%d"
 FULL_DATE_FORMAT = "%Y/%m/%d %H:%M:%S"
-DATE_NOW: str = datetime.now().strftime(FULL_DATE_FORMAT)
+
+# Fuso horário das datas das avaliações: "YYYY-MM-DD" vira a meia-noite deste
+# fuso e os agrupamentos por dia seguem o mesmo calendário. Use o fuso em que os
+# servidores rodavam para manter as datas já gravadas.
+APP_TIMEZONE: str = os.getenv("APP_TIMEZONE", "UTC")
+
+# ====================== BANCO DE DADOS ======================
+DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+# Tempo máximo de cada comando no PostgreSQL, em milissegundos (0 desativa).
+DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+# Aplica `sync_schema` na inicialização da API. Com o gunicorn, a migração roda
+# uma única vez no processo mestre e os workers recebem "false".
+DB_AUTO_MIGRATE: bool = os.getenv("DB_AUTO_MIGRATE", "true").lower() == "true"
+# Intervalo (s) em que o /health reaproveita a última verificação do banco.
+HEALTH_CHECK_INTERVAL: float = float(os.getenv("HEALTH_CHECK_INTERVAL", "5"))
+# Conexões abertas no startup, antes das primeiras requisições (0 desativa).
+DB_POOL_WARMUP: int = int(os.getenv("DB_POOL_WARMUP", "1"))
+
+# ====================== SENTIMENTOS ======================
+SENTIMENT_MAPPING: dict[str, str] = {
+    "positiva": "positive",
+    "negativa": "negative",
+    "neutra": "neutral",
+}
+
+# ====================== FILA DE ANÁLISE DE SENTIMENTOS ======================
+ANALYSIS_WORKERS: int = int(os.getenv("ANALYSIS_WORKERS", "2"))
+ANALYSIS_BATCH_SIZE: int = int(os.getenv("ANALYSIS_BATCH_SIZE", "10"))
+ANALYSIS_POLL_INTERVAL: float = float(os.getenv("ANALYSIS_POLL_INTERVAL", "1.0"))
+ANALYSIS_MAX_ATTEMPTS: int = int(os.getenv("ANALYSIS_MAX_ATTEMPTS", "5"))
+ANALYSIS_BACKOFF_BASE: float = float(os.getenv("ANALYSIS_BACKOFF_BASE", "2.0"))
+ANALYSIS_BACKOFF_MAX: float = float(os.getenv("ANALYSIS_BACKOFF_MAX", "300"))
+ANALYSIS_LEASE_SECONDS: int = int(os.getenv("ANALYSIS_LEASE_SECONDS", "120"))
+
+# ============ ANÁLISE EM LOTE (UMA CHAMADA, VÁRIAS AVALIAÇÕES) ============
+ANALYSIS_PROMPT_BATCH_SIZE: int = int(os.getenv("ANALYSIS_PROMPT_BATCH_SIZE", "10"))
+ANALYSIS_PROMPT_TOKEN_BUDGET: int = int(
+    os.getenv("ANALYSIS_PROMPT_TOKEN_BUDGET", "2000")
+)
+
+# ====================== ORÇAMENTO DE TOKENS POR AVALIAÇÃO ======================
+# Tokens (estimados) de cada avaliação enviados ao modelo; nas maiores, o meio
+# do texto é cortado, mantendo o início e o fim. 0 envia o texto inteiro.
+ANALYSIS_INPUT_TOKEN_BUDGET: int = int(os.getenv("ANALYSIS_INPUT_TOKEN_BUDGET", "1000"))
+# Máximo de tokens da resposta por avaliação (multiplicado pelo tamanho do
+# lote); 0 desativa o limite.
+LLM_MAX_TOKENS_PER_REVIEW: int = int(os.getenv("LLM_MAX_TOKENS_PER_REVIEW", "400"))
+
+# ====================== MOTOR DE ANÁLISE ======================
+# "llm", "local" ou "local_then_llm" (léxico local, escalando ao LLM quando a
+# confiança fica abaixo de ANALYSIS_LOCAL_MIN_CONFIDENCE).
+ANALYSIS_ENGINE: str = os.getenv("ANALYSIS_ENGINE", "llm").lower()
+ANALYSIS_LOCAL_MIN_CONFIDENCE: float = float(
+    os.getenv("ANALYSIS_LOCAL_MIN_CONFIDENCE", "0.6")
+)
+
+# ====================== IMPORTAÇÃO EM LOTE ======================
+BULK_INSERT_CHUNK_SIZE: int = int(os.getenv("BULK_INSERT_CHUNK_SIZE", "500"))
+
+# ====================== IDEMPOTÊNCIA E DEDUPLICAÇÃO ======================
+IDEMPOTENCY_KEY_HEADER: str = "Idempotency-Key"
+IDEMPOTENCY_KEY_MAX_LENGTH: int = 255
+# Quando ativo, o POST /reviews/ devolve a avaliação já gravada com o mesmo
+# cliente, data e texto em vez de criar (e analisar) outra.
+REVIEW_DEDUP_ENABLED: bool = (
+    os.getenv("REVIEW_DEDUP_ENABLED", "false").lower() == "true"
+)
+
+# ====================== CACHE DE ANÁLISES ======================
+ANALYSIS_CACHE_MAX_SIZE: int = int(os.getenv("ANALYSIS_CACHE_MAX_SIZE", "10000"))
+ANALYSIS_CACHE_TTL: int = int(os.getenv("ANALYSIS_CACHE_TTL", "3600"))
+ANALYSIS_CACHE_PERSISTENT: bool = (
+    os.getenv("ANALYSIS_CACHE_PERSISTENT", "false").lower() == "true"
+)
+ANALYSIS_CACHE_PERSISTENT_TTL: int = int(
+    os.getenv("ANALYSIS_CACHE_PERSISTENT_TTL", str(30 * 24 * 3600))
+)
+
+# ====================== MODO ASSÍNCRONO ======================
+ASYNC_MODE: bool = os.getenv("ASYNC_MODE", "false").lower() == "true"
+
+# ====================== EXPORTAÇÃO DE RELATÓRIOS ======================
+EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+# ====================== CACHE DE RESPOSTAS ======================
+RESPONSE_CACHE_ENABLED: bool = (
+    os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+)
+RESPONSE_CACHE_TTL: int = int(os.getenv("RESPONSE_CACHE_TTL", "30"))
+RESPONSE_CACHE_MAX_SIZE: int = int(os.getenv("RESPONSE_CACHE_MAX_SIZE", "1000"))
+# Vazio usa o cache em memória de cada processo; "redis://..." compartilha o
+# cache entre workers e réplicas.
+RESPONSE_CACHE_URL: str = os.getenv("RESPONSE_CACHE_URL", "")
+
+# ====================== LIMITES DE CHAMADAS AO LLM ======================
+# Chamadas simultâneas ao modelo por processo.
+LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+# Chamadas por segundo (balde de tokens) e rajada máxima; 0 desativa o limite.
+LLM_RATE_LIMIT: float = float(os.getenv("LLM_RATE_LIMIT", "5"))
+LLM_RATE_BURST: int = int(os.getenv("LLM_RATE_BURST", "10"))
+# Tempo máximo (s) que uma análise repetida espera pela chamada em andamento.
+ANALYSIS_INFLIGHT_TIMEOUT: float = float(os.getenv("ANALYSIS_INFLIGHT_TIMEOUT", "120"))
+
+# ====================== RESILIÊNCIA DO CLIENTE DO LLM ======================
+# Endereço da API compatível com OpenAI; os benchmarks apontam para um servidor
+# falso local (benchmarks/fake_llm.py).
+MARITACA_BASE_URL: str = os.getenv("MARITACA_BASE_URL", "https://chat.maritaca.ai/api")
+# Tempo máximo (s) de cada tentativa e da conexão com a Maritaca.
+LLM_TIMEOUT: float = float(os.getenv("LLM_TIMEOUT", "20"))
+LLM_CONNECT_TIMEOUT: float = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+# Cria o cliente do LLM no startup, e não na primeira análise.
+LLM_CLIENT_WARMUP: bool = os.getenv("LLM_CLIENT_WARMUP", "true").lower() == "true"
+# Novas tentativas em erros transitórios (timeout, conexão, 429, 5xx), com
+# backoff exponencial e jitter, sem ultrapassar LLM_DEADLINE segundos no total.
+LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BACKOFF: float = float(os.getenv("LLM_RETRY_BACKOFF", "0.5"))
+LLM_DEADLINE: float = float(os.getenv("LLM_DEADLINE", "60"))
+# Falhas seguidas que abrem o circuito e tempo (s) até uma nova tentativa.
+LLM_BREAKER_FAILURES: int = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+LLM_BREAKER_RESET: float = float(os.getenv("LLM_BREAKER_RESET", "30"))
+# Com o LLM indisponível, grava a análise do léxico local como "degraded" e
+# agenda uma nova análise pelo LLM após ANALYSIS_DEGRADED_RETRY_DELAY segundos.
+ANALYSIS_DEGRADED_FALLBACK: bool = (
+    os.getenv("ANALYSIS_DEGRADED_FALLBACK", "true").lower() == "true"
+)
+ANALYSIS_DEGRADED_RETRY_DELAY: int = int(
+    os.getenv("ANALYSIS_DEGRADED_RETRY_DELAY", "300")
+)
+
+# ================= REANÁLISE (TROCA DE MODELO OU DE PROMPT) =================
+# Lotes enviados ao LLM em paralelo e avaliações por lote do comando `reanalyze`.
+REANALYSIS_CONCURRENCY: int = int(os.getenv("REANALYSIS_CONCURRENCY", "2"))
+REANALYSIS_BATCH_SIZE: int = int(os.getenv("REANALYSIS_BATCH_SIZE", "20"))
+# Avaliações reanalisadas por segundo, abaixo de LLM_RATE_LIMIT para deixar a
+# cota do LLM ao tráfego ao vivo; 0 desativa o limite.
+REANALYSIS_RATE_LIMIT: float = float(os.getenv("REANALYSIS_RATE_LIMIT", "2"))
+# Pausa (s) quando o LLM está indisponível ou a fila de análises tem pendências.
+REANALYSIS_PAUSE: float = float(os.getenv("REANALYSIS_PAUSE", "30"))
+# Espera a fila de análises esvaziar antes de cada página da reanálise.
+REANALYSIS_YIELD_TO_QUEUE: bool = (
+    os.getenv("REANALYSIS_YIELD_TO_QUEUE", "true").lower() == "true"
+)
+
+# ====================== RETENÇÃO E ARQUIVO ======================
+# Meses mantidos na tabela `reviews`, além do mês atual, pelo comando
+# `archive-reviews`; avaliações mais antigas vão para `reviews_archive`.
+REVIEWS_RETENTION_MONTHS: int = int(os.getenv("REVIEWS_RETENTION_MONTHS", "24"))
+# Avaliações movidas por transação.
+ARCHIVE_BATCH_SIZE: int = int(os.getenv("ARCHIVE_BATCH_SIZE", "1000"))
+
+# ====================== MÉTRICAS ======================
+# Expõe GET /metrics (formato Prometheus) e mede as requisições e as etapas do
+# processamento; "false" remove o endpoint e o custo das medições.
+METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+# Preço (R$) por milhão de tokens de entrada e de saída, para estimar o custo
+# das chamadas ao modelo.
+LLM_PROMPT_TOKEN_PRICE: float = float(os.getenv("LLM_PROMPT_TOKEN_PRICE", "5"))
+LLM_COMPLETION_TOKEN_PRICE: float = float(os.getenv("LLM_COMPLETION_TOKEN_PRICE", "15"))
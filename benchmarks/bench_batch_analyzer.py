@@ -0,0 +1,87 @@
+"""
+Benchmark of the single-review and the batched sentiment analysis modes.
+
+The same reviews (taken from reviews.json and repeated up to --reviews) are
+analyzed once per mode, bypassing the analysis cache, and the tokens and
+latency per review of each mode are reported. It calls the real model, so it
+needs MARITACA_API_KEY and consumes credits.
+
+    python -m benchmarks.bench_batch_analyzer --reviews 50 --output batch.json
+"""
+
+import argparse
+import json
+import os
+import time
+from app.services import ai_service
+from app.services.ai_service import analysis_usage, pack_batches
+from benchmarks.common import PROJECT_ROOT, write_results
+
+
+def load_review_texts(count: int) -> list[str]:
+    with open(os.path.join(PROJECT_ROOT, "reviews.json"), encoding="utf-8") as file:
+        texts = [review["review_text"] for review in json.load(file)["reviews"]]
+
+    return [texts[index % len(texts)] for index in range(count)]
+
+
+def run_single(texts: list[str]) -> float:
+    started = time.perf_counter()
+    for review_text in texts:
+        ai_service._request_sentiment_analysis(review_text)
+    return time.perf_counter() - started
+
+
+def run_batch(texts: list[str], max_reviews: int, token_budget: int) -> float:
+    started = time.perf_counter()
+    for batch in pack_batches(texts, max_reviews, token_budget):
+        batch_texts = [texts[position] for position in batch]
+        if len(batch_texts) == 1:
+            ai_service._request_sentiment_analysis(batch_texts[0])
+            continue
+
+        analyses = ai_service._request_batch_sentiment_analysis(batch_texts)
+        for position, review_text in enumerate(batch_texts):
+            if position not in analyses:
+                analysis_usage.record_fallback()
+                ai_service._request_sentiment_analysis(review_text)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reviews", type=int, default=50)
+    parser.add_argument(
+        "--batch-size", type=int, default=ai_service.ANALYSIS_PROMPT_BATCH_SIZE
+    )
+    parser.add_argument(
+        "--token-budget", type=int, default=ai_service.ANALYSIS_PROMPT_TOKEN_BUDGET
+    )
+    parser.add_argument("--output", help="JSON file to write the results to")
+    args = parser.parse_args()
+
+    texts = load_review_texts(args.reviews)
+    single_elapsed = run_single(texts)
+    batch_elapsed = run_batch(texts, args.batch_size, args.token_budget)
+
+    write_results(
+        "batch_analyzer",
+        {
+            "parameters": {
+                "reviews": args.reviews,
+                "batch_size": args.batch_size,
+                "token_budget": args.token_budget,
+                "model": ai_service.MODEL_NAME,
+            },
+            "elapsed_seconds": {
+                "single": round(single_elapsed, 3),
+                "batch": round(batch_elapsed, 3),
+            },
+            "usage": analysis_usage.stats(),
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
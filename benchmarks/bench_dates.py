@@ -0,0 +1,129 @@
+"""
+Micro-benchmark of the date parsing and formatting helpers.
+
+Parses and formats the dates of `--rows` reviews spread over `--days` distinct
+days, the way the code used to (`datetime.strptime` and
+`datetime.fromtimestamp(...).strftime` per value) and with `app.utils.dates`
+(`parse_iso_date`, `format_timestamp` per value and `format_timestamps` per
+page). The cached helpers are timed with cold caches (emptied before every run)
+and warm ones:
+
+    python -m benchmarks.bench_dates --rows 100000 --days 730
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime
+from typing import Callable
+from app.utils.dates import (
+    clear_date_caches,
+    format_timestamp,
+    format_timestamps,
+    parse_iso_date,
+)
+from benchmarks.common import write_results
+
+# First day of the generated dates.
+START_DATE = datetime(2023, 1, 1)
+
+
+def legacy_parse(values: list[str]) -> list[int]:
+    return [int(datetime.strptime(value, "%Y-%m-%d").timestamp()) for value in values]
+
+
+def legacy_format(timestamps: list[int]) -> list[str]:
+    return [
+        datetime.fromtimestamp(timestamp).strftime("%Y/%m/%d")
+        for timestamp in timestamps
+    ]
+
+
+def fast_parse(values: list[str]) -> list[int]:
+    return [parse_iso_date(value) for value in values]
+
+
+def fast_format(timestamps: list[int]) -> list[str]:
+    return [format_timestamp(timestamp) for timestamp in timestamps]
+
+
+def generate_dates(rows: int, days: int, seed: int) -> tuple[list[str], list[int]]:
+    """
+    Generates review dates spread over `days` days, as strings and timestamps.
+    """
+    generator = random.Random(seed)
+    offsets = [generator.randrange(days) for _ in range(rows)]
+    ordinal = START_DATE.toordinal()
+    values = [
+        datetime.fromordinal(ordinal + offset).strftime("%Y-%m-%d")
+        for offset in offsets
+    ]
+    return values, fast_parse(values)
+
+
+def measure(function: Callable, data: list, repeats: int, cold: bool) -> dict:
+    """
+    Measures the mean CPU time per row of `function` over `data`.
+    """
+    total = 0.0
+    if not cold:
+        function(data)
+
+    for _ in range(repeats):
+        if cold:
+            clear_date_caches()
+        started = time.process_time()
+        function(data)
+        total += time.process_time() - started
+
+    return {"cpu_us_per_row": round(total / repeats / len(data) * 1e6, 3)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="JSON file to write the results to")
+    args = parser.parse_args()
+
+    values, timestamps = generate_dates(args.rows, args.days, args.seed)
+    scenarios = {
+        "parse": (values, legacy_parse, {"parse_iso_date": fast_parse}),
+        "format": (
+            timestamps,
+            legacy_format,
+            {"format_timestamp": fast_format, "format_timestamps": format_timestamps},
+        ),
+    }
+
+    results = {}
+    for scenario, (data, legacy, helpers) in scenarios.items():
+        results[scenario] = {"legacy": measure(legacy, data, args.repeats, cold=True)}
+        for name, function in helpers.items():
+            for cache in ("cold", "warm"):
+                measured = measure(function, data, args.repeats, cache == "cold")
+                measured["speedup"] = round(
+                    results[scenario]["legacy"]["cpu_us_per_row"]
+                    / measured["cpu_us_per_row"],
+                    2,
+                )
+                results[scenario][f"{name}_{cache}"] = measured
+
+    write_results(
+        "dates",
+        {
+            "parameters": {
+                "rows": args.rows,
+                "days": args.days,
+                "repeats": args.repeats,
+            },
+            "results": results,
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Benchmark of the CPU and memory spent per row building large listing and
+report pages.
+
+Each page is produced twice: the way the endpoints used to (ORM objects with the
+analysis eagerly loaded, a Pydantic model per item, `jsonable_encoder` over the
+whole page, then `json.dumps`) and the way they do now (only the needed columns
+as plain rows, dicts, `encode_json`). The fetch, build and encode stages are
+timed separately with `time.process_time`, and a second run under `tracemalloc`
+records the peak memory of the whole page:
+
+    python -m benchmarks.bench_serialization --rows 10000 --page-size 10000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, joinedload
+from app.database.migrations import sync_schema
+from app.models.models import Review
+from app.services.response_cache import encode_json, orjson
+from app.services.reviews_service import (
+    ReviewOut,
+    build_all_reviews_query,
+    build_report_query,
+    serialize_listing_rows,
+    transform_report_rows,
+)
+from app.services.rollup_service import normalize_sentiment
+from app.utils.pagination import OffsetParams, build_offset_page, build_offset_query
+from app.utils.dates import clear_date_caches
+from benchmarks.common import write_results
+from benchmarks.generate_data import seed_reviews
+
+# Wide enough to hold every seeded review.
+REPORT_RANGE = (0, 2**31 - 1)
+
+
+def legacy_json(payload) -> bytes:
+    return json.dumps(
+        jsonable_encoder(payload),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def legacy_listing(session: Session, params: OffsetParams) -> tuple:
+    query = select(Review).order_by(Review.review_date.desc(), Review.id.desc())
+    reviews = session.scalars(build_offset_query(query, params)).all()
+
+    def build():
+        items = [
+            ReviewOut(
+                id=review.id,
+                customer_name=review.customer_name,
+                review_date=review.review_date,
+                review_text=review.review_text,
+                sentiment=review.sentiment.value,
+            )
+            for review in reviews
+        ]
+        return build_offset_page(items, params, None)
+
+    return reviews, build, legacy_json
+
+
+def legacy_report(session: Session, params: OffsetParams) -> tuple:
+    query = (
+        select(Review)
+        .options(joinedload(Review.sentiment_analysis))
+        .filter(Review.review_date.between(*REPORT_RANGE))
+        .order_by(Review.review_date.desc(), Review.id.desc())
+    )
+    reviews = session.scalars(build_offset_query(query, params)).unique().all()
+
+    def build():
+        items = []
+        for review in reviews:
+            analysis = review.sentiment_analysis
+            items.append(
+                {
+                    "id": review.id,
+                    "customer_name": review.customer_name,
+                    "review_date": datetime.fromtimestamp(review.review_date).strftime(
+                        "%Y/%m/%d"
+                    ),
+                    "review_text": review.review_text,
+                    "analysis_status": review.analysis_status.value,
+                    "sentiment": (
+                        normalize_sentiment(analysis.sentiment) if analysis else None
+                    ),
+                    "score": analysis.score if analysis else None,
+                    "keywords": analysis.keywords if analysis else None,
+                    "explanation": analysis.explanation if analysis else None,
+                }
+            )
+        return build_offset_page(items, params, None)
+
+    return reviews, build, legacy_json
+
+
+def lean_listing(session: Session, params: OffsetParams) -> tuple:
+    rows = session.execute(build_offset_query(build_all_reviews_query(), params)).all()
+
+    def build():
+        return build_offset_page(serialize_listing_rows(rows), params, None)
+
+    return rows, build, encode_json
+
+
+def lean_report(session: Session, params: OffsetParams) -> tuple:
+    query = build_offset_query(build_report_query(*REPORT_RANGE), params)
+    rows = session.execute(query).all()
+
+    def build():
+        return build_offset_page(transform_report_rows(rows), params, None)
+
+    return rows, build, encode_json
+
+
+PATHS = {
+    "listing": {"legacy": legacy_listing, "lean": lean_listing},
+    "report": {"legacy": legacy_report, "lean": lean_report},
+}
+
+
+def run_page(engine, path: Callable, params: OffsetParams) -> tuple[dict, int]:
+    """
+    Produces one page, timing each stage in CPU seconds.
+
+    Returns:
+        tuple[dict, int]: The CPU seconds per stage and the number of rows.
+    """
+    clear_date_caches()
+
+    with Session(engine) as session:
+        started = time.process_time()
+        rows, build, encode = path(session, params)
+        fetched = time.process_time()
+        page = build()
+        built = time.process_time()
+        encode(page)
+        encoded = time.process_time()
+
+    return {
+        "fetch": fetched - started,
+        "build": built - fetched,
+        "encode": encoded - built,
+    }, len(rows)
+
+
+def measure(engine, path: Callable, params: OffsetParams, repeats: int) -> dict:
+    """
+    Measures the mean CPU time per row of each stage and the peak memory per row.
+    """
+    totals = {"fetch": 0.0, "build": 0.0, "encode": 0.0}
+    rows = 0
+    for _ in range(repeats):
+        stages, rows = run_page(engine, path, params)
+        for stage, seconds in stages.items():
+            totals[stage] += seconds
+
+    tracemalloc.start()
+    run_page(engine, path, params)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    per_row = {
+        f"{stage}_us_per_row": round(seconds / repeats / rows * 1e6, 3)
+        for stage, seconds in totals.items()
+    }
+    return {
+        "rows": rows,
+        **per_row,
+        "cpu_us_per_row": round(sum(per_row.values()), 3),
+        "peak_bytes_per_row": round(peak / rows),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--page-size", type=int, default=10000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--output", help="JSON file to write the results to")
+    args = parser.parse_args()
+
+    database_url = args.database_url or (
+        f"sqlite:///{tempfile.mkdtemp()}/bench_serialization.db"
+    )
+    engine = create_engine(database_url)
+    sync_schema(engine)
+    seed_reviews(engine, args.rows)
+    # Bypasses the size limit of the endpoints, to build pages of any size.
+    params = OffsetParams.model_construct(
+        page=1, size=args.page_size, include_total=False
+    )
+
+    results = {}
+    try:
+        for endpoint, paths in PATHS.items():
+            results[endpoint] = {
+                name: measure(engine, path, params, args.repeats)
+                for name, path in paths.items()
+            }
+            legacy, lean = results[endpoint]["legacy"], results[endpoint]["lean"]
+            results[endpoint]["cpu_speedup"] = round(
+                legacy["cpu_us_per_row"] / lean["cpu_us_per_row"], 2
+            )
+    finally:
+        engine.dispose()
+
+    write_results(
+        "serialization",
+        {
+            "parameters": {
+                "rows": args.rows,
+                "page_size": args.page_size,
+                "repeats": args.repeats,
+                "database": engine.dialect.name,
+                "encoder": "orjson" if orjson is not None else "json",
+            },
+            "results": results,
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+import httpx
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """
+    Computes a percentile with linear interpolation.
+
+    Args:
+        values (list[float]): The samples.
+        pct (float): The percentile, from 0 to 100.
+
+    Returns:
+        float: The percentile value, or 0.0 when there are no samples.
+    """
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize_latencies(
+    latencies: list[float], elapsed: float, errors: int = 0
+) -> dict:
+    """
+    Summarizes request latencies (in seconds) of a load scenario.
+
+    Args:
+        latencies (list[float]): Latency of each successful request.
+        elapsed (float): Wall-clock duration of the scenario.
+        errors (int): Number of failed requests.
+
+    Returns:
+        dict: Throughput and latency percentiles in milliseconds.
+    """
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_second": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(max(latencies, default=0.0) * 1000, 3),
+    }
+
+
+def environment_metadata() -> dict:
+    """
+    Describes where a benchmark ran, so results can be compared between commits.
+
+    Returns:
+        dict: Git commit, Python version, platform and timestamp.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def write_results(name: str, results: dict, output: str | None = None) -> None:
+    """
+    Prints benchmark results as JSON and optionally writes them to a file.
+
+    Args:
+        name (str): Name of the benchmark.
+        results (dict): The benchmark results.
+        output (str | None): Path of the JSON file to write.
+    """
+    document = {"benchmark": name, "environment": environment_metadata(), **results}
+    text = json.dumps(document, indent=2, ensure_ascii=False)
+    print(text)
+
+    if output:
+        with open(output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+
+
+def start_server(port: int, env: dict) -> subprocess.Popen:
+    """
+    Starts the API with uvicorn in a subprocess and waits until it answers.
+
+    Args:
+        port (int): The port to listen on.
+        env (dict): Extra environment variables (DATABASE_URL, ASYNC_MODE...).
+
+    Returns:
+        subprocess.Popen: The server process.
+    """
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        cwd=PROJECT_ROOT,
+        env={**os.environ, **env},
+    )
+
+    return wait_until_ready(process, f"http://127.0.0.1:{port}/")
+
+
+def start_fake_llm(port: int, **options) -> subprocess.Popen:
+    """
+    Starts `benchmarks.fake_llm` in a subprocess and waits until it answers.
+
+    Args:
+        port (int): The port to listen on.
+        **options: Options of the fake server, e.g. `latency_ms=400` or
+            `error_rate=0.02`.
+
+    Returns:
+        subprocess.Popen: The server process.
+    """
+    arguments = [
+        argument
+        for name, value in options.items()
+        if value is not None
+        for argument in (f"--{name.replace('_', '-')}", str(value))
+    ]
+    process = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.fake_llm", "--port", str(port), *arguments],
+        cwd=PROJECT_ROOT,
+    )
+
+    return wait_until_ready(process, f"http://127.0.0.1:{port}/stats")
+
+
+def wait_until_ready(process: subprocess.Popen, url: str) -> subprocess.Popen:
+    """
+    Polls `url` until the server started in `process` answers.
+
+    Raises:
+        RuntimeError: If it does not answer in 30 seconds.
+    """
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(url, timeout=1)
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+
+    process.terminate()
+    raise RuntimeError("O servidor não respondeu em 30 segundos.")
@@ -0,0 +1,104 @@
+"""
+Compares two result files of the same benchmark, e.g. from two commits.
+
+Every latency percentile, throughput and per-row cost found in both files is
+listed with its relative change; changes worse than `--threshold` percent are
+flagged and make the command exit with status 1, so it can gate a CI job:
+
+    python -m benchmarks.compare main.json branch.json --threshold 10
+"""
+
+import argparse
+import json
+import sys
+from typing import Iterator
+
+# Metrics compared, and whether a higher value is better.
+METRICS = {
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+    "requests_per_second": True,
+    "analyses_per_second": True,
+    "cpu_us_per_row": False,
+    "peak_bytes_per_row": False,
+}
+
+
+def iter_metrics(results: dict, path: str = "") -> Iterator[tuple[str, str, float]]:
+    for name, value in results.items():
+        if isinstance(value, dict):
+            yield from iter_metrics(value, f"{path}{name}.")
+        elif name in METRICS and isinstance(value, (int, float)):
+            yield path.rstrip("."), name, value
+
+
+def compare(base: dict, head: dict, threshold: float) -> list[dict]:
+    """
+    Lists the metrics present in both results and their relative change.
+
+    Args:
+        base (dict): The reference results.
+        head (dict): The results being checked.
+        threshold (float): Worsening, in percent, flagged as a regression.
+
+    Returns:
+        list[dict]: One row per metric, with "regression" set when it got worse
+            by more than `threshold` percent.
+    """
+    head_metrics = {
+        (scenario, metric): value
+        for scenario, metric, value in iter_metrics(head.get("results", {}))
+    }
+    rows = []
+
+    for scenario, metric, base_value in iter_metrics(base.get("results", {})):
+        head_value = head_metrics.get((scenario, metric))
+        if head_value is None or not base_value:
+            continue
+
+        change = (head_value - base_value) / base_value * 100
+        worsening = -change if METRICS[metric] else change
+        rows.append(
+            {
+                "scenario": scenario,
+                "metric": metric,
+                "base": base_value,
+                "head": head_value,
+                "change_pct": round(change, 2),
+                "regression": worsening > threshold,
+            }
+        )
+
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=10.0)
+    args = parser.parse_args()
+
+    with open(args.base, encoding="utf-8") as file:
+        base = json.load(file)
+    with open(args.head, encoding="utf-8") as file:
+        head = json.load(file)
+
+    print(
+        f"{base['benchmark']}: {base['environment']['commit']} -> "
+        f"{head['environment']['commit']}"
+    )
+    rows = compare(base, head, args.threshold)
+    for row in rows:
+        flag = "  REGRESSÃO" if row["regression"] else ""
+        print(
+            f"{row['scenario']:<40} {row['metric']:<20} {row['base']:>12} "
+            f"{row['head']:>12} {row['change_pct']:>+8.2f}%{flag}"
+        )
+
+    sys.exit(1 if any(row["regression"] for row in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Local stand-in for the Maritaca chat completions endpoint, used by the benchmarks.
+
+It answers the single and the batched analysis prompts with well-formed
+structured outputs after a configurable latency, and fails a configurable share
+of the calls with 500s or 429s. Point the API at it with MARITACA_BASE_URL:
+
+    python -m benchmarks.fake_llm --port 8799 --latency-ms 400 --jitter-ms 200 \\
+        --error-rate 0.02 --rate-limit-rate 0.01
+    MARITACA_BASE_URL=http://127.0.0.1:8799 uvicorn app.main:app
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+# Mirrors the output of the real model closely enough for the parsers.
+ANALYSES = {
+    "positiva": (0.8, ["atendimento rápido", "problema resolvido"]),
+    "negativa": (-0.7, ["demora no atendimento", "problema não resolvido"]),
+    "neutra": (0.0, ["atendimento regular"]),
+}
+
+REVIEW_NUMBER = re.compile(r"^\[(\d+)\]\s*", re.MULTILINE)
+
+
+def fake_analysis(review_text: str) -> dict:
+    """
+    Builds a deterministic analysis of a review, so repeated runs agree.
+    """
+    digest = hashlib.sha256(review_text.encode("utf-8")).digest()
+    sentiment = list(ANALYSES)[digest[0] % len(ANALYSES)]
+    score, keywords = ANALYSES[sentiment]
+
+    return {
+        "sentiment": sentiment,
+        "score": score,
+        "keywords": keywords,
+        "explanation": "Análise gerada pelo servidor falso dos benchmarks.",
+    }
+
+
+def build_content(messages: list[dict], response_format: dict) -> dict:
+    """
+    Answers a single analysis, or a batch when the schema asks for "results".
+    """
+    user_content = next(
+        (message["content"] for message in messages if message["role"] == "user"), ""
+    )
+    schema = response_format.get("json_schema", {}).get("schema", {})
+
+    if "results" not in schema.get("properties", {}):
+        return fake_analysis(user_content)
+
+    parts = REVIEW_NUMBER.split(user_content)[1:]
+    return {
+        "results": [
+            {"index": int(number), **fake_analysis(text.strip())}
+            for number, text in zip(parts[::2], parts[1::2])
+        ]
+    }
+
+
+def create_app(
+    latency_ms: float = 300,
+    jitter_ms: float = 100,
+    error_rate: float = 0.0,
+    rate_limit_rate: float = 0.0,
+    seed: int | None = None,
+) -> FastAPI:
+    """
+    Builds the fake server.
+
+    Args:
+        latency_ms (float): Mean latency of a call, in milliseconds.
+        jitter_ms (float): Maximum deviation from the mean latency.
+        error_rate (float): Share of the calls answered with a 500.
+        rate_limit_rate (float): Share of the calls answered with a 429.
+        seed (int | None): Seed of the latency and error draws.
+
+    Returns:
+        FastAPI: The app, also exposing its counters at GET /stats.
+    """
+    app = FastAPI()
+    rng = random.Random(seed)
+    counters = {"calls": 0, "errors": 0, "rate_limited": 0}
+
+    @app.post("/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        counters["calls"] += 1
+
+        delay = max(0.0, latency_ms + rng.uniform(-jitter_ms, jitter_ms)) / 1000
+        await asyncio.sleep(delay)
+
+        draw = rng.random()
+        if draw < error_rate:
+            counters["errors"] += 1
+            return JSONResponse(
+                {"error": {"message": "Falha simulada.", "type": "server_error"}},
+                status_code=500,
+            )
+        if draw < error_rate + rate_limit_rate:
+            counters["rate_limited"] += 1
+            return JSONResponse(
+                {"error": {"message": "Limite simulado.", "type": "rate_limit"}},
+                status_code=429,
+                headers={"retry-after": "1"},
+            )
+
+        content = json.dumps(
+            build_content(body["messages"], body.get("response_format", {})),
+            ensure_ascii=False,
+        )
+        prompt_chars = sum(len(message["content"]) for message in body["messages"])
+
+        return {
+            "id": f"fake-{counters['calls']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body["model"],
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_chars // 4,
+                "completion_tokens": len(content) // 4,
+                "total_tokens": (prompt_chars + len(content)) // 4,
+            },
+        }
+
+    @app.get("/stats")
+    def get_stats() -> dict:
+        return counters
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--jitter-ms", type=float, default=100)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    app = create_app(
+        args.latency_ms,
+        args.jitter_ms,
+        args.error_rate,
+        args.rate_limit_rate,
+        args.seed,
+    )
+    uvicorn.run(app, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Production server profile: `gunicorn -c gunicorn.conf.py app.main:app`.
+
+Runs uvicorn workers under gunicorn, one per CPU core by default. The schema
+is synchronized once, in the master process, before the workers are forked, so
+replicas of the app do not race to run the same migration.
+"""
+
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", str(multiprocessing.cpu_count())))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+# Recycles workers periodically, with jitter so they do not restart together.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "10000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "1000"))
+accesslog = "-"
+
+
+def on_starting(server) -> None:
+    """
+    Synchronizes the schema once and disables it in the workers' lifespan.
+
+    The workers are forked from this process, so they inherit the settings
+    module already imported here: the flag is turned off in it, not only in the
+    environment.
+    """
+    from app.database.db_connection import dispose_engines, get_engine
+    from app.database.migrations import sync_schema
+    from app.utils import variables
+
+    if variables.DB_AUTO_MIGRATE:
+        sync_schema(get_engine())
+    dispose_engines()
+
+    variables.DB_AUTO_MIGRATE = False
+    os.environ["DB_AUTO_MIGRATE"] = "false"
@@ -0,0 +1,78 @@
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("MARITACA_API_KEY", "test-key")
+os.environ.setdefault("ANALYSIS_WORKERS", "0")
+
+import pytest  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from app.database.migrations import sync_schema  # noqa: E402
+from app.models.models import Base  # noqa: E402
+from app.services.search_service import drop_search_index  # noqa: E402
+
+DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(
+    DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="function")
+def session_factory():
+    from app.services.response_cache import response_cache
+
+    sync_schema(engine)
+    yield TestingSessionLocal
+    Base.metadata.drop_all(bind=engine)
+    with engine.begin() as connection:
+        drop_search_index(connection)
+    response_cache.clear()
+
+
+@pytest.fixture(scope="function")
+def db_session(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def sample_review():
+    return {
+        "customer_name": "Eduardo FG",
+        "review_text": "Ótimo atendimento e suporte muito rapido!",
+        "sentiment": "positiva",
+        "review_date": "2024-06-01",
+    }
+
+
+@pytest.fixture
+def sample_analysis():
+    return {
+        "sentiment": "positiva",
+        "score": 0.9,
+        "keywords": ["ótimo atendimento", "suporte rápido"],
+        "explanation": "O cliente elogia o atendimento e a rapidez do suporte.",
+    }
+
+
+@pytest.fixture
+def client(session_factory):
+    from fastapi.testclient import TestClient
+    from app.database.db_connection import get_db, get_session_factory
+    from app.main import app
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: session_factory
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
@@ -0,0 +1,450 @@
+import asyncio
+import httpx
+import openai
+import pydantic
+import pytest
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from app.models.models import SentimentCache
+from app.services import ai_service
+from app.services.ai_service import AnalysisCache, build_cache_key, pack_batches
+from app.services.flow_control import (
+    CircuitBreaker,
+    CircuitOpenError,
+    LLMLimiter,
+    SingleFlight,
+    TokenBucket,
+)
+from app.services.local_analyzer import analyze_with_lexicon
+
+
+@pytest.fixture
+def fake_llm(monkeypatch, sample_analysis):
+    calls = []
+
+    def request(review_text):
+        calls.append(review_text)
+        return sample_analysis
+
+    monkeypatch.setattr(ai_service, "_request_sentiment_analysis", request)
+    monkeypatch.setattr(ai_service, "analysis_cache", AnalysisCache())
+    return calls
+
+
+def test_analyze_should_reuse_cached_result_for_normalized_text(fake_llm):
+    first = ai_service.analyze_review_sentiment("Ótimo   atendimento!")
+    second = ai_service.analyze_review_sentiment("  ótimo atendimento! ")
+
+    assert first == second
+    assert fake_llm == ["Ótimo   atendimento!"]
+    stats = ai_service.analysis_cache.stats()
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_cache_key_should_change_with_prompt_version(monkeypatch):
+    key = build_cache_key("Ótimo atendimento!")
+
+    monkeypatch.setattr(ai_service, "PROMPT_VERSION", "outro-prompt")
+
+    assert build_cache_key("Ótimo atendimento!") != key
+
+
+def test_prompt_version_should_follow_the_batch_prompt_and_input_cut(monkeypatch):
+    assert ai_service.build_prompt_version() == ai_service.PROMPT_VERSION
+
+    monkeypatch.setattr(ai_service, "BATCH_SENTIMENT_PROMPT", "Outro prompt")
+    batch_version = ai_service.build_prompt_version()
+    monkeypatch.setattr(ai_service, "ANALYSIS_INPUT_TOKEN_BUDGET", 10)
+
+    assert batch_version != ai_service.PROMPT_VERSION
+    assert ai_service.build_prompt_version() not in (
+        batch_version,
+        ai_service.PROMPT_VERSION,
+    )
+
+
+def test_cache_should_evict_least_recently_used_and_expired_entries():
+    cache = AnalysisCache(max_size=2, ttl=60)
+    cache.set("a", {"score": 1})
+    cache.set("b", {"score": 2})
+    cache.get("a")
+    cache.set("c", {"score": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"score": 1}
+
+    expired = AnalysisCache(ttl=-1)
+    expired.set("a", {"score": 1})
+    assert expired.get("a") is None
+
+
+def test_persistent_tier_should_survive_a_new_process(session_factory, db_session):
+    AnalysisCache(session_factory=session_factory).set("chave", {"score": 0.5})
+
+    restarted = AnalysisCache(session_factory=session_factory)
+
+    assert restarted.get("chave") == {"score": 0.5}
+    assert restarted.stats()["persistent_hits"] == 1
+    assert db_session.get(SentimentCache, "chave").prompt_version == (
+        ai_service.PROMPT_VERSION
+    )
+
+
+class FakeCompletions:
+    def __init__(self, drop_index=None):
+        self.drop_index = drop_index
+        self.requests = []
+        self.max_tokens = []
+
+    def parse(self, model, messages, response_format, max_tokens=None):
+        texts = messages[1]["content"]
+        self.requests.append((response_format, texts))
+        self.max_tokens.append(max_tokens)
+        details = {
+            "sentiment": "positiva",
+            "score": 0.8,
+            "keywords": ["atendimento"],
+            "explanation": "Elogio.",
+        }
+
+        if response_format is ai_service.ReviewBatchDetails:
+            count = texts.count("\n\n") + 1
+            parsed = ai_service.ReviewBatchDetails(
+                results=[
+                    {**details, "index": index}
+                    for index in range(1, count + 1)
+                    if index != self.drop_index
+                ]
+            )
+        else:
+            parsed = ai_service.ReviewDetails(**details)
+
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(parsed=parsed))],
+            usage=SimpleNamespace(prompt_tokens=100, completion_tokens=20),
+        )
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    completions = FakeCompletions(drop_index=2)
+    client = SimpleNamespace(
+        beta=SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    )
+    monkeypatch.setattr(ai_service, "client", client)
+    monkeypatch.setattr(ai_service, "analysis_cache", AnalysisCache())
+    monkeypatch.setattr(ai_service, "analysis_usage", ai_service.AnalysisUsage())
+    return completions
+
+
+def test_pack_batches_should_respect_size_and_token_budget():
+    texts = ["a" * 40, "b" * 40, "c" * 400, "d" * 40, "e" * 40, "f" * 40]
+
+    assert pack_batches(texts, max_reviews=2, token_budget=50) == [
+        [0, 1],
+        [2],
+        [3, 4],
+        [5],
+    ]
+
+
+def test_batch_analysis_should_fall_back_to_single_calls(fake_client):
+    texts = ["Ótimo atendimento", "Suporte lento", "ótimo  atendimento", "Caro"]
+
+    results = ai_service.analyze_reviews_sentiment_batch(texts)
+
+    assert [result["sentiment"] for result in results] == ["positiva"] * 4
+    assert [request[0].__name__ for request in fake_client.requests] == [
+        "ReviewBatchDetails",
+        "ReviewDetails",
+    ]
+    # The repeated text is sent once; the review missing from the answer is
+    # analyzed again on its own.
+    assert fake_client.requests[1][1] == "Suporte lento"
+
+    usage = ai_service.analysis_usage.stats()
+    assert usage["batch"]["reviews"] == 3
+    assert usage["batch"]["tokens_per_review"] == 40.0
+    assert usage["single"]["tokens_per_review"] == 120.0
+    assert usage["fallbacks"] == 1
+
+    assert ai_service.analyze_reviews_sentiment_batch(["Caro"])[0]["score"] == 0.8
+    assert len(fake_client.requests) == 2
+
+
+def test_results_should_carry_their_share_of_the_call_usage(fake_client):
+    texts = ["Ótimo atendimento", "Suporte lento", "ótimo  atendimento", "Caro"]
+
+    results = ai_service.analyze_reviews_sentiment_batch(texts)
+
+    # 100 + 20 tokens split between the three reviews of the batch.
+    assert (results[0]["prompt_tokens"], results[0]["completion_tokens"]) == (33, 7)
+    assert results[1]["prompt_tokens"] == 100
+    # The repeated text and cache hits made no call of their own.
+    assert "prompt_tokens" not in results[2]
+    cached = ai_service.analyze_review_sentiment("Caro")
+    assert not set(ai_service.USAGE_KEYS) & set(cached)
+
+
+def test_review_details_should_repair_drifted_answers(monkeypatch):
+    monkeypatch.setattr(ai_service, "analysis_usage", ai_service.AnalysisUsage())
+
+    details = ai_service.ReviewDetails(
+        sentiment=" Positivo",
+        score="1,5",
+        keywords="preço, atendimento, preço",
+        explanation="Elogio. ",
+    )
+    derived = ai_service.ReviewDetails(
+        sentiment="misto", score=-0.6, keywords=[], explanation="Crítica."
+    )
+
+    assert (details.sentiment, details.score) == ("positiva", 1.0)
+    assert details.keywords == ["preço", "atendimento"]
+    assert derived.sentiment == "negativa"
+    assert ai_service.analysis_usage.stats()["repairs"] == 2
+
+    with pytest.raises(pydantic.ValidationError):
+        ai_service.ReviewDetails(sentiment="misto", keywords=[], explanation="?")
+
+    batch = ai_service.ReviewBatchDetails(
+        results=[
+            {**derived.model_dump(), "index": 1},
+            {"sentiment": "positiva", "keywords": [], "explanation": "?", "index": 2},
+        ]
+    )
+    assert [item.index for item in batch.results] == [1]
+
+
+def test_long_reviews_should_be_truncated_and_answers_capped(fake_client):
+    review_text = "Começo da avaliação. " + "texto " * 2000 + "Conclusão: péssimo."
+
+    ai_service.analyze_reviews_sentiment_batch([review_text, "Ótimo", "Caro"])
+
+    sent = fake_client.requests[0][1]
+    assert ai_service.TRUNCATION_MARK in sent
+    assert sent.startswith("[1] Começo da avaliação.")
+    assert "Conclusão: péssimo." in sent
+    assert ai_service.estimate_tokens(sent) < ai_service.estimate_tokens(review_text)
+    assert fake_client.max_tokens[0] == ai_service.LLM_MAX_TOKENS_PER_REVIEW * 3
+
+    truncated = ai_service.truncate_review_text(review_text, token_budget=50)
+    assert ai_service.estimate_tokens(truncated) <= 50
+    assert ai_service.truncate_review_text(review_text, token_budget=0) == review_text
+
+
+def test_lexicon_should_handle_intensifiers_negation_and_contrast():
+    satisfied, confidence = analyze_with_lexicon("Estou extremamente satisfeito")
+    assert satisfied["sentiment"] == "positiva"
+    assert satisfied["keywords"] == ["satisfeito"]
+    assert confidence == 1.0
+
+    mixed, _ = analyze_with_lexicon("Foi rápido, mas não resolveu meu problema.")
+    assert mixed["sentiment"] == "negativa"
+    assert -1 <= mixed["score"] < 0
+
+    neutral, confidence = analyze_with_lexicon("Recebi o produto ontem.")
+    assert neutral["sentiment"] == "neutra"
+    assert confidence == 0.0
+
+
+class FakeLLMAnalyzer(ai_service.SentimentAnalyzer):
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def analyze_batch(self, review_texts):
+        self.calls.extend(review_texts)
+        if self.fail:
+            return [RuntimeError("LLM indisponível") for _ in review_texts]
+        return [{"sentiment": "neutra", "score": 0.0} for _ in review_texts]
+
+
+def test_router_should_escalate_low_confidence_reviews():
+    llm = FakeLLMAnalyzer()
+    router = ai_service.AnalysisRouter("local_then_llm", 0.6, llm=llm)
+
+    results = router.analyze_batch(["Estou extremamente satisfeito", "Chegou hoje."])
+
+    assert results[0]["sentiment"] == "positiva"
+    assert results[0]["model"] == "lexicon"
+    assert results[1] == {"sentiment": "neutra", "score": 0.0}
+    assert llm.calls == ["Chegou hoje."]
+    stats = router.stats()
+    assert stats["served_locally"] == 1
+    assert stats["escalated"] == 1
+    assert stats["local_share"] == 0.5
+
+
+def test_router_should_keep_local_answer_when_escalation_fails():
+    router = ai_service.AnalysisRouter("local_then_llm", 0.6, llm=FakeLLMAnalyzer(True))
+
+    results = router.analyze_batch(["Chegou hoje."])
+
+    assert results[0]["sentiment"] == "neutra"
+    assert router.stats()["escalation_failures"] == 1
+
+    local_only = ai_service.AnalysisRouter("local", llm=FakeLLMAnalyzer(True))
+    assert local_only.analyze_batch(["Péssimo atendimento"])[0]["sentiment"] == (
+        "negativa"
+    )
+    with pytest.raises(ValueError):
+        ai_service.AnalysisRouter("remoto")
+
+
+def test_concurrent_analyses_of_same_text_should_share_one_call(
+    monkeypatch, sample_analysis
+):
+    release = threading.Event()
+    calls = []
+
+    def request(review_text):
+        calls.append(review_text)
+        release.wait(5)
+        return sample_analysis
+
+    flights = SingleFlight(timeout=5)
+    monkeypatch.setattr(ai_service, "_request_sentiment_analysis", request)
+    monkeypatch.setattr(ai_service, "analysis_cache", AnalysisCache())
+    monkeypatch.setattr(ai_service, "analysis_flights", flights)
+
+    with ThreadPoolExecutor(4) as pool:
+        futures = [
+            pool.submit(ai_service.analyze_review_sentiment, "Ótimo atendimento!")
+            for _ in range(4)
+        ]
+        deadline = time.monotonic() + 5
+        while flights.stats()["coalesced"] < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert calls == ["Ótimo atendimento!"]
+    assert results == [sample_analysis] * 4
+    assert flights.stats() == {
+        "in_flight": 0,
+        "leaders": 1,
+        "coalesced": 3,
+        "timeouts": 0,
+    }
+
+
+def test_single_flight_followers_should_time_out():
+    flights = SingleFlight(timeout=0.01)
+    flights.begin(["chave"])
+
+    led, followed = flights.begin(["chave"])
+
+    assert led == []
+    assert isinstance(flights.wait(followed["chave"]), TimeoutError)
+    assert flights.stats()["timeouts"] == 1
+
+
+def test_token_bucket_should_queue_calls_beyond_the_burst():
+    bucket = TokenBucket(rate=10, burst=2)
+
+    delays = [bucket.reserve() for _ in range(4)]
+
+    assert delays[:2] == [0.0, 0.0]
+    assert delays[2] == pytest.approx(0.1, abs=0.01)
+    assert delays[3] == pytest.approx(0.2, abs=0.01)
+    assert TokenBucket(rate=0).reserve() == 0.0
+
+
+def test_limiter_should_work_across_event_loops():
+    limiter = LLMLimiter(max_concurrency=1, bucket=TokenBucket(rate=0))
+
+    async def call():
+        async with limiter.limit_async():
+            await asyncio.sleep(0.01)
+
+    async def contended_calls():
+        await asyncio.gather(call(), call(), call())
+
+    # Each run has its own loop, like test clients and CLI commands.
+    asyncio.run(contended_calls())
+    asyncio.run(contended_calls())
+
+    assert limiter.stats()["calls"] == 6
+
+
+def test_circuit_breaker_should_fail_fast_and_close_after_a_trial():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.stats()["state"] == "open"
+
+    breaker.reset_timeout = 0
+    breaker.before_call()
+    assert breaker.stats()["state"] == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    breaker.before_call()
+    assert breaker.stats() == {
+        "state": "closed",
+        "consecutive_failures": 0,
+        "opens": 1,
+        "rejected": 2,
+    }
+
+
+def test_circuit_breaker_should_replace_an_abandoned_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0, trial_timeout=60)
+    breaker.record_failure()
+    # The trial's caller is cancelled and never records its outcome.
+    breaker.before_call()
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.trial_timeout = 0
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.stats()["state"] == "closed"
+
+
+def test_model_calls_should_retry_transient_errors(fake_client, monkeypatch):
+    parse = fake_client.parse
+    failures = [openai.APITimeoutError(request=httpx.Request("POST", "http://llm"))]
+
+    def flaky_parse(**kwargs):
+        if failures:
+            raise failures.pop()
+        return parse(**kwargs)
+
+    fake_client.parse = flaky_parse
+    monkeypatch.setattr(ai_service, "llm_breaker", CircuitBreaker())
+    monkeypatch.setattr(ai_service, "compute_retry_delay", lambda attempt: 0)
+
+    result = ai_service.analyze_review_sentiment("Ótimo atendimento")
+
+    assert result["sentiment"] == "positiva"
+    assert ai_service.llm_breaker.stats()["consecutive_failures"] == 0
+
+
+def test_router_should_degrade_to_lexicon_when_llm_is_unavailable():
+    class UnavailableLLM(FakeLLMAnalyzer):
+        def analyze_batch(self, review_texts):
+            return [CircuitOpenError(30) for _ in review_texts]
+
+    router = ai_service.AnalysisRouter("llm", llm=UnavailableLLM())
+
+    results = router.analyze_batch(["Péssimo atendimento"])
+
+    assert results[0]["sentiment"] == "negativa"
+    assert results[0]["degraded"] is True
+    assert router.stats()["degraded"] == 1
+
+    strict = ai_service.AnalysisRouter(
+        "llm", llm=UnavailableLLM(), degraded_fallback=False
+    )
+    assert isinstance(strict.analyze_batch(["Péssimo"])[0], CircuitOpenError)
@@ -0,0 +1,64 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from app.models.models import Base
+from app.services import analysis_worker
+from app.services.analysis_worker import AsyncAnalysisWorker
+from app.services.async_reviews_service import AsyncReviewService
+from app.services.search_service import create_search_index
+from app.utils.pagination import OffsetParams
+
+
+@pytest_asyncio.fixture
+async def async_session_factory():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.run_sync(create_search_index)
+
+    yield async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_async_create_and_get_review(async_session_factory, sample_review):
+    async with async_session_factory() as session:
+        service = AsyncReviewService(session)
+        created = await service.create_review(sample_review)
+        review_id = created["review"]["id"]
+
+        response = await service.get_review_by_id(review_id)
+        page = await service.get_all_reviews(OffsetParams(page=1, size=10))
+
+    assert created["review"]["analysis_status"] == "pending"
+    assert response["review"]["customer_name"] == sample_review["customer_name"]
+    assert page["total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_async_worker_should_store_analysis(
+    async_session_factory, sample_review, sample_analysis, monkeypatch
+):
+    async def analyze(review_texts):
+        return [sample_analysis for _ in review_texts]
+
+    monkeypatch.setattr(analysis_worker, "analyze_reviews_async", analyze)
+
+    async with async_session_factory() as session:
+        service = AsyncReviewService(session)
+        await service.create_reviews_bulk(
+            [sample_review, {**sample_review, "customer_name": "Maria"}]
+        )
+
+    worker = AsyncAnalysisWorker(async_session_factory, workers=0)
+    assert await worker.run_once() == 2
+
+    async with async_session_factory() as session:
+        service = AsyncReviewService(session)
+        status = await service.get_analysis_status(1)
+        report = await service.get_reviews_report("2024-06-01", "2024-06-30")
+
+    assert status["analysis_status"] == "done"
+    assert [item["sentiment"] for item in report["items"]] == ["positive", "positive"]
@@ -0,0 +1,309 @@
+import gzip
+import json
+from app.services.response_cache import (
+    MemoryResponseBackend,
+    ResponseCache,
+    SharedResponseBackend,
+    encode_response,
+)
+from app.services.metrics import Histogram, MetricsRegistry
+from app.services.reviews_service import ReviewService
+
+
+def test_bulk_create_should_accept_json_array(client, sample_review):
+    invalid_review = {**sample_review, "sentiment": "ótima"}
+
+    response = client.post("/reviews/bulk", json=[sample_review, invalid_review])
+
+    assert response.status_code == 201
+    body = response.json()
+    assert body["created"] == 1
+    assert body["failed"] == 1
+    assert body["results"][0]["status"] == "OK"
+    assert body["results"][0]["analysis_status"] == "pending"
+    assert body["results"][1]["status"] == "error"
+
+
+def test_bulk_create_should_accept_ndjson(client, sample_review):
+    lines = [
+        json.dumps(sample_review),
+        "{invalid json",
+        json.dumps({**sample_review, "review_date": "01/06/2024"}),
+        json.dumps({**sample_review, "customer_name": "Maria"}),
+    ]
+
+    response = client.post(
+        "/reviews/bulk",
+        content="\n".join(lines),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    body = response.json()
+    assert [result["status"] for result in body["results"]] == [
+        "OK",
+        "error",
+        "error",
+        "OK",
+    ]
+    assert body["results"][2]["detail"] == "Formato de data inválido. Use YYYY-MM-DD."
+    assert (
+        client.get(f"/reviews/{body['results'][3]['id']}").json()["review"][
+            "customer_name"
+        ]
+        == "Maria"
+    )
+
+
+def test_list_reviews_should_keep_offset_pagination(client, sample_review):
+    client.post("/reviews/bulk", json=[sample_review] * 3)
+
+    body = client.get("/reviews/?page=2&size=2").json()
+    assert body["total"] == 3
+    assert body["page"] == 2
+    assert len(body["items"]) == 1
+
+    body = client.get("/reviews/?page=1&size=2&include_total=false").json()
+    assert body["total"] is None
+    assert len(body["items"]) == 2
+
+
+def test_list_reviews_should_walk_cursor_pages(client, sample_review):
+    dates = ["2024-06-01", "2024-06-02", "2024-06-02", "2024-05-30", "2024-06-03"]
+    client.post(
+        "/reviews/bulk",
+        json=[{**sample_review, "review_date": date} for date in dates],
+    )
+
+    seen, cursor = [], ""
+    while cursor is not None:
+        body = client.get("/reviews/", params={"cursor": cursor, "size": 2}).json()
+        seen += [(item["review_date"], item["id"]) for item in body["items"]]
+        cursor = body["next_cursor"]
+
+    assert body["total"] == 5
+    assert seen == sorted(seen, reverse=True)
+    assert len(set(seen)) == 5
+
+    body = client.get("/reviews/?cursor=&include_total=false").json()
+    assert body["total"] is None
+    assert client.get("/reviews/?cursor=not-a-cursor").status_code == 400
+
+
+def test_report_should_support_cursor_pagination(client, sample_review):
+    client.post("/reviews/bulk", json=[sample_review] * 3)
+    params = {"start_date": "2024-06-01", "end_date": "2024-06-30", "size": 2}
+
+    first = client.get("/reviews/report", params={**params, "cursor": ""}).json()
+    second = client.get(
+        "/reviews/report", params={**params, "cursor": first["next_cursor"]}
+    ).json()
+
+    assert first["total"] == 3
+    assert len(first["items"]) == 2
+    assert len(second["items"]) == 1
+    assert second["next_cursor"] is None
+
+
+def test_list_reviews_should_filter_by_keyword(client, session_factory, sample_review):
+    client.post("/reviews/bulk", json=[sample_review] * 2)
+    with session_factory() as session:
+        ReviewService(session).save_sentiment_analysis(
+            1,
+            {"sentiment": "positiva", "score": 0.8, "keywords": ["Entrega"]},
+        )
+
+    body = client.get("/reviews/?keyword=entrega").json()
+    assert [item["id"] for item in body["items"]] == [1]
+    assert client.get("/reviews/?keyword=entrega&cursor=").json()["total"] == 1
+
+    top = client.get("/reviews/keywords/top?limit=5").json()
+    assert top == {"keywords": [{"keyword": "entrega", "count": 1}]}
+
+
+def test_report_export_should_stream_csv_and_ndjson(client, sample_review):
+    client.post(
+        "/reviews/bulk",
+        json=[sample_review, {**sample_review, "review_date": "2024-06-02"}],
+    )
+    params = {"start_date": "2024-06-01", "end_date": "2024-06-30"}
+
+    response = client.get(
+        "/reviews/report/export",
+        params={**params, "columns": "id,review_date,sentiment"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.splitlines() == [
+        "id,review_date,sentiment",
+        "2,2024/06/02,",
+        "1,2024/06/01,",
+    ]
+
+    response = client.get(
+        "/reviews/report/export", params={**params, "format": "ndjson", "gzip": True}
+    )
+    rows = [json.loads(line) for line in gzip.decompress(response.content).splitlines()]
+    assert [row["id"] for row in rows] == [2, 1]
+    assert rows[0]["analysis_status"] == "pending"
+
+    response = client.get(
+        "/reviews/report/export", params={**params, "columns": "id,password"}
+    )
+    assert response.status_code == 400
+
+
+def test_health_should_report_database_and_pool(client):
+    response = client.get("/health")
+
+    assert response.status_code == 200
+    assert response.json()["ready"] is True
+    assert response.json()["database"]["reachable"] is True
+    assert "pool" in response.json()["pool"]
+
+
+def test_review_by_id_should_answer_304_when_etag_matches(client, sample_review):
+    review_id = client.post("/reviews/", json=sample_review).json()["review"]["id"]
+
+    first = client.get(f"/reviews/{review_id}")
+    etag = first.headers["etag"]
+    second = client.get(f"/reviews/{review_id}", headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+
+
+def test_cached_responses_should_be_invalidated_by_writes(
+    client, session_factory, sample_review
+):
+    client.post("/reviews/", json=sample_review)
+    page = client.get("/reviews/?size=10")
+    review = client.get("/reviews/1")
+    assert page.json()["total"] == 1
+
+    client.post("/reviews/", json={**sample_review, "customer_name": "Maria"})
+    assert client.get("/reviews/?size=10").json()["total"] == 2
+
+    with session_factory() as session:
+        ReviewService(session).save_sentiment_analysis(
+            1, {"sentiment": "positiva", "score": 0.8, "keywords": []}
+        )
+    response = client.get(
+        "/reviews/1", headers={"If-None-Match": review.headers["etag"]}
+    )
+    assert response.status_code == 200
+    assert response.json()["review"]["analysis_status"] == "done"
+
+
+def test_response_cache_should_work_with_a_shared_backend():
+    class FakeRedis:
+        def __init__(self):
+            self.values = {}
+
+        def get(self, key):
+            return self.values.get(key)
+
+        def set(self, key, value, ex=None):
+            self.values[key] = value
+
+        def incr(self, key):
+            self.values[key] = int(self.values.get(key, 0)) + 1
+
+    backend = SharedResponseBackend(FakeRedis())
+    cache = ResponseCache(backend, ttl=30)
+    key = cache.listing_key([("size", "10"), ("page", "1")])
+    cache.set(key, encode_response({"items": [1]}))
+
+    assert cache.get(key).body == b'{"items":[1]}'
+    assert ResponseCache(backend).listing_key([("page", "1"), ("size", "10")]) == key
+
+    cache.invalidate()
+    assert cache.listing_key([("page", "1"), ("size", "10")]) != key
+
+    review_key = cache.review_key(1)
+    cache.invalidate([1], listing=False)
+    cache.set(review_key, encode_response({"review": {"analysis_status": "pending"}}))
+    assert cache.get(cache.review_key(1)) is None
+
+
+def test_response_cache_should_drop_reviews_built_before_a_write():
+    cache = ResponseCache(MemoryResponseBackend(max_size=2), ttl=30)
+    stale = cache.review_key(1)
+
+    cache.invalidate([1], listing=False)
+    cache.set(stale, encode_response({"review": {"analysis_status": "pending"}}))
+    assert cache.get(cache.review_key(1)) is None
+
+    fresh = cache.review_key(1)
+    cache.set(fresh, encode_response({"review": {"analysis_status": "done"}}))
+    assert cache.get(cache.review_key(1)).body.endswith(b'"done"}}')
+
+    cache.invalidate([2, 3])
+    assert cache.review_key(1) not in {stale, fresh}
+
+
+def test_stats_should_validate_bucket(client):
+    assert client.get("/reviews/stats?bucket=year").status_code == 422
+
+    response = client.get("/reviews/stats?bucket=week")
+    assert response.status_code == 200
+    assert response.json() == {
+        "bucket": "week",
+        "total_reviews": 0,
+        "positive": 0,
+        "negative": 0,
+        "neutral": 0,
+        "agreement_rate": None,
+        "buckets": [],
+    }
+
+
+def test_search_should_validate_and_find_reviews(client, sample_review):
+    assert client.get("/reviews/search").status_code == 422
+    assert client.get("/reviews/search?q=suporte&sentiment=bad").status_code == 422
+    assert client.get("/reviews/search?q=x&cursor=invalido").status_code == 400
+
+    review_id = client.post("/reviews/", json=sample_review).json()["review"]["id"]
+    response = client.get("/reviews/search", params={"q": "suporte rápido"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["query"] == "suporte rápido"
+    assert [item["id"] for item in body["items"]] == [review_id]
+    assert body["next_cursor"] is None
+
+
+def test_metrics_should_expose_route_and_stage_latencies(client, sample_review):
+    review_id = client.post("/reviews/", json=sample_review).json()["review"]["id"]
+    client.get(f"/reviews/{review_id}")
+
+    response = client.get("/metrics")
+    body = response.text
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/reviews/{review_id}"'
+        in body
+    )
+    assert 'review_stage_duration_seconds_count{stage="db_insert"}' in body
+    assert 'cache_hit_ratio{cache="response"}' in body
+    assert "llm_cost_total" in body
+
+
+def test_histogram_should_render_cumulative_buckets():
+    registry = MetricsRegistry(enabled=True)
+    histogram = registry.register(
+        Histogram("latency_seconds", "Latência.", ("stage",), buckets=(0.1, 1.0))
+    )
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, "db_insert")
+
+    body = registry.render()
+
+    assert 'latency_seconds_bucket{stage="db_insert",le="0.1"} 1' in body
+    assert 'latency_seconds_bucket{stage="db_insert",le="1.0"} 2' in body
+    assert 'latency_seconds_bucket{stage="db_insert",le="+Inf"} 3' in body
+    assert 'latency_seconds_count{stage="db_insert"} 3' in body
+    assert 'latency_seconds_sum{stage="db_insert"} 5.55' in body
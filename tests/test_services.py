@@ -1,82 +1,599 @@
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from app.models.models import Base, Review, SentimentAnalysis
-from app.services.reviews_service import (
-    process_create_review,
-    process_get_all_reviews,
-    process_get_review_by_id,
-    process_reviews_report,
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+from app.models.models import (
+    AnalysisStatusEnum,
+    Review,
+    ReviewKeyword,
+    SentimentAnalysis,
+    SentimentDailyRollup,
 )
+from app.services import analysis_worker, reviews_service
+from app.services.ai_service import SentimentAnalyzer
+from app.services.analysis_worker import AnalysisWorker
+from app.services.archive_service import archive_reviews
+from app.services.flow_control import CircuitOpenError
+from app.services.keywords_service import rebuild_keywords
+from app.services.reanalysis_service import Reanalyzer
+from app.services.reviews_service import ReviewService
+from app.services.search_service import build_search_matches
+from app.services.rollup_service import rebuild_rollup
+from app.utils.pagination import OffsetParams
+from app.utils.utils import convert_date_to_timestamp
 
-DATABASE_URL = "sqlite:///:memory:"
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+@pytest.fixture
+def fake_analyzer(monkeypatch, sample_analysis):
+    calls = []
 
-@pytest.fixture(scope="function")
-def db_session():
-    Base.metadata.create_all(bind=engine)
-    session = TestingSessionLocal()
-    yield session
-    session.close()
-    Base.metadata.drop_all(bind=engine)
-
+    def analyze(review_texts):
+        calls.extend(review_texts)
+        return [sample_analysis for _ in review_texts]
 
-@pytest.fixture
-def sample_review():
-    return {
-        "customer_name": "Eduardo FG",
-        "review_text": "Ótimo atendimento e suporte muito rapido!",
-        "sentiment": "positiva",
-        "review_date": "2024-06-01",
-    }
+    monkeypatch.setattr(analysis_worker, "analyze_reviews", analyze)
+    return calls
 
 
-def test_process_create_review_should_return_1(db_session, sample_review):
-    response = process_create_review(db_session, sample_review)
+def test_create_review_should_queue_analysis(db_session, sample_review):
+    response = ReviewService(db_session).create_review(sample_review)
 
     assert response["status"] == "OK"
     assert response["review"]["customer_name"] == sample_review["customer_name"]
     assert response["review"]["review_text"] == sample_review["review_text"]
+    assert response["review"]["analysis_status"] == "pending"
 
     review = db_session.query(Review).filter_by(customer_name="Eduardo FG").first()
     assert review is not None
+    assert review.analysis_status == AnalysisStatusEnum.PENDING
+    assert db_session.query(SentimentAnalysis).count() == 0
+
+
+def test_worker_should_store_analysis(
+    db_session, session_factory, sample_review, fake_analyzer
+):
+    response = ReviewService(db_session).create_review(sample_review)
+    review_id = response["review"]["id"]
+
+    assert AnalysisWorker(session_factory, workers=0).run_once() == 1
+    assert fake_analyzer == [sample_review["review_text"]]
 
-    analysis = (
-        db_session.query(SentimentAnalysis).filter_by(review_id=review.id).first()
+    status = ReviewService(db_session).get_analysis_status(review_id)
+    assert status["analysis_status"] == "done"
+    assert status["attempts"] == 1
+    assert status["analysis"]["sentiment"] == "positiva"
+
+
+def test_analysis_should_store_the_usage_of_its_model_call(
+    db_session, sample_review, sample_analysis
+):
+    service = ReviewService(db_session)
+    review_id = service.create_review(sample_review)["review"]["id"]
+    usage = {"prompt_tokens": 33, "completion_tokens": 7, "latency_ms": 412}
+
+    service.save_sentiment_analysis(review_id, {**sample_analysis, **usage})
+    analysis = service.get_analysis_status(review_id)["analysis"]
+    assert {key: analysis[key] for key in usage} == usage
+
+    # A cached answer made no call: its usage is unknown, not the old one.
+    service.save_sentiment_analysis(review_id, sample_analysis)
+    analysis = service.get_analysis_status(review_id)["analysis"]
+    assert analysis["prompt_tokens"] is None
+
+
+def test_worker_should_fail_only_the_review_whose_save_failed(
+    db_session, session_factory, sample_review, fake_analyzer, monkeypatch
+):
+    service = ReviewService(db_session)
+    first, second = (
+        service.create_review({**sample_review, "review_text": text})["review"]["id"]
+        for text in ("Ótimo atendimento", "Entrega rápida")
     )
-    assert analysis is not None
-    assert analysis.sentiment == "positiva"
+    save = ReviewService.save_sentiment_analysis
+
+    def flaky_save(self, review_id, analysis_data):
+        if review_id == first:
+            raise RuntimeError("Tempo esgotado no banco")
+        save(self, review_id, analysis_data)
 
+    monkeypatch.setattr(ReviewService, "save_sentiment_analysis", flaky_save)
 
-def test_process_get_all_reviews_should_return_1(db_session, sample_review):
-    process_create_review(db_session, sample_review)
+    assert AnalysisWorker(session_factory, workers=0).run_once() == 2
 
-    response = process_get_all_reviews(db_session)
-    assert "reviews_list" in response
-    assert len(response["reviews_list"]) == 1
-    assert (
-        response["reviews_list"][0]["customer_name"] == sample_review["customer_name"]
+    failed = service.get_analysis_status(first)
+    assert failed["analysis_status"] == "pending"
+    assert failed["error"] == "Tempo esgotado no banco"
+    assert service.get_analysis_status(second)["analysis_status"] == "done"
+
+
+def test_worker_should_retry_and_fail_after_max_attempts(
+    db_session, session_factory, sample_review, monkeypatch
+):
+    def failing_analyze(review_texts):
+        return [RuntimeError("LLM indisponível") for _ in review_texts]
+
+    monkeypatch.setattr(analysis_worker, "analyze_reviews", failing_analyze)
+    monkeypatch.setattr(analysis_worker, "compute_backoff", lambda attempt: -1)
+
+    review_id = ReviewService(db_session).create_review(sample_review)["review"]["id"]
+    worker = AnalysisWorker(session_factory, workers=0, max_attempts=2)
+
+    assert worker.run_once() == 1
+    status = ReviewService(db_session).get_analysis_status(review_id)
+    assert status["analysis_status"] == "pending"
+    assert status["error"] == "LLM indisponível"
+
+    assert worker.run_once() == 1
+    status = ReviewService(db_session).get_analysis_status(review_id)
+    assert status["analysis_status"] == "failed"
+    assert worker.run_once() == 0
+
+
+def test_worker_should_store_degraded_analysis_and_requeue_it(
+    db_session, session_factory, sample_review, sample_analysis, monkeypatch
+):
+    outcomes = iter(
+        [
+            [{**sample_analysis, "degraded": True}],
+            [CircuitOpenError(retry_after=-5)],
+            [sample_analysis],
+        ]
     )
+    monkeypatch.setattr(analysis_worker, "analyze_reviews", lambda _: next(outcomes))
+    monkeypatch.setattr(
+        "app.services.reviews_service.ANALYSIS_DEGRADED_RETRY_DELAY", -1
+    )
+
+    review_id = ReviewService(db_session).create_review(sample_review)["review"]["id"]
+    worker = AnalysisWorker(session_factory, workers=0, max_attempts=1)
+
+    assert worker.run_once() == 1
+    status = ReviewService(db_session).get_analysis_status(review_id)
+    assert status["analysis_status"] == "degraded"
+    assert status["analysis"]["sentiment"] == "positiva"
+    report = ReviewService(db_session).get_reviews_report("2024-06-01", "2024-06-30")
+    assert report["total_reviews"] == 1
+
+    # An open circuit does not use up the only attempt.
+    assert worker.run_once() == 1
+    status = ReviewService(db_session).get_analysis_status(review_id)
+    assert status["analysis_status"] == "pending"
+    assert status["attempts"] == 0
+
+    assert worker.run_once() == 1
+    status = ReviewService(db_session).get_analysis_status(review_id)
+    assert status["analysis_status"] == "done"
+
+
+def test_create_review_should_replay_idempotency_key(db_session, sample_review):
+    service = ReviewService(db_session)
 
+    first = service.create_review(sample_review, "pedido-1")
+    retry = service.create_review(sample_review, "pedido-1")
 
-def test_process_get_review_by_id(db_session, sample_review):
-    response = process_create_review(db_session, sample_review)
+    assert retry == first
+    assert db_session.query(Review).count() == 1
+    with pytest.raises(HTTPException) as error:
+        service.create_review({**sample_review, "review_text": "Outra"}, "pedido-1")
+    assert error.value.status_code == 422
+
+
+def test_create_review_should_return_stored_duplicate(
+    db_session, sample_review, monkeypatch
+):
+    monkeypatch.setattr(reviews_service, "REVIEW_DEDUP_ENABLED", True)
+    service = ReviewService(db_session)
+
+    first = service.create_review(sample_review)
+    duplicate = service.create_review(sample_review)
+    other_day = service.create_review({**sample_review, "review_date": "2024-06-02"})
+
+    assert duplicate["duplicate"] is True
+    assert duplicate["review"]["id"] == first["review"]["id"]
+    assert "duplicate" not in other_day
+    assert db_session.query(Review).count() == 2
+
+
+def test_get_all_reviews_should_return_1(db_session, sample_review):
+    ReviewService(db_session).create_review(sample_review)
+
+    response = ReviewService(db_session).get_all_reviews(OffsetParams(page=1, size=50))
+
+    assert response["total"] == 1
+    assert response["pages"] == 1
+    assert response["items"][0]["customer_name"] == sample_review["customer_name"]
+    assert response["items"][0]["sentiment"] == "positiva"
+
+
+def test_get_review_by_id(db_session, sample_review):
+    response = ReviewService(db_session).create_review(sample_review)
     review_id = response["review"]["id"]
 
-    response = process_get_review_by_id(db_session, review_id)
+    response = ReviewService(db_session).get_review_by_id(review_id)
     assert response["review"]["id"] == review_id
     assert response["review"]["customer_name"] == sample_review["customer_name"]
 
 
-def test_process_reviews_report(db_session, sample_review):
-    process_create_review(db_session, sample_review)
+def test_reviews_report(db_session, session_factory, sample_review, fake_analyzer):
+    service = ReviewService(db_session)
+    service.create_review(sample_review)
+    service.create_review({**sample_review, "customer_name": "Maria"})
+    AnalysisWorker(session_factory, workers=0, batch_size=1).run_once()
+
+    response = service.get_reviews_report("2024-06-01", "2024-06-30")
+
+    assert response["total"] == 2
+    statuses = {item["analysis_status"]: item for item in response["items"]}
+    assert statuses["done"]["sentiment"] == "positive"
+    assert statuses["pending"]["sentiment"] is None
+
+
+def test_review_dates_should_be_iso_days_rendered_with_slashes(
+    db_session, sample_review
+):
+    service = ReviewService(db_session)
+    service.create_review(sample_review)
+    service.create_review({**sample_review, "review_date": "2024-06-30"})
+
+    response = service.get_reviews_report("2024-06-01", "2024-06-30")
+
+    assert [item["review_date"] for item in response["items"]] == [
+        "2024/06/30",
+        "2024/06/01",
+    ]
+    for review_date in ("2024/06/01", "20240601", "2024-W22-6"):
+        with pytest.raises(HTTPException):
+            service.create_review({**sample_review, "review_date": review_date})
+
+
+def test_report_should_read_archived_reviews(
+    db_session, session_factory, sample_review, fake_analyzer
+):
+    service = ReviewService(db_session)
+    old, new = [
+        row["id"]
+        for row in service.create_reviews_bulk(
+            [
+                {**sample_review, "review_date": "2022-01-10"},
+                {**sample_review, "review_date": "2024-06-01"},
+            ]
+        )
+    ]
+    AnalysisWorker(session_factory, workers=0).run_once()
+
+    cutoff = convert_date_to_timestamp("2023-01-01", "%Y-%m-%d")
+    assert archive_reviews(db_session, cutoff) == 1
+    assert [item["id"] for item in service.get_all_reviews()["items"]] == [new]
+    assert service.get_analysis_status(old)["status"] == 404
+
+    params = OffsetParams(page=1, size=1)
+    report = service.get_reviews_report(
+        "2022-01-01", "2024-12-31", params=params, cursor=""
+    )
+    assert report["total_reviews"] == 2
+    assert report["total"] == 2
+    assert [item["id"] for item in report["items"]] == [new]
+    report = service.get_reviews_report(
+        "2022-01-01", "2024-12-31", params=params, cursor=report["next_cursor"]
+    )
+    assert [item["id"] for item in report["items"]] == [old]
+    assert report["items"][0]["sentiment"] == "positive"
+    assert report["items"][0]["review_date"] == "2022/01/10"
+
+    recent = service.get_reviews_report("2024-01-01", "2024-12-31")
+    assert [item["id"] for item in recent["items"]] == [new]
+
+    # Rebuilding the rollup keeps the archived days.
+    rebuild_rollup(db_session)
+    db_session.commit()
+    assert service.get_reviews_report("2022-01-01", "2022-01-31")["total_reviews"] == 1
+
+
+def test_create_reviews_bulk_should_report_row_errors(
+    db_session, sample_review, monkeypatch
+):
+    monkeypatch.setattr("app.services.reviews_service.BULK_INSERT_CHUNK_SIZE", 2)
+    rows = [
+        sample_review,
+        {**sample_review, "customer_name": ""},
+        {**sample_review, "customer_name": "Maria"},
+        {**sample_review, "customer_name": "João"},
+    ]
+
+    results = ReviewService(db_session).create_reviews_bulk(rows)
+
+    assert [result["index"] for result in results] == [0, 1, 2, 3]
+    assert [result["status"] for result in results] == ["OK", "error", "OK", "OK"]
+    assert results[1]["detail"] == "'customer_name' é obrigatório."
+    assert db_session.query(Review).count() == 3
+    assert {review.analysis_status for review in db_session.query(Review)} == {
+        AnalysisStatusEnum.PENDING
+    }
+
+
+def test_report_summary_should_come_from_daily_rollup(
+    db_session, session_factory, sample_review, sample_analysis
+):
+    service = ReviewService(db_session)
+    first = service.create_review(sample_review)["review"]["id"]
+    second = service.create_review({**sample_review, "review_date": "2024-06-02"})
+    service.create_review({**sample_review, "review_date": "2024-07-01"})
+
+    service.save_sentiment_analysis(first, sample_analysis)
+    service.save_sentiment_analysis(
+        second["review"]["id"],
+        {**sample_analysis, "sentiment": "Negativa", "score": -0.4},
+    )
+
+    report = service.get_reviews_report("2024-06-01", "2024-06-30", include_items=False)
+
+    assert report == {
+        "total_reviews": 2,
+        "positive": 1,
+        "negative": 1,
+        "neutral": 0,
+        "average_score": 0.25,
+        "min_score": -0.4,
+        "max_score": 0.9,
+    }
+    assert db_session.query(SentimentDailyRollup).count() == 2
+
+
+def test_rollup_should_follow_reanalysis_and_match_rebuild(
+    db_session, sample_review, sample_analysis
+):
+    service = ReviewService(db_session)
+    review_id = service.create_review(sample_review)["review"]["id"]
+    service.save_sentiment_analysis(review_id, sample_analysis)
+    service.save_sentiment_analysis(
+        review_id, {**sample_analysis, "sentiment": "neutra", "score": 0.1}
+    )
+
+    def rollup_rows():
+        return [
+            (row.day, row.sentiment, row.count, row.score_sum, row.score_min)
+            for row in db_session.query(SentimentDailyRollup).order_by(
+                SentimentDailyRollup.sentiment
+            )
+        ]
+
+    incremental = rollup_rows()
+    rebuild_rollup(db_session)
+    db_session.commit()
+
+    assert incremental == [(19875, "neutral", 1, 0.1, 0.1)]
+    assert rollup_rows() == incremental
+
+
+def test_keywords_should_be_indexed_and_counted(
+    db_session, sample_review, sample_analysis
+):
+    service = ReviewService(db_session)
+    first = service.create_review(sample_review)["review"]["id"]
+    second = service.create_review({**sample_review, "customer_name": "Maria"})
+    second = second["review"]["id"]
+    service.create_review({**sample_review, "customer_name": "João"})
+
+    service.save_sentiment_analysis(first, sample_analysis)
+    service.save_sentiment_analysis(
+        second, {**sample_analysis, "keywords": [" Suporte  RÁPIDO", "demora"]}
+    )
+    # Re-analysis replaces the keywords of the review.
+    service.save_sentiment_analysis(
+        first, {**sample_analysis, "keywords": ["Suporte rápido", "preço"]}
+    )
+
+    listing = service.get_all_reviews(keyword="SUPORTE rápido")
+    assert {item["id"] for item in listing["items"]} == {first, second}
+
+    top = service.get_top_keywords(limit=2)
+    assert top["keywords"][0] == {"keyword": "suporte rápido", "count": 2}
+    assert len(top["keywords"]) == 2
+    assert service.get_top_keywords(start_date="2024-07-01")["keywords"] == []
+
+
+def test_rebuild_keywords_should_migrate_existing_analyses(
+    db_session, sample_review, sample_analysis
+):
+    review_id = ReviewService(db_session).create_review(sample_review)["review"]["id"]
+    db_session.add(
+        SentimentAnalysis(
+            review_id=review_id,
+            sentiment="positiva",
+            score=0.9,
+            keywords="Atendimento,suporte rápido,,atendimento",
+            explanation="Analisado antes da tabela de palavras-chave.",
+        )
+    )
+    db_session.commit()
+
+    rebuild_keywords(db_session)
+    db_session.commit()
+
+    assert sorted(
+        (row.review_id, row.keyword) for row in db_session.query(ReviewKeyword)
+    ) == [(review_id, "atendimento"), (review_id, "suporte rápido")]
+
+
+def test_review_stats_should_be_grouped_in_the_database(
+    db_session, sample_review, sample_analysis
+):
+    service = ReviewService(db_session)
+    first = service.create_review(sample_review)["review"]["id"]
+    second = service.create_review({**sample_review, "review_date": "2024-06-02"})
+    service.create_review({**sample_review, "review_date": "2024-07-01"})
+
+    service.save_sentiment_analysis(first, sample_analysis)
+    service.save_sentiment_analysis(
+        second["review"]["id"],
+        {**sample_analysis, "sentiment": "Negativa", "score": -0.4},
+    )
+
+    monthly = service.get_review_stats("month")
+
+    assert monthly["total_reviews"] == 2
+    assert monthly["agreement_rate"] == 0.5
+    assert monthly["buckets"] == [
+        {
+            "start_date": "2024-06-01",
+            "total_reviews": 2,
+            "positive": 1,
+            "negative": 1,
+            "neutral": 0,
+            "average_score": 0.25,
+            "p25": -0.075,
+            "p50": 0.25,
+            "p75": 0.575,
+            "agreement_rate": 0.5,
+        }
+    ]
+
+    daily = service.get_review_stats("day", start_date="2024-06-02")
+    assert [bucket["start_date"] for bucket in daily["buckets"]] == ["2024-06-02"]
+    assert service.get_review_stats("week", end_date="2024/06/30")["status"] == 400
+
+
+def test_search_should_rank_filter_and_page_matches(
+    db_session, sample_review, sample_analysis
+):
+    service = ReviewService(db_session)
+    first = service.create_review(sample_review)["review"]["id"]
+    second = service.create_reviews_bulk(
+        [
+            {
+                **sample_review,
+                "review_text": "Muita demora na entrega.",
+                "review_date": "2024-06-05",
+            },
+            {**sample_review, "review_text": "Produto bom."},
+        ]
+    )[0]["id"]
+    service.save_sentiment_analysis(
+        second,
+        {
+            **sample_analysis,
+            "sentiment": "Negativa",
+            "explanation": "O cliente reclama da demora e do atendimento.",
+        },
+    )
+
+    # A match in the review text ranks above one in the explanation.
+    page = service.search_reviews("ATENDIMENTO", size=1)
+    assert [item["id"] for item in page["items"]] == [first]
+    page = service.search_reviews("atendimento", size=1, cursor=page["next_cursor"])
+    assert [item["id"] for item in page["items"]] == [second]
+    assert page["items"][0]["sentiment"] == "negative"
+    assert page["next_cursor"] is None
+
+    assert [item["id"] for item in service.search_reviews("otimo")["items"]] == [first]
+    assert [
+        item["id"]
+        for item in service.search_reviews("demora", sentiment="negative")["items"]
+    ] == [second]
+    assert service.search_reviews("demora", sentiment="positive")["items"] == []
+    dated = service.search_reviews("atendimento", start_date="2024-06-02")
+    assert [item["id"] for item in dated["items"]] == [second]
+    assert service.search_reviews("?!")["items"] == []
+
+
+def test_search_should_page_through_reviews_tied_at_the_same_rank(
+    db_session, sample_review
+):
+    service = ReviewService(db_session)
+    tied = [
+        service.create_review({**sample_review, "customer_name": name})["review"]["id"]
+        for name in ("Ana", "Bruno", "Carla")
+    ]
+
+    first = service.search_reviews("atendimento", size=2)
+    second = service.search_reviews("atendimento", size=2, cursor=first["next_cursor"])
+
+    found = [item["id"] for item in first["items"] + second["items"]]
+    assert found == sorted(tied, reverse=True)
+    assert second["next_cursor"] is None
+
+    postgres_matches = build_search_matches("postgresql", "atendimento")
+    assert "CAST(ts_rank_cd(" in str(
+        postgres_matches.compile(dialect=postgresql.dialect())
+    )
+
+
+class FakeEngine(SentimentAnalyzer):
+    model = "sabia-4"
+    prompt_version = "v2"
+
+    def __init__(self, analysis, outcomes=()):
+        self.analysis = analysis
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def analyze_batch(self, review_texts):
+        self.calls.extend(review_texts)
+        if self.outcomes:
+            return self.outcomes.pop(0)
+        return self.tag([self.analysis for _ in review_texts])
+
+
+def create_analyzed_reviews(service, session_factory, sample_review, count):
+    ids = [
+        row["id"]
+        for row in service.create_reviews_bulk(
+            [
+                {**sample_review, "review_text": f"Avaliação {index}"}
+                for index in range(count)
+            ]
+        )
+    ]
+    AnalysisWorker(session_factory, workers=0).run_once()
+    return ids
+
+
+def test_reanalysis_should_checkpoint_and_resume(
+    db_session, session_factory, sample_review, sample_analysis, fake_analyzer
+):
+    service = ReviewService(db_session)
+    ids = create_analyzed_reviews(service, session_factory, sample_review, 3)
+    engine = FakeEngine({**sample_analysis, "sentiment": "Negativa"})
+    options = {"batch_size": 1, "concurrency": 2, "rate": 0, "sleep": None}
+
+    job_id = Reanalyzer(session_factory, engine, **options).start({"outdated": True})
+    progress = Reanalyzer(session_factory, engine, **options).run_page(job_id)
+    assert progress["last_review_id"] == ids[1]
+    assert progress["processed"] == 2
+
+    # A new runner, as after a crash, resumes from the checkpoint.
+    progress = Reanalyzer(session_factory, engine, **options).run(job_id)
+    assert progress["status"] == "done"
+    assert progress["processed"] == 3
+    assert sorted(engine.calls) == ["Avaliação 0", "Avaliação 1", "Avaliação 2"]
+
+    analysis = service.get_analysis_status(ids[2])["analysis"]
+    assert analysis["sentiment"] == "Negativa"
+    assert (analysis["model"], analysis["prompt_version"]) == ("sabia-4", "v2")
+
+    # Every analysis is now up to date.
+    again = Reanalyzer(session_factory, engine, **options)
+    assert again.run(again.start({"outdated": True}))["processed"] == 0
+    with pytest.raises(ValueError):
+        again.start({"start_date": "2024/06/01"})
+
+
+def test_reanalysis_should_pause_when_llm_is_unavailable(
+    db_session, session_factory, sample_review, sample_analysis, fake_analyzer
+):
+    service = ReviewService(db_session)
+    ids = create_analyzed_reviews(service, session_factory, sample_review, 2)
+    engine = FakeEngine(
+        sample_analysis, outcomes=[[sample_analysis, CircuitOpenError(30)]]
+    )
+    pauses = []
+    reanalyzer = Reanalyzer(
+        session_factory, engine, batch_size=2, rate=0, pause=30, sleep=pauses.append
+    )
 
-    start_date = "2024-06-01"
-    end_date = "2024-06-30"
-    response = process_reviews_report(db_session, start_date, end_date)
+    job_id = reanalyzer.start({"start_date": "2024-06-01", "end_date": "2024-06-01"})
+    progress = reanalyzer.run_page(job_id)
+    assert progress["last_review_id"] == ids[0]
+    assert progress["failed"] == 0
+    assert pauses == [30]
 
-    assert "total_reviews" in response
-    assert response["total_reviews"] == 1
-    assert response["positive"] == 1
+    assert reanalyzer.run(job_id)["processed"] == 2